@@ -17,22 +17,30 @@ You should have received a copy of the GNU General Public License
 along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
 LICENSE"""
 
+import re
 import time
 import json
+import codecs
 import requests
 import logging
-from typing import List, Dict, Tuple, Optional, Any
+from typing import List, Dict, Tuple, Iterator, Optional, Any
 from anime_list_apis.cache.Cache import Cache
 from anime_list_apis.api.ApiInterface import ApiInterface
-from anime_list_apis.models.MediaData import MediaData
+from anime_list_apis.api.RateLimiter import RateLimiter
+from anime_list_apis.models.MediaData import MediaData, AnimeData, MangaData
 from anime_list_apis.models.MediaListEntry import MediaListEntry
-from anime_list_apis.models.MediaUserData import MediaUserData
+from anime_list_apis.models.MediaUserData import \
+    MediaUserData, AnimeUserData, MangaUserData
+from anime_list_apis.models.attributes.ConsumingStatus import ConsumingStatus
 from anime_list_apis.models.attributes.Date import Date
 from anime_list_apis.models.attributes.Id import Id, IdType
 from anime_list_apis.models.attributes.MediaType import MediaType
 from anime_list_apis.models.attributes.Relation import Relation, RelationType
+from anime_list_apis.models.attributes.ReleasingStatus import ReleasingStatus
 from anime_list_apis.models.attributes.Score import Score, ScoreType
 from anime_list_apis.models.attributes.Title import Title, TitleType
+from anime_list_apis.util.JsonArrayStream import JsonArrayStream
+from anime_list_apis.util.Metrics import Metrics
 
 
 class AnilistApi(ApiInterface):
@@ -40,7 +48,41 @@ class AnilistApi(ApiInterface):
     Implements a wrapper around the anilist.co API
     """
 
-    def __init__(self, cache: Cache = None, rate_limit_pause: float = 0.5):
+    url = "https://graphql.anilist.co"  # type: str
+    """
+    The URL of the GraphQL endpoint
+    """
+
+    default_rate_limiter = RateLimiter(90)  # type: RateLimiter
+    """
+    Anilist allows 90 requests per minute
+    """
+
+    chunk_size = 16384  # type: int
+    """
+    The amount of bytes read at once while streaming responses
+    """
+
+    list_chunk_size = 500  # type: int
+    """
+    The amount of list entries fetched per query. 500 is the maximum
+    """
+
+    list_chunk_retries = 3  # type: int
+    """
+    How often fetching a chunk of a list is retried if it fails
+    """
+
+    def __init__(
+            self,
+            cache: Cache = None,
+            rate_limit_pause: float = 0.0,
+            session: requests.Session = None,
+            timeout: float = 30.0,
+            rate_limiter: RateLimiter = None,
+            url: str = None,
+            metrics: Metrics = None
+    ):
         """
         Initializes the Anilist Api interface.
         Intializes cache or uses the one provided.
@@ -48,8 +90,25 @@ class AnilistApi(ApiInterface):
         :param rate_limit_pause: A duration in seconds that the API Interface
                                  will pause after a network operation to
                                  prevent being rate limited
+        :param session: The HTTP session to use.
+                        If left as None, a new session is generated
+        :param timeout: The timeout in seconds for network operations
+        :param rate_limiter: The rate limiter to use. If left as None,
+                             a rate limiter shared by all Anilist API
+                             interfaces is used
+        :param url: The URL of the GraphQL endpoint to use. If left as None,
+                    the anilist.co endpoint is used. May be used to point the
+                    API at a local server for testing
+        :param metrics: The metrics registry in which the network operations
+                        are recorded. If left as None, the metrics registry
+                        of the cache is used
         """
-        super().__init__(IdType.ANILIST, cache, rate_limit_pause)
+        super().__init__(
+            IdType.ANILIST, cache, rate_limit_pause, session, timeout,
+            rate_limiter, metrics
+        )
+        if url is not None:
+            self.url = url
 
     # Implemented Abstract Methods --------------------------------------------
 
@@ -92,6 +151,70 @@ class AnilistApi(ApiInterface):
             )
             return data
 
+    def _get_data_batch(
+            self,
+            media_type: MediaType,
+            ids: List[Id]
+    ) -> List[Optional[MediaData]]:
+        """
+        Retrieves multiple data objects using as few queries as possible.
+        Up to 50 IDs are bundled in a single query.
+        :param media_type: The media type to retrieve
+        :param ids: The IDs to retrieve
+        :return: The Media Data objects in the same order as the IDs
+        """
+        query_ids = {
+            IdType.ANILIST: [],
+            IdType.MYANIMELIST: []
+        }  # type: Dict[IdType, List[int]]
+        resolved = []  # type: List[Optional[Tuple[int, IdType]]]
+
+        for _id in ids:
+            id_tuple = self.__resolve_query_id(media_type, _id, True)
+            resolved.append(id_tuple)
+            if id_tuple is not None:
+                query_ids[id_tuple[1]].append(id_tuple[0])
+
+        fetched = {}  # type: Dict[Tuple[int, IdType], MediaData]
+        for id_type, id_list in query_ids.items():
+            query_id_type = "id_in" if id_type == IdType.ANILIST \
+                else "idMal_in"
+
+            query = """
+                query ($ids: [Int], $type: MediaType, $per_page: Int) {
+                    Page(page: 1, perPage: $per_page) {
+                        media(""" + query_id_type + """: $ids, type: $type) {
+                            """ + self.__media_query + """
+                        }
+                    }
+                }
+            """
+
+            for i in range(0, len(id_list), 50):
+                chunk = id_list[i:i + 50]
+                variables = {
+                    "ids": chunk,
+                    "type": media_type.name,
+                    "per_page": len(chunk)
+                }
+                result = self.__graphql_query(query, variables)
+                if result is None:
+                    continue
+
+                for media in result["Page"]["media"]:
+                    data = self.__generate_media_data(media_type, media)
+                    self.__cache_mal_to_anilist_map(
+                        media_type,
+                        data.id.get(IdType.MYANIMELIST),
+                        data.id.get(IdType.ANILIST)
+                    )
+                    fetched[(data.id.get(id_type), id_type)] = data
+
+        return [
+            None if id_tuple is None else fetched.get(id_tuple)
+            for id_tuple in resolved
+        ]
+
     def _get_user_data(
             self,
             media_type: MediaType,
@@ -106,37 +229,57 @@ class AnilistApi(ApiInterface):
         :return: The user data for the entry or
                  None if the user doesn't have such an entry
         """
-        entry = self._get_list_entry(media_type, _id, username)
-        if entry is not None:
-            return entry.get_user_data()
-        else:
+        id_tuple = self.__resolve_query_id(media_type, _id, False)
+        if id_tuple is None:
             return None
 
+        result = self.__query_list_entry(
+            media_type, id_tuple[0], username, self.__media_user_data_query
+        )
+        if result is None:
+            return None
+        else:
+            return self.__generate_media_user_data(media_type, result)
+
     def _get_user_data_list(self, media_type: MediaType, username: str) \
             -> List[MediaUserData]:
         """
-        Retrieves a user's entire list of user data
-        Actual implementation method to be implemented by subclasses
+        Retrieves a user's entire list of user data.
+        Only the IDs of the media are queried, since the media data is
+        not needed
         :param media_type: The media type to fetch
         :param username: The username for which to fetch the list
         :return: The list of user data
         """
-        return list(map(
-            lambda x: x.get_user_data(),
-            self._get_list(media_type, username)
-        ))
+        user_datas = []
+        for entry in self.__iter_list_chunks(
+                media_type, username, self.__media_user_data_query
+        ):
+            user_data = self.__generate_media_user_data(media_type, entry)
+            self.__cache_mal_to_anilist_map(
+                media_type,
+                user_data.id.get(IdType.MYANIMELIST),
+                user_data.id.get(IdType.ANILIST)
+            )
+            user_datas.append(user_data)
+        return user_datas
 
     def _get_list_entry(
             self,
             media_type: MediaType,
             _id: int or Id,
-            username: str
+            username: str,
+            fresh: bool = False
     ) -> Optional[MediaListEntry]:
         """
-        Retrieves a user list entry
+        Retrieves a user list entry.
+        Unless a fresh entry is requested, cached media data is reused and
+        only the user data is fetched
         :param media_type: The media type to fetch
         :param _id: The ID to retrieve. May be and int or an Id object
         :param username: The user for which to fetch the entry
+        :param fresh: If True, the media data is fetched as well, even if
+                      it is cached
         :return: The entry for the user or
                  None if the user doesn't have such an entry
         """
@@ -145,47 +288,46 @@ class AnilistApi(ApiInterface):
             return None
         query_id = id_tuple[0]
 
-        # Currently we can't get all the information in one go due to some
-        # 500 internal server errors.
-        # Once this is fixed, the following should stand here:
-        # inject = self.media_list_entry_query
-        inject = self.__media_list_entry_query.replace(
-            self.__media_query,
-            """
-            id
-            idMal
-            """
-        )
+        media_data = None
+        if not fresh:
+            media_data = self.cache.get_media_data(
+                self.id_type, media_type, query_id
+            )
+        result = None
 
-        query = """
-            query ($id: Int, $username: String, $type: MediaType) {
-                MediaList(mediaId: $id, userName: $username, type: $type) {
-                    """ + inject + """
-                }
-            }
-        """
-        variables = {
-            "id": query_id,
-            "type": media_type.name,
-            "username": username
-        }
-        result = self.__graphql_query(query, variables)
+        if media_data is None:
+            try:
+                result = self.__query_list_entry(
+                    media_type, query_id, username,
+                    self.__media_list_entry_query, raise_server_errors=True
+                )
+            except requests.HTTPError as e:
+                # Fetching the media data in the same query used to cause
+                # 500 internal server errors. In that case, the media data
+                # is fetched separately
+                logging.getLogger(__name__).warning(
+                    "Failed to fetch list entry including media data (" +
+                    str(e) + "). Fetching media data separately"
+                )
+            else:
+                if result is None:
+                    return None
+                media_data = self.__generate_media_data(
+                    media_type, result["media"]
+                )
 
         if result is None:
-            return None
-        else:
-
-            # Again, due to 500 Server errors we have to hack around a bit
-            # media_data = self.__generate_media_data(
-            #     media_type, result["MediaList"]["media"]
-            # )
-            media_data = self._get_data(media_type, _id)
-
-            user_data = self.__generate_media_user_data(
-                media_type, result["MediaList"]
+            result = self.__query_list_entry(
+                media_type, query_id, username, self.__media_user_data_query
             )
-            entry_cls = MediaListEntry.get_class_for_media_type(media_type)
-            return entry_cls(media_data, user_data)
+            if result is None:
+                return None
+            elif media_data is None:
+                media_data = self._get_data(media_type, _id)
+
+        user_data = self.__generate_media_user_data(media_type, result)
+        entry_cls = MediaListEntry.get_class_for_media_type(media_type)
+        return entry_cls(media_data, user_data)
 
     def _get_list(self, media_type: MediaType, username: str) \
             -> List[MediaListEntry]:
@@ -195,46 +337,40 @@ class AnilistApi(ApiInterface):
         :param username: The username for which to fetch the list
         :return: The list of List entries
         """
-        query = """
-            query($username: String, $type: MediaType) {
-                MediaListCollection (userName: $username, type: $type) {
-                    lists {
-                        entries {
-                            """ + self.__media_list_entry_query + """
-                        }
-                    }
-                }
-            }
-        """
-        variables = {"username": username, "type": media_type.name}
-        result = self.__graphql_query(query, variables)
+        return list(self._iter_list(media_type, username))
 
-        if result is None:
-            return []
-        else:
-
-            entries = []
-            entry_cls = MediaListEntry.get_class_for_media_type(media_type)
+    def _iter_list(self, media_type: MediaType, username: str) \
+            -> Iterator[MediaListEntry]:
+        """
+        Iterates over a user's entire list.
+        The list is fetched in chunks of a limited size. Each response is
+        parsed incrementally, so every entry is yielded as soon as it was
+        received
+        :param media_type: The media type to fetch
+        :param username: The username for which to fetch the list
+        :return: A generator that yields the list entries
+        """
+        entry_cls = MediaListEntry.get_class_for_media_type(media_type)
 
-            for collection in result["MediaListCollection"]["lists"]:
-                for entry in collection["entries"]:
-                    media_data = self.__generate_media_data(
-                        media_type,
-                        entry["media"]
-                    )
-                    user_data = self.__generate_media_user_data(
-                        media_type,
-                        entry
-                    )
+        for entry in self.__iter_list_chunks(
+                media_type, username, self.__media_list_entry_query
+        ):
+            media_data = self.__generate_media_data(
+                media_type,
+                entry["media"]
+            )
+            user_data = self.__generate_media_user_data(
+                media_type,
+                entry
+            )
 
-                    self.__cache_mal_to_anilist_map(
-                        media_type,
-                        media_data.id.get(IdType.MYANIMELIST),
-                        media_data.id.get(IdType.ANILIST)
-                    )
+            self.__cache_mal_to_anilist_map(
+                media_type,
+                media_data.id.get(IdType.MYANIMELIST),
+                media_data.id.get(IdType.ANILIST)
+            )
 
-                    entries.append(entry_cls(media_data, user_data))
-            return entries
+            yield entry_cls(media_data, user_data)
 
     # Useful public methods ---------------------------------------------------
 
@@ -255,7 +391,25 @@ class AnilistApi(ApiInterface):
         )
         if cached is not None:
             return cached
+        elif mal_id is None:
+            return None
+        else:
+            return self._coalesce(
+                ("anilist_id", media_type, mal_id),
+                lambda: self.__fetch_anilist_id(media_type, mal_id)
+            )
+
+    # Helper Methods ----------------------------------------------------------
 
+    def __fetch_anilist_id(self, media_type: MediaType, mal_id: int) \
+            -> Optional[int]:
+        """
+        Fetches the anilist ID for a myanimelist ID using the API and
+        caches it
+        :param media_type: The media type of the myanimelist ID
+        :param mal_id: The myanimelist ID
+        :return: The anilist ID or None if there is no equivalent on anilist
+        """
         query = """
             query ($mal_id: Int, $type: MediaType) {
                 Media(idMal: $mal_id, type: $type) {
@@ -263,8 +417,6 @@ class AnilistApi(ApiInterface):
                 }
             }
         """
-        if mal_id is None:
-            return None
         variables = {"mal_id": mal_id, "type": media_type.name}
         result = self.__graphql_query(query, variables)
         if result is None:
@@ -274,8 +426,6 @@ class AnilistApi(ApiInterface):
             self.__cache_mal_to_anilist_map(media_type, mal_id, anilist_id)
             return anilist_id
 
-    # Helper Methods ----------------------------------------------------------
-
     @staticmethod
     def __generate_media_user_data(media_type: MediaType,
                                    data: Dict[str, Any]) -> MediaUserData:
@@ -289,32 +439,24 @@ class AnilistApi(ApiInterface):
             IdType.ANILIST: data["media"]["id"],
             IdType.MYANIMELIST: data["media"]["idMal"]
         })
-
-        serialized = {
-            "media_id": _id.serialize(),
-            "media_type": media_type.name,
-            "username": data["user"]["name"],
-            "score": Score(data["score"], ScoreType.PERCENTAGE).serialize(),
-            "consuming_status": data["status"],
-            "episode_progress": data["progress"],
-            "chapter_progress": data["progress"],
-            "volume_progress": data["progressVolumes"]
-        }
-
-        for api_key, dict_key in {
-            "startedAt": "consuming_start",
-            "completedAt": "consuming_end"
-        }.items():
-            try:
-                serialized[dict_key] = Date(
-                    data[api_key]["year"],
-                    data[api_key]["month"],
-                    data[api_key]["day"]
-                ).serialize()
-            except (TypeError, ValueError):
-                serialized[dict_key] = None
-
-        return MediaUserData.deserialize(serialized)
+        username = data["user"]["name"]
+        score = Score(data["score"], ScoreType.PERCENTAGE)
+        consuming_status = ConsumingStatus[data["status"]]
+        consuming_start = AnilistApi.__generate_date(data["startedAt"])
+        consuming_end = AnilistApi.__generate_date(data["completedAt"])
+
+        if media_type == MediaType.ANIME:
+            return AnimeUserData(
+                _id, username, score, consuming_status,
+                consuming_start, consuming_end,
+                data["progress"]
+            )
+        else:
+            return MangaUserData(
+                _id, username, score, consuming_status,
+                consuming_start, consuming_end,
+                data["progress"], data["progressVolumes"]
+            )
 
     # noinspection PyTypeChecker
     @staticmethod
@@ -339,12 +481,14 @@ class AnilistApi(ApiInterface):
         if title.get(TitleType.ENGLISH) is None:
             title.set(title.get(TitleType.ROMAJI), TitleType.ENGLISH)
 
+        # Relations share interned IDs, like deserialized relations do
+        source_id = Id.intern(_id)
         relations = []
         for relation in data["relations"]["edges"]:
-            dest_id = Id({
+            dest_id = Id.intern(Id({
                 IdType.ANILIST: relation["node"]["id"],
                 IdType.MYANIMELIST: relation["node"]["idMal"]
-            })
+            }).freeze())
             dest_media_type = media_type
             rel_type = RelationType[relation["relationType"]]
 
@@ -355,69 +499,377 @@ class AnilistApi(ApiInterface):
                     dest_media_type = MediaType.ANIME
 
             relations.append(Relation(
-                _id, media_type, dest_id, dest_media_type, rel_type
-            ).serialize())
+                source_id, media_type, dest_id, dest_media_type, rel_type
+            ))
 
-        releasing_status = \
+        releasing_status = ReleasingStatus[
             data["status"].replace("NOT_YET_RELEASED", "NOT_RELEASED")
+        ]
+        releasing_start = AnilistApi.__generate_date(data["startDate"])
+        releasing_end = AnilistApi.__generate_date(data["endDate"])
+        cover_url = data["coverImage"]["large"]
+
+        if media_type == MediaType.ANIME:
+            return AnimeData(
+                _id, title, relations, releasing_status,
+                releasing_start, releasing_end, cover_url,
+                data["episodes"], data["duration"]
+            )
+        else:
+            return MangaData(
+                _id, title, relations, releasing_status,
+                releasing_start, releasing_end, cover_url,
+                data["episodes"], data["episodes"]
+            )
 
-        serialized = {
-            "media_type": media_type.name,
-            "id": _id.serialize(),
-            "title": title.serialize(),
-            "relations": relations,
-            "releasing_status": releasing_status,
-            "cover_url": data["coverImage"]["large"],
-            "episode_count": data["episodes"],
-            "episode_duration": data["duration"],
-            "chapter_count": data["episodes"],
-            "volume_count": data["episodes"]
-        }
-
-        for api_key, dict_key in {
-            "startDate": "releasing_start",
-            "endDate": "releasing_end"
-        }.items():
-            try:
-                serialized[dict_key] = Date(
-                    data[api_key]["year"],
-                    data[api_key]["month"],
-                    data[api_key]["day"]
-                ).serialize()
-            except (TypeError, ValueError):
-                serialized[dict_key] = None
-
-        return MediaData.deserialize(serialized)
+    @staticmethod
+    def __generate_date(data: Optional[Dict[str, Any]]) -> Optional[Date]:
+        """
+        Generates a Date object from a GraphQL FuzzyDate
+        :param data: The date data
+        :return: The generated Date object or None if the date is incomplete
+        """
+        try:
+            return Date(data["year"], data["month"], data["day"])
+        except (TypeError, ValueError):
+            return None
 
-    def __graphql_query(self, query: str, variables: Dict[str, Any]) \
-            -> Optional[Dict[str, Any]]:
+    def __graphql_query(
+            self,
+            query: str,
+            variables: Dict[str, Any],
+            raise_server_errors: bool = False
+    ) -> Optional[Dict[str, Any]]:
         """
         Executes a GraphQL query on the anilist API
         :param query: The query string
         :param variables: The variables to post
+        :param raise_server_errors: If True, raises an error if the server
+                                    responds with a 5xx status code instead
+                                    of returning None
         :return: The result of the query or None if an error occured
+        :raises requests.HTTPError: If a server error occurred and
+                                    raise_server_errors is True
         """
-        url = 'https://graphql.anilist.co'
-        response = requests.post(
-            url, json={'query': query, 'variables': variables}
-        )
-        time.sleep(self.rate_limit_pause)  # For rate limiting
-        result = json.loads(response.text)
+        labels = {"query": self.__get_query_type(query)}
+        response, duration = self.__post_query(query, variables)
+        self.metrics.observe("api_request_seconds", duration, labels)
+        self.metrics.increment("api_received_bytes_total", labels,
+                               len(response.content))
+        if raise_server_errors and response.status_code >= 500:
+            response.raise_for_status()
+        with self.metrics.time("api_parse_seconds", labels):
+            result = json.loads(response.text)
 
         if "errors" in result:
-            if result["errors"][0]["message"] == \
-                    "Too Many Requests.":  # pragma: no cover
-                logging.getLogger(__name__).warning(
-                    "Rate limited on anilist. "
-                    "Waiting for 70 seconds before retrying"
+            if self.__is_rate_limited(result["errors"][0], response):
+                self.metrics.increment(
+                    "api_retries_total", dict(labels, reason="rate_limit")
+                )
+                return self.__graphql_query(
+                    query, variables, raise_server_errors
                 )
-                time.sleep(70)
-                return self.__graphql_query(query, variables)
             else:
                 return None
         else:
             return result["data"]
 
+    def __query_list_entry(
+            self,
+            media_type: MediaType,
+            query_id: int,
+            username: str,
+            entry_query: str,
+            raise_server_errors: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Queries a single list entry
+        :param media_type: The media type of the entry
+        :param query_id: The anilist ID of the entry
+        :param username: The user for which to fetch the entry
+        :param entry_query: The query for the list entry
+        :param raise_server_errors: If True, raises an error if the server
+                                    responds with a 5xx status code instead
+                                    of returning None
+        :return: The list entry or None if the user doesn't have such
+                 an entry
+        :raises requests.HTTPError: If a server error occurred and
+                                    raise_server_errors is True
+        """
+        query = """
+            query ($id: Int, $username: String, $type: MediaType) {
+                MediaList(mediaId: $id, userName: $username, type: $type) {
+                    """ + entry_query + """
+                }
+            }
+        """
+        variables = {
+            "id": query_id,
+            "type": media_type.name,
+            "username": username
+        }
+        result = self.__graphql_query(query, variables, raise_server_errors)
+        return None if result is None else result["MediaList"]
+
+    def __graphql_query_stream(
+            self,
+            query: str,
+            variables: Dict[str, Any],
+            keys: List[str],
+            value_keys: Optional[List[str]] = None,
+            raise_errors: bool = False
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Executes a GraphQL query on the anilist API and parses the response
+        incrementally while it is being received
+        :param query: The query string
+        :param variables: The variables to post
+        :param keys: The keys of the arrays in the result whose items should
+                     be yielded
+        :param value_keys: The keys in the result whose values should be
+                           yielded as a whole
+        :param raise_errors: If True, raises an error if the server responds
+                             with a 5xx status code or an error other than
+                             the rate limit being exceeded, instead of
+                             stopping
+        :return: A generator that yields tuples consisting of a key and an
+                 array item or value. Stops once an error occurs
+        :raises requests.RequestException: If the connection fails
+        :raises requests.HTTPError: If the server responded with an error
+                                    and raise_errors is True
+        :raises ValueError: If the response is incomplete
+        """
+        retry = False
+        labels = {"query": self.__get_query_type(query)}
+        response, duration = self.__post_query(query, variables, stream=True)
+        if raise_errors and response.status_code >= 500:
+            response.close()
+            response.raise_for_status()
+
+        # The time spent receiving the body and the time spent processing it,
+        # excluding the time spent by the consumer of the yielded items
+        receiving = [0.0]
+        parsing = 0.0
+        try:
+            chunks = codecs.iterdecode(
+                self.__receive(response, receiving, labels), "utf-8"
+            )
+            resumed = time.perf_counter()
+            for key, value in JsonArrayStream(
+                    chunks, keys + ["errors"], value_keys
+            ):
+                parsing += time.perf_counter() - resumed
+                if key != "errors":
+                    yield key, value
+                    resumed = time.perf_counter()
+                else:
+                    retry = self.__is_rate_limited(value, response)
+                    if not retry and raise_errors:
+                        raise requests.HTTPError(
+                            value.get("message"), response=response
+                        )
+                    break
+            parsing += time.perf_counter() - resumed
+        finally:
+            response.close()
+            self.metrics.observe(
+                "api_request_seconds", duration + receiving[0], labels
+            )
+            self.metrics.observe(
+                "api_parse_seconds", max(parsing - receiving[0], 0.0), labels
+            )
+
+        if retry:
+            self.metrics.increment(
+                "api_retries_total", dict(labels, reason="rate_limit")
+            )
+            yield from self.__graphql_query_stream(
+                query, variables, keys, value_keys, raise_errors
+            )
+
+    def __iter_list_chunks(
+            self,
+            media_type: MediaType,
+            username: str,
+            entry_query: str
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Fetches a user's list in chunks and yields the raw list entries.
+        If a chunk could not be fetched completely, only that chunk is
+        fetched again, skipping the entries that were already yielded.
+        Errors returned by the server are treated the same way, so the list
+        is never silently truncated. Only if the user does not exist, the
+        list is empty
+        :param media_type: The media type to fetch
+        :param username: The username for which to fetch the list
+        :param entry_query: The query for a single list entry
+        :return: A generator that yields the list entries
+        :raises requests.RequestException: If a chunk could not be fetched
+                                           after all retries
+        :raises ValueError: If a chunk was incomplete after all retries
+        :raises requests.HTTPError: If the server responded with an error
+                                    after all retries
+        """
+        query = """
+            query($username: String, $type: MediaType,
+                  $chunk: Int, $perChunk: Int) {
+                MediaListCollection (userName: $username, type: $type,
+                                     chunk: $chunk, perChunk: $perChunk) {
+                    hasNextChunk
+                    lists {
+                        entries {
+                            """ + entry_query + """
+                        }
+                    }
+                }
+            }
+        """
+        # The cursor consists of the current chunk and the amount of
+        # entries of that chunk that were already yielded
+        chunk, yielded = 1, 0
+        attempts = 0
+        has_next_chunk = True
+
+        while has_next_chunk:
+            variables = {
+                "username": username,
+                "type": media_type.name,
+                "chunk": chunk,
+                "perChunk": self.list_chunk_size
+            }
+            has_next_chunk = False
+            position = 0
+            try:
+                for key, value in self.__graphql_query_stream(
+                        query, variables, ["entries"], ["hasNextChunk"],
+                        raise_errors=True
+                ):
+                    if key == "hasNextChunk":
+                        has_next_chunk = value is True
+                    else:
+                        position += 1
+                        if position > yielded:
+                            yielded += 1
+                            yield value
+            except (requests.RequestException, ValueError) as e:
+                if chunk == 1 and isinstance(e, requests.HTTPError) \
+                        and str(e) == "Not Found.":
+                    return  # The user does not exist
+                attempts += 1
+                if attempts > self.list_chunk_retries:
+                    raise
+                self.metrics.increment("api_retries_total", {
+                    "query": "MediaListCollection", "reason": "chunk"
+                })
+                logging.getLogger(__name__).warning(
+                    "Failed to fetch chunk " + str(chunk) + " of the list of "
+                    + username + " (" + str(e) + "). Retrying"
+                )
+                has_next_chunk = True
+                continue
+
+            chunk, yielded = chunk + 1, 0
+            attempts = 0
+
+    def __post_query(
+            self,
+            query: str,
+            variables: Dict[str, Any],
+            stream: bool = False
+    ) -> Tuple[requests.Response, float]:
+        """
+        Posts a GraphQL query to the anilist API while respecting the
+        rate limit
+        :param query: The query string
+        :param variables: The variables to post
+        :param stream: If True, the response body is not read immediately
+        :return: The response and the time in seconds it took to receive it,
+                 excluding any waiting for the rate limit. If the response
+                 is streamed, only the time until its headers were received
+        """
+        with self.metrics.time("api_rate_limiter_wait_seconds"):
+            self.rate_limiter.acquire()
+        start = time.perf_counter()
+        response = self.session.post(
+            self.url,
+            json={'query': query, 'variables': variables},
+            timeout=self.timeout,
+            stream=stream
+        )
+        duration = time.perf_counter() - start
+        self.metrics.increment("api_requests_total", {
+            "query": self.__get_query_type(query),
+            "status": str(response.status_code)
+        })
+        self.rate_limiter.update(response.status_code, response.headers)
+        time.sleep(self.rate_limit_pause)
+        self.metrics.increment("api_pause_seconds_total",
+                               amount=self.rate_limit_pause)
+        return response, duration
+
+    def __receive(
+            self,
+            response: requests.Response,
+            receiving: List[float],
+            labels: Dict[str, str]
+    ) -> Iterator[bytes]:
+        """
+        Iterates over the body of a streamed response while recording the
+        amount of received bytes
+        :param response: The response
+        :param receiving: A list containing a single number, to which the
+                          time in seconds spent receiving the body is added
+        :param labels: The labels under which to record the received bytes
+        :return: A generator that yields the chunks of the body
+        """
+        chunks = response.iter_content(self.chunk_size)
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            receiving[0] += time.perf_counter() - start
+            if chunk is None:
+                break
+            self.metrics.increment("api_received_bytes_total", labels,
+                                   len(chunk))
+            yield chunk
+
+    def __is_rate_limited(
+            self,
+            error: Dict[str, Any],
+            response: requests.Response
+    ) -> bool:
+        """
+        Checks if an error returned by the API indicates that the rate limit
+        was exceeded. If that is the case, the rate limiter is updated so that
+        the query can be retried once the API allows it
+        :param error: The error
+        :param response: The response containing the error
+        :return: True if the rate limit was exceeded, False otherwise
+        """
+        if error["message"] == "Too Many Requests.":
+            self.metrics.increment("api_rate_limited_total")
+            # Makes sure to back off even if the status code is missing
+            self.rate_limiter.update(429, response.headers)
+            logging.getLogger(__name__).warning(
+                "Rate limited on anilist. Waiting for " +
+                str(round(self.rate_limiter.get_delay(), 1)) +
+                " seconds before retrying"
+            )
+            return True
+        else:
+            return False
+
+    @staticmethod
+    def __get_query_type(query: str) -> str:
+        """
+        Determines the type of a query, which is used to label its metrics
+        :param query: The query string
+        :return: The name of the first field that is queried,
+                 for example 'Media' or 'MediaListCollection'
+        """
+        match = re.search(r"{\s*(\w+)", query)
+        return "unknown" if match is None else match.group(1)
+
     def __resolve_query_id(self, media_type: MediaType, _id: Id,
                            allow_mal: bool) -> Optional[Tuple[int, IdType]]:
         """
@@ -510,7 +962,7 @@ class AnilistApi(ApiInterface):
     The GraphQL query for a Media object
     """
 
-    __media_list_entry_query = """
+    __user_data_query = """
             user {
                 name
             }
@@ -528,6 +980,12 @@ class AnilistApi(ApiInterface):
                 month
                 day
             }
+        """
+    """
+    The query for the user data of a media list entry, excluding the media
+    """
+
+    __media_list_entry_query = __user_data_query + """
             media {
             """ + __media_query + """
             }
@@ -535,3 +993,14 @@ class AnilistApi(ApiInterface):
     """
     The query for a media list entry
     """
+
+    __media_user_data_query = __user_data_query + """
+            media {
+                id
+                idMal
+            }
+        """
+    """
+    The query for the user data of a media list entry. Only the IDs of the
+    media are included, which keeps the response small
+    """
@@ -17,7 +17,11 @@ You should have received a copy of the GNU General Public License
 along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
 LICENSE"""
 
-from typing import List, Optional
+import requests
+from copy import deepcopy
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Tuple, Set, Iterator, Optional, Callable, Any
+from anime_list_apis.api.RateLimiter import RateLimiter
 from anime_list_apis.cache.Cache import Cache
 from anime_list_apis.models.CacheAble import CacheAble
 from anime_list_apis.models.attributes.Id import Id, IdType
@@ -27,6 +31,8 @@ from anime_list_apis.models.MediaUserData import \
     MediaUserData, AnimeUserData, MangaUserData
 from anime_list_apis.models.MediaListEntry import \
     AnimeListEntry, MangaListEntry, MediaListEntry
+from anime_list_apis.util.Metrics import Metrics
+from anime_list_apis.util.SingleFlight import SingleFlight
 
 
 class ApiInterface:
@@ -34,11 +40,21 @@ class ApiInterface:
     Defines methods that every API connector should implement
     """
 
+    default_rate_limiter = RateLimiter()  # type: RateLimiter
+    """
+    The rate limiter used if none is provided. Shared by all instances of
+    an API interface class, so that they share one request budget
+    """
+
     def __init__(
             self,
             id_type: IdType,
             cache: Cache = None,
-            rate_limit_pause: float = 0.0
+            rate_limit_pause: float = 0.0,
+            session: requests.Session = None,
+            timeout: float = 30.0,
+            rate_limiter: RateLimiter = None,
+            metrics: Metrics = None
     ):
         """
         Initializes the Api interface.
@@ -48,10 +64,56 @@ class ApiInterface:
         :param rate_limit_pause: A duration in seconds that the API Interface
                                  will pause after a network operation to
                                  prevent being rate limited
+        :param session: The HTTP session used for network operations.
+                        Its connections are kept alive and reused, so
+                        sharing a session between API interfaces is
+                        possible. If left as None, a session is generated
+                        using generate_session()
+        :param timeout: The timeout in seconds for network operations
+        :param rate_limiter: The rate limiter that limits the network
+                             operations. If left as None, the API's
+                             default rate limiter is used
+        :param metrics: The metrics registry in which the network operations
+                        are recorded. If left as None, the metrics registry
+                        of the cache is used
         """
         self.cache = cache if cache is not None else Cache()
         self.id_type = id_type
         self.rate_limit_pause = rate_limit_pause
+        self.session = \
+            session if session is not None else self.generate_session()
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter if rate_limiter is not None \
+            else self.default_rate_limiter
+        self.metrics = metrics if metrics is not None else self.cache.metrics
+        self.__in_flight = SingleFlight()
+
+    @staticmethod
+    def generate_session(pool_size: int = 10, retries: int = 3) \
+            -> requests.Session:
+        """
+        Generates an HTTP session that keeps a pool of connections alive
+        :param pool_size: The maximum amount of connections kept per host
+        :param retries: The amount of times a failed connection attempt
+                        is retried
+        :return: The generated session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retries
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self):
+        """
+        Closes the connections of the HTTP session
+        :return: None
+        """
+        self.session.close()
 
     # Public Methods ----------------------------------------------------------
 
@@ -72,11 +134,71 @@ class ApiInterface:
         cached = self.cache.get_media_data(IdType.ANILIST, media_type, _id)
 
         if fresh or cached is None:
-            cached = self._get_data(media_type, self.__generate_id_obj(_id))
-            self.__cache(cached)
+            id_obj = self.__generate_id_obj(_id)
+            cached = self.__fetch(
+                ("data", media_type, self.__generate_id_key(id_obj)),
+                lambda: self._get_data(media_type, id_obj)
+            )
 
         return cached
 
+    def get_data_batch(
+            self,
+            media_type: MediaType,
+            ids: List[int or Id],
+            fresh: bool = False
+    ) -> List[Optional[MediaData]]:
+        """
+        Retrieves multiple data objects at once.
+        Only the IDs that are not cached are fetched using the API,
+        which may bundle them into as few requests as possible.
+        :param media_type: The media type to retrieve
+        :param ids: The IDs to retrieve. May be either ints or Id objects
+        :param fresh: Fetches fresh, i.e. non-cached versions
+        :return: The Media Data objects in the same order as the IDs.
+                 IDs for which no valid data was found result in None.
+                 Repeated IDs result in separate copies of the same data
+        :raises ValueError: If the API did not return a result for every
+                            requested ID
+        """
+        results = []  # type: List[Optional[MediaData]]
+        missing = {}  # type: Dict[int, Id]
+
+        for _id in ids:
+            cached = None
+            if not fresh:
+                cached = self.cache.get_media_data(
+                    IdType.ANILIST, media_type, _id
+                )
+            results.append(cached)
+
+            if cached is None:
+                id_obj = self.__generate_id_obj(_id)
+                missing[self.__generate_id_key(id_obj)] = id_obj
+
+        if len(missing) > 0:
+            datas = self._get_data_batch(media_type, list(missing.values()))
+            if len(datas) != len(missing):
+                raise ValueError(
+                    "Expected " + str(len(missing)) + " results, got "
+                    + str(len(datas))
+                )
+            fetched = dict(zip(missing.keys(), datas))
+            for data in fetched.values():
+                self.__cache(data)
+
+            used = set()  # type: Set[Tuple[Optional[int], ...]]
+            for i, _id in enumerate(ids):
+                if results[i] is None:
+                    key = self.__generate_id_key(self.__generate_id_obj(_id))
+                    data = fetched[key]
+                    if key in used:
+                        data = deepcopy(data)
+                    results[i] = data
+                    used.add(key)
+
+        return results
+
     def get_user_data(
             self,
             media_type: MediaType,
@@ -97,10 +219,14 @@ class ApiInterface:
         )
 
         if fresh or cached is None:
-            cached = self._get_user_data(
-                media_type, self.__generate_id_obj(_id), username
+            id_obj = self.__generate_id_obj(_id)
+            cached = self.__fetch(
+                (
+                    "user_data", media_type,
+                    self.__generate_id_key(id_obj), username
+                ),
+                lambda: self._get_user_data(media_type, id_obj, username)
             )
-            self.__cache(cached)
 
         return cached
 
@@ -142,12 +268,16 @@ class ApiInterface:
         )
 
         if fresh or cached is None:
-            cached = self._get_list_entry(
-                media_type,
-                self.__generate_id_obj(_id),
-                username
+            id_obj = self.__generate_id_obj(_id)
+            cached = self.__fetch(
+                (
+                    "list_entry", media_type,
+                    self.__generate_id_key(id_obj), username, fresh
+                ),
+                lambda: self._get_list_entry(
+                    media_type, id_obj, username, fresh
+                )
             )
-            self.__cache(cached)
 
         return cached
 
@@ -163,10 +293,26 @@ class ApiInterface:
         :param username: The username for which to fetch the list
         :return: The list of List entries
         """
-        entries = self._get_list(media_type, username)
-        for entry in entries:
+        return list(self.iter_list(media_type, username))
+
+    def iter_list(
+            self,
+            media_type: MediaType,
+            username: str
+    ) -> Iterator[MediaListEntry]:
+        """
+        Iterates over a user's entire list.
+        APIs that support it yield the entries while they are being
+        received, which makes it possible to process them before the entire
+        list was fetched.
+        Stores every entry in the cache before it is yielded
+        :param media_type: The media type to fetch
+        :param username: The username for which to fetch the list
+        :return: A generator that yields the list entries
+        """
+        for entry in self._iter_list(media_type, username):
             self.__cache(entry, dont_write=True)
-        return entries
+            yield entry
 
     def is_in_list(
             self,
@@ -188,26 +334,81 @@ class ApiInterface:
     def get_related_data(
             self,
             datas: List[MediaData] or MediaData,
-            fresh: bool = False
+            fresh: bool = False,
+            max_depth: Optional[int] = None,
+            important_only: bool = False
     ) -> List[MediaData]:
         """
         Retrieves related data for either a list of MediaData objects or
-        a single MediaData object
+        a single MediaData object.
+        The relations are followed breadth-first, fetching all media of the
+        same distance at once.
         :param datas: A list of MediaData objects (or a single one)
         :param fresh: Indicates if the most up-to-date results should be used
-        :return: A list of related media data
+        :param max_depth: The maximum amount of relations to follow from the
+                          provided data. If None, all relations are followed
+        :param important_only: If True, only follows important relations
+        :return: A list of related media data, including the provided data
         """
         if not isinstance(datas, list):
             datas = [datas]
 
-        related = []
+        related = []  # type: List[MediaData]
+        found = set()  # type: Set[Tuple[MediaType, Tuple[Optional[int], ...]]]
+        frontier = []  # type: List[MediaData]
+
         for data in datas:
-            self.__append_related_data(data, related, fresh)
+            key = (data.media_type, self.__generate_id_key(data.id))
+            if key not in found:
+                found.add(key)
+                related.append(data)
+                frontier.append(data)
+
+        depth = 0
+        while len(frontier) > 0 and (max_depth is None or depth < max_depth):
+
+            pending = {}  # type: Dict[MediaType, List[Id]]
+            for data in frontier:
+                for relation in data.relations:
+                    if important_only and not relation.is_important():
+                        continue
+
+                    key = (
+                        relation.dest_type,
+                        self.__generate_id_key(relation.dest)
+                    )
+                    if key not in found:
+                        found.add(key)
+                        pending.setdefault(relation.dest_type, [])\
+                            .append(relation.dest)
+
+            frontier = []
+            for media_type, ids in pending.items():
+                for data in self.get_data_batch(media_type, ids, fresh):
+                    if data is not None:
+                        related.append(data)
+                        frontier.append(data)
+            depth += 1
 
         return related
 
     # Abstract Methods --------------------------------------------------------
 
+    def _get_data_batch(
+            self,
+            media_type: MediaType,
+            ids: List[Id]
+    ) -> List[Optional[MediaData]]:
+        """
+        Retrieves multiple data objects using the API.
+        By default, fetches every ID separately. Subclasses may override this
+        to fetch multiple IDs in a single request
+        :param media_type: The media type to retrieve
+        :param ids: The IDs to retrieve
+        :return: The Media Data objects in the same order as the IDs
+        """
+        return [self._get_data(media_type, _id) for _id in ids]
+
     def _get_data(
             self,
             media_type: MediaType,
@@ -253,13 +454,16 @@ class ApiInterface:
             self,
             media_type: MediaType,
             _id: Id,
-            username: str
+            username: str,
+            fresh: bool = False
     ) -> Optional[MediaListEntry]:
         """
         Actual implementation of the get_list_entry for each subclass
         :param media_type: The media type to fetch
         :param _id: The ID to retrieve
         :param username: The user for which to fetch the entry
+        :param fresh: If True, cached data may not be used to assemble
+                      the entry
         :return: The entry for the user or
                  None if the user doesn't have such an entry
         """
@@ -276,6 +480,19 @@ class ApiInterface:
         """
         raise NotImplementedError()  # pragma: no cover
 
+    def _iter_list(self, media_type: MediaType, username: str) \
+            -> Iterator[MediaListEntry]:
+        """
+        Iterates over a user's entire list.
+        May be overridden by subclasses that are able to yield the entries
+        while they are being received. By default, the entire list is
+        fetched using _get_list
+        :param media_type: The media type to fetch
+        :param username: The username for which to fetch the list
+        :return: An iterator over the list entries
+        """
+        return iter(self._get_list(media_type, username))
+
     # Shortcut Methods --------------------------------------------------------
 
     def get_anime_data(self, _id: int or Id, fresh: bool = False) \
@@ -426,6 +643,46 @@ class ApiInterface:
 
     # Helper Methods ----------------------------------------------------------
 
+    def _coalesce(self, key: Tuple, function: Callable[[], Any]) -> Any:
+        """
+        Executes a function that fetches data using the API, unless the same
+        data is already being fetched by another thread. In that case, waits
+        for the other thread to finish and uses its result instead of
+        sending another request
+        :param key: Identifies the fetched data. Consists of the name of the
+                    operation followed by its parameters, for example
+                    the media type, the ID and the username
+        :param function: The function that fetches the data
+        :return: The result of the function. Results shared with another
+                 thread are copied, so they can be modified safely
+        """
+        result, shared = self.__in_flight.do(key, function)
+        if shared:
+            self.metrics.increment(
+                "api_coalesced_total", {"operation": key[0]}
+            )
+            result = deepcopy(result)
+        return result
+
+    def __fetch(
+            self,
+            key: Tuple,
+            function: Callable[[], Optional[CacheAble]]
+    ) -> Optional[CacheAble]:
+        """
+        Fetches a data object using the API and caches it. Concurrent
+        fetches of the same data object share a single request
+        :param key: Identifies the fetched data object, see _coalesce()
+        :param function: The function that fetches the data object
+        :return: The fetched data object
+        """
+        def fetch_and_cache() -> Optional[CacheAble]:
+            data = function()
+            self.__cache(data)
+            return data
+
+        return self._coalesce(key, fetch_and_cache)
+
     def __cache(self, data: Optional[CacheAble], dont_write: bool = True):
         """
         Caches a cache-able data object
@@ -449,32 +706,15 @@ class ApiInterface:
             _id = Id({self.id_type: _id})
         return _id
 
-    def __append_related_data(
-            self,
-            data: MediaData,
-            previous: List[MediaData],
-            fresh: bool = False
-    ):
+    def __generate_id_key(self, _id: Id) -> Tuple[Optional[int], ...]:
         """
-        Retrieves the related MediaData objects for a given MediaData object.
-        This method works in-place.
-        :param data: The data for which to retrieve the related data
-        :param previous: The previously found data, used in recursive calls
-        :param fresh: Indicates if the most up-to-date results should be used
-        :return: None
+        Generates a key that identifies an Id object.
+        Prefers the ID of this API's ID type if it is present.
+        :param _id: The Id object
+        :return: The key
         """
-        previous.append(data)
-
-        for relation in data.relations:
-
-            filtered = list(filter(
-                lambda x: x.id == relation.dest, previous
-            ))
-
-            if len(filtered) == 1:  # If already in list, skip
-                continue
-            else:
-                # In-place recursive method
-                relation_data = \
-                    self.get_data(relation.dest_type, relation.dest, fresh)
-                self.__append_related_data(relation_data, previous, fresh)
+        own_id = _id.get(self.id_type)
+        if own_id is not None:
+            return own_id,
+        else:
+            return _id.to_tuple()
@@ -0,0 +1,88 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import requests
+from typing import Optional
+from anime_list_apis.api.AnilistApi import AnilistApi
+from anime_list_apis.api.AsyncApiInterface import AsyncApiInterface
+from anime_list_apis.api.RateLimiter import RateLimiter
+from anime_list_apis.cache.Cache import Cache
+from anime_list_apis.models.attributes.MediaType import MediaType
+from anime_list_apis.util.Metrics import Metrics
+
+
+class AsyncAnilistApi(AsyncApiInterface):
+    """
+    Asynchronous variant of the anilist.co API wrapper
+    """
+
+    def __init__(
+            self,
+            cache: Cache = None,
+            rate_limit_pause: float = 0.0,
+            max_concurrency: int = 4,
+            session: requests.Session = None,
+            timeout: float = 30.0,
+            rate_limiter: RateLimiter = None,
+            url: str = None,
+            metrics: Metrics = None
+    ):
+        """
+        Initializes the asynchronous Anilist Api interface
+        :param cache: The cache to use. If left as None, will use default cache
+        :param rate_limit_pause: A duration in seconds that every operation
+                                 will pause after a network operation to
+                                 prevent being rate limited
+        :param max_concurrency: The maximum amount of operations that
+                                are executed at the same time
+        :param session: The HTTP session to use.
+                        If left as None, a new session is generated
+        :param timeout: The timeout in seconds for network operations
+        :param rate_limiter: The rate limiter to use. If left as None,
+                             a rate limiter shared by all Anilist API
+                             interfaces is used
+        :param url: The URL of the GraphQL endpoint to use. If left as None,
+                    the anilist.co endpoint is used
+        :param metrics: The metrics registry to use. If left as None,
+                        the metrics registry of the cache is used
+        """
+        super().__init__(
+            AnilistApi(
+                cache, rate_limit_pause, session, timeout, rate_limiter, url,
+                metrics
+            ),
+            max_concurrency
+        )
+
+    async def get_anilist_id_from_mal_id(
+            self,
+            media_type: MediaType,
+            mal_id: int
+    ) -> Optional[int]:
+        """
+        Retrieves an anilist ID from a myanimelist ID
+        :param media_type: The media type of the myanimelist ID
+        :param mal_id: The myanimelist ID
+        :return: The anilist ID. May be None if myanimelist ID has no
+                 equivalent on anilist
+        """
+        # noinspection PyUnresolvedReferences
+        return await self._run(
+            self.api.get_anilist_id_from_mal_id, media_type, mal_id
+        )
@@ -0,0 +1,235 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import asyncio
+from functools import partial
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import List, Optional, Callable, Any
+from anime_list_apis.api.ApiInterface import ApiInterface
+from anime_list_apis.models.attributes.Id import Id
+from anime_list_apis.models.attributes.MediaType import MediaType
+from anime_list_apis.models.MediaData import MediaData
+from anime_list_apis.models.MediaUserData import MediaUserData
+from anime_list_apis.models.MediaListEntry import MediaListEntry
+
+
+class AsyncApiInterface:
+    """
+    Wraps an API interface so that it can be used in an asyncio event loop.
+    The blocking operations of the wrapped API interface are executed in a
+    thread pool, so the event loop is never blocked. The wrapped API
+    interface and its cache are shared by all operations.
+    """
+
+    def __init__(
+            self,
+            api: ApiInterface,
+            max_concurrency: int = 4,
+            executor: Executor = None
+    ):
+        """
+        Initializes the asynchronous API interface
+        :param api: The API interface to wrap
+        :param max_concurrency: The maximum amount of operations that
+                                are executed at the same time.
+                                The wrapped API's rate limiter applies
+                                to all operations
+        :param executor: The executor in which to run the blocking
+                         operations. If left as None, a thread pool with
+                         max_concurrency threads is used
+        """
+        self.api = api
+        self.cache = api.cache
+        self.metrics = api.metrics
+        self.max_concurrency = max_concurrency
+        self.__executor = executor if executor is not None \
+            else ThreadPoolExecutor(max_concurrency)
+        # The semaphore is generated in the event loop that uses it, since
+        # semaphores generated outside of a running loop may be bound to
+        # a different loop on older python versions
+        self.__semaphore = None  # type: Optional[asyncio.Semaphore]
+        self.__semaphore_loop = \
+            None  # type: Optional[asyncio.AbstractEventLoop]
+
+    def close(self):
+        """
+        Shuts down the executor and closes the wrapped API interface
+        :return: None
+        """
+        self.__executor.shutdown()
+        self.api.close()
+
+    async def get_data(
+            self,
+            media_type: MediaType,
+            _id: int or Id,
+            fresh: bool = False
+    ) -> Optional[MediaData]:
+        """
+        Retrieves a single data object using the API
+        :param media_type: The media type to retrieve
+        :param _id: The ID to retrieve. May be either an int or an Id object
+        :param fresh: Fetches a fresh, i.e. non-cached version
+        :return: The Media Data or None if no valid data was found
+        """
+        return await self._run(self.api.get_data, media_type, _id, fresh)
+
+    async def get_data_batch(
+            self,
+            media_type: MediaType,
+            ids: List[int or Id],
+            fresh: bool = False
+    ) -> List[Optional[MediaData]]:
+        """
+        Retrieves multiple data objects at once
+        :param media_type: The media type to retrieve
+        :param ids: The IDs to retrieve. May be either ints or Id objects
+        :param fresh: Fetches fresh, i.e. non-cached versions
+        :return: The Media Data objects in the same order as the IDs.
+                 IDs for which no valid data was found result in None
+        """
+        return await self._run(
+            self.api.get_data_batch, media_type, ids, fresh
+        )
+
+    async def get_user_data(
+            self,
+            media_type: MediaType,
+            _id: int or Id,
+            username: str,
+            fresh: bool = True
+    ) -> Optional[MediaUserData]:
+        """
+        Retrieves the user data of a single entry for a user
+        :param media_type: The type of media to fetch
+        :param _id: The ID to fetch
+        :param username: The username for which to fetch
+        :param fresh: Fetches a fresh, i.e. non-cached version
+        :return: The MediaUserData object or None if not found
+        """
+        return await self._run(
+            self.api.get_user_data, media_type, _id, username, fresh
+        )
+
+    async def get_user_data_list(
+            self,
+            media_type: MediaType,
+            username: str
+    ) -> List[MediaUserData]:
+        """
+        Retrieves a user's entire list with only the user data
+        :param media_type: The media type to fetch the entries for
+        :param username: The user for whom to fetch the entries for
+        :return: The list of user data entries
+        """
+        return await self._run(
+            self.api.get_user_data_list, media_type, username
+        )
+
+    async def get_list_entry(
+            self,
+            media_type: MediaType,
+            _id: int or Id,
+            username: str,
+            fresh: bool = False
+    ) -> Optional[MediaListEntry]:
+        """
+        Retrieves a user list entry
+        :param media_type: The media type to fetch
+        :param _id: The ID to retrieve
+        :param username: The user for which to fetch the entry
+        :param fresh: Fetches a fresh, i.e. non-cached version
+        :return: The entry for the user or None if the user doesn't have
+                 such an entry
+        """
+        return await self._run(
+            self.api.get_list_entry, media_type, _id, username, fresh
+        )
+
+    async def get_list(
+            self,
+            media_type: MediaType,
+            username: str
+    ) -> List[MediaListEntry]:
+        """
+        Retrieves a user's entire list
+        :param media_type: The media type to fetch
+        :param username: The username for which to fetch the list
+        :return: The list of List entries
+        """
+        return await self._run(self.api.get_list, media_type, username)
+
+    async def is_in_list(
+            self,
+            media_type: MediaType,
+            _id: int or Id,
+            username: str,
+            fresh: bool = False
+    ) -> bool:
+        """
+        Checks if an entry is in a user's list
+        :param media_type: The media type to check
+        :param _id: The ID to check
+        :param username: The user to check
+        :param fresh: Fetches a fresh, i.e. non-cached version
+        :return: True if in the list, else False
+        """
+        return await self._run(
+            self.api.is_in_list, media_type, _id, username, fresh
+        )
+
+    async def get_related_data(
+            self,
+            datas: List[MediaData] or MediaData,
+            fresh: bool = False,
+            max_depth: Optional[int] = None,
+            important_only: bool = False
+    ) -> List[MediaData]:
+        """
+        Retrieves related data for either a list of MediaData objects or
+        a single MediaData object
+        :param datas: The data objects to fetch the related data for
+        :param fresh: Fetches fresh, i.e. non-cached versions
+        :param max_depth: The maximum amount of relations that are followed.
+                          If None, there is no limit
+        :param important_only: If True, only follows important relations
+        :return: The list of related data, including the original data
+        """
+        return await self._run(
+            self.api.get_related_data,
+            datas, fresh, max_depth, important_only
+        )
+
+    async def _run(self, function: Callable, *args: Any) -> Any:
+        """
+        Executes a blocking function in the executor, while making sure
+        that the maximum concurrency is not exceeded
+        :param function: The function to execute
+        :param args: The arguments of the function
+        :return: The result of the function
+        """
+        loop = asyncio.get_running_loop()
+        if self.__semaphore_loop is not loop:
+            self.__semaphore = asyncio.Semaphore(self.max_concurrency)
+            self.__semaphore_loop = loop
+
+        async with self.__semaphore:
+            return await loop.run_in_executor(
+                self.__executor, partial(function, *args)
+            )
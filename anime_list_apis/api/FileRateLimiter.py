@@ -0,0 +1,97 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import json
+import time
+from typing import Tuple, Optional
+from anime_list_apis.api.RateLimiter import RateLimiter
+from anime_list_apis.util.FileLock import FileLock
+
+
+class FileRateLimiter(RateLimiter):
+    """
+    Rate limiter that stores its state in a file, so that all processes on
+    a host that use the same state file share one request budget.
+    Access to the state file is coordinated using a file lock.
+    """
+
+    def __init__(
+            self,
+            state_file: str,
+            requests_per_minute: Optional[float] = None,
+            burst: int = 10,
+            penalty: float = 60.0
+    ):
+        """
+        Initializes the rate limiter
+        :param state_file: The path to the file that stores the state.
+                           A lock file is created next to it, creating
+                           the directory if necessary
+        :param requests_per_minute: The amount of requests allowed per
+                                    minute, shared by all processes
+        :param burst: The maximum amount of requests that may be sent
+                      immediately after each other
+        :param penalty: The duration in seconds that requests are paused
+                        if the server reports that the rate limit was
+                        exceeded without specifying how long to wait
+        """
+        self.state_file = state_file
+        self.__file_lock = FileLock(state_file + ".lock")
+        super().__init__(requests_per_minute, burst, penalty)
+
+    def _lock(self) -> FileLock:
+        """
+        Retrieves the file lock that synchronizes access to the state file
+        :return: The file lock
+        """
+        return self.__file_lock
+
+    def _get_state(self) -> Tuple[float, float, float]:
+        """
+        Reads the state of the rate limiter from the state file.
+        If the state file does not exist or is invalid, the rate limiter
+        starts with a full bucket
+        :return: The amount of tokens, the time of the last update and
+                 the time until which requests are blocked
+        """
+        try:
+            with open(self.state_file, "r") as f:
+                state = json.load(f)
+            return (
+                float(state["tokens"]),
+                float(state["updated"]),
+                float(state["blocked_until"])
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return float(self.burst), time.time(), 0.0
+
+    def _set_state(self, tokens: float, updated: float, blocked_until: float):
+        """
+        Writes the state of the rate limiter to the state file
+        :param tokens: The amount of tokens
+        :param updated: The time of the update
+        :param blocked_until: The time until which requests are blocked
+        :return: None
+        """
+        with open(self.state_file, "w") as f:
+            json.dump({
+                "tokens": tokens,
+                "updated": updated,
+                "blocked_until": blocked_until
+            }, f)
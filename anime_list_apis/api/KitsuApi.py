@@ -88,13 +88,16 @@ class KitsuApi(ApiInterface):
             self,
             media_type: MediaType,
             _id: Id,
-            username: str
+            username: str,
+            fresh: bool = False
     ) -> Optional[MediaListEntry]:
         """
         Actual implementation of the get_list_entry for each subclass
         :param media_type: The media type to fetch
         :param _id: The ID to retrieve
         :param username: The user for which to fetch the entry
+        :param fresh: If True, cached data may not be used to assemble
+                      the entry
         :return: The entry for the user or
                  None if the user doesn't have such an entry
         """
@@ -0,0 +1,194 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import time
+from threading import Lock
+from typing import Tuple, Mapping, Optional
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter that limits how many requests are sent to an
+    API. Tokens are refilled continuously at the allowed request rate and
+    every request consumes one token.
+    The limiter may additionally be updated with the rate limiting
+    information sent by the server, so that it backs off exactly as long as
+    the server requires it to.
+    The rate limiter may be shared between multiple API interfaces and
+    threads.
+    """
+
+    def __init__(
+            self,
+            requests_per_minute: Optional[float] = None,
+            burst: int = 10,
+            penalty: float = 60.0
+    ):
+        """
+        Initializes the rate limiter
+        :param requests_per_minute: The amount of requests allowed per
+                                    minute. If None, requests are only
+                                    limited once the server reports
+                                    that the rate limit was exceeded
+        :param burst: The maximum amount of requests that may be sent
+                      immediately after each other
+        :param penalty: The duration in seconds that requests are paused
+                        if the server reports that the rate limit was
+                        exceeded without specifying how long to wait
+        """
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.penalty = penalty
+        self.__lock = Lock()
+        self.__state = (float(burst), time.time(), 0.0)
+
+    def acquire(self):
+        """
+        Waits until a request may be sent and consumes a token
+        :return: None
+        """
+        while True:
+            with self._lock():
+                tokens, blocked_until, now = self.__refill()
+                delay = self.__calculate_delay(tokens, blocked_until, now)
+                if delay <= 0:
+                    tokens -= 1
+                self._set_state(tokens, now, blocked_until)
+
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def get_delay(self) -> float:
+        """
+        Calculates how long it will take until the next request may be sent
+        :return: The delay in seconds
+        """
+        with self._lock():
+            tokens, blocked_until, now = self.__refill()
+            return max(0.0, self.__calculate_delay(tokens, blocked_until, now))
+
+    def update(self, status_code: int, headers: Mapping[str, str]):
+        """
+        Updates the rate limiter with the response of a request.
+        Honors the Retry-After, X-RateLimit-Remaining and X-RateLimit-Reset
+        headers
+        :param status_code: The HTTP status code of the response
+        :param headers: The headers of the response
+        :return: None
+        """
+        retry_after = self.__parse_header(headers, "Retry-After")
+        remaining = self.__parse_header(headers, "X-RateLimit-Remaining")
+        reset = self.__parse_header(headers, "X-RateLimit-Reset")
+
+        with self._lock():
+            tokens, blocked_until, now = self.__refill()
+
+            if remaining is not None:
+                tokens = min(tokens, remaining)
+
+            if retry_after is not None:
+                blocked_until = max(blocked_until, now + retry_after)
+            elif status_code == 429 or (remaining is not None and
+                                        remaining <= 0):
+                if reset is not None and reset > now:
+                    blocked_until = max(blocked_until, reset)
+                else:
+                    blocked_until = max(blocked_until, now + self.penalty)
+
+            self._set_state(tokens, now, blocked_until)
+
+    def _lock(self):
+        """
+        Retrieves the lock that synchronizes access to the state of the
+        rate limiter. May be overridden to coordinate rate limiters
+        using other means
+        :return: The lock, usable as a context manager
+        """
+        return self.__lock
+
+    def _get_state(self) -> Tuple[float, float, float]:
+        """
+        Retrieves the state of the rate limiter.
+        Only called while the lock is held
+        :return: The amount of tokens, the time of the last update and
+                 the time until which requests are blocked
+        """
+        return self.__state
+
+    def _set_state(self, tokens: float, updated: float, blocked_until: float):
+        """
+        Stores the state of the rate limiter.
+        Only called while the lock is held
+        :param tokens: The amount of tokens
+        :param updated: The time of the update
+        :param blocked_until: The time until which requests are blocked
+        :return: None
+        """
+        self.__state = (tokens, updated, blocked_until)
+
+    def __refill(self) -> Tuple[float, float, float]:
+        """
+        Retrieves the state of the rate limiter and refills the tokens
+        that were generated since the last update
+        :return: The amount of tokens, the time until which requests are
+                 blocked and the current time
+        """
+        tokens, updated, blocked_until = self._get_state()
+        now = time.time()
+
+        if self.requests_per_minute is None:
+            tokens = float(self.burst)
+        else:
+            elapsed = max(0.0, now - updated)
+            tokens = min(
+                float(self.burst),
+                tokens + elapsed * self.requests_per_minute / 60
+            )
+        return tokens, blocked_until, now
+
+    def __calculate_delay(self, tokens: float, blocked_until: float,
+                          now: float) -> float:
+        """
+        Calculates how long to wait until a request may be sent
+        :param tokens: The amount of available tokens
+        :param blocked_until: The time until which requests are blocked
+        :param now: The current time
+        :return: The delay in seconds. Zero or negative if a request may
+                 be sent immediately
+        """
+        delay = blocked_until - now
+        if tokens < 1 and self.requests_per_minute is not None:
+            delay = max(delay, (1 - tokens) * 60 / self.requests_per_minute)
+        return delay
+
+    @staticmethod
+    def __parse_header(headers: Mapping[str, str], key: str) \
+            -> Optional[float]:
+        """
+        Parses a numeric header value
+        :param headers: The headers
+        :param key: The key of the header
+        :return: The parsed value or None if the header does not exist
+                 or is not numeric
+        """
+        try:
+            return float(headers[key])
+        except (KeyError, TypeError, ValueError):
+            return None
@@ -0,0 +1,89 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import marshal
+import logging
+from typing import Dict, Any
+from anime_list_apis.cache.Cache import Cache
+
+
+class BinaryCache(Cache):
+    """
+    Cache that stores the cache file in a compact binary format instead of
+    pretty-printed JSON.
+    The serialized cache is encoded using the marshal module, which stores
+    identical objects like the keys shared by all serialized objects only
+    once and references them afterwards. This results in much smaller
+    cache files that are written and read faster.
+    The journal file still uses JSON.
+    """
+
+    cache_file_name = "cache.bin"
+    """
+    The name of the binary cache file in the cache location
+    """
+
+    format_version = 1
+    """
+    The version of the binary format. Files with a different version
+    are discarded
+    """
+
+    def _write_cache_file(self, path: str, serialized: Dict[str, Any]):
+        """
+        Writes the serialized content of the cache to a binary file
+        :param path: The path of the file to write
+        :param serialized: The serialized content of the cache
+        :return: None
+        """
+        with open(path, "wb") as f:
+            f.write(marshal.dumps((self.format_version, serialized)))
+
+    def _read_cache_file(self, path: str) -> Dict[str, Any]:
+        """
+        Reads the serialized content of the cache from a binary file.
+        Since the marshal format may change between python versions, files
+        that can't be read or that use a different format version are
+        replaced with an empty cache file instead of failing
+        :param path: The path of the file to read
+        :return: The serialized content of the cache
+        """
+        # Reading the entire file at once is a lot faster than letting
+        # marshal read from the file object
+        with open(path, "rb") as f:
+            data = f.read()
+
+        try:
+            version, serialized = marshal.loads(data)
+            if version == self.format_version \
+                    and isinstance(serialized, dict):
+                return serialized
+            reason = "unsupported format version " + str(version)
+        except (EOFError, TypeError, ValueError) as e:
+            reason = str(e)
+
+        logging.getLogger(__name__).warning(
+            "Discarding incompatible binary cache file " + path +
+            " (" + reason + ")"
+        )
+        temp_file = path + ".tmp"
+        self._write_cache_file(temp_file, {})
+        os.replace(temp_file, path)
+        return {}
@@ -21,7 +21,10 @@ import os
 import time
 import json
 from copy import deepcopy
-from typing import Dict, Any, Optional
+from functools import wraps
+from threading import RLock
+from collections import OrderedDict
+from typing import Dict, Tuple, Any, Optional, Callable
 from anime_list_apis.models.Serializable import Serializable
 from anime_list_apis.models.attributes.Id import IdType, Id
 from anime_list_apis.models.attributes.MediaType import MediaType
@@ -29,11 +32,30 @@ from anime_list_apis.models.MediaData import MediaData
 from anime_list_apis.models.MediaUserData import MediaUserData
 from anime_list_apis.models.MediaListEntry import MediaListEntry
 from anime_list_apis.models.CacheAble import CacheModelType, CacheAble
+from anime_list_apis.util.FileLock import FileLock
+from anime_list_apis.util.Metrics import Metrics
+
+
+def synchronized(method: Callable) -> Callable:
+    """
+    Decorator for cache methods that makes sure that only one thread at a
+    time accesses the cache
+    :param method: The method to synchronize
+    :return: The synchronized method
+    """
+    @wraps(method)
+    def synchronized_method(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return synchronized_method
 
 
 class Cache:
     """
-    Handles various caching functionality
+    Handles various caching functionality.
+    The cache may safely be shared between threads.
+    Access to the cache files is guarded by a file lock, so multiple
+    processes may use the same cache location.
     """
 
     model_map = {
@@ -46,11 +68,30 @@ class Cache:
     Maps model types to their respective classes
     """
 
+    cache_file_name = "cache.json"
+    """
+    The name of the file in the cache location that stores the cache
+    """
+
+    stores_objects = True
+    """
+    Indicates if the cache storage keeps the cached objects themselves.
+    Those are copied before being returned, unless the cache is frozen
+    """
+
     def __init__(
             self,
             cache_location: str = None,
             expiration: int = 6000,
-            write_after: int = 20
+            write_after: int = 20,
+            journal: bool = False,
+            compact_after: int = 1000,
+            max_entries: Optional[int] = None,
+            max_bytes: Optional[int] = None,
+            sweep_interval: int = 1000,
+            frozen: bool = False,
+            shared: bool = False,
+            metrics: Optional[Metrics] = None
     ):
         """
         Initializes the Cache. If the Cache directory and file do not exist,
@@ -61,10 +102,53 @@ class Cache:
                            If set to a negative number, will be infinite
         :param write_after: Defines after how many cache changes the changes
                             are automatically written to the cache file
+        :param journal: If set to True, writes will only append the changed
+                        entries to a journal file instead of rewriting the
+                        entire cache file
+        :param compact_after: Defines after how many journal records the
+                              journal is compacted into the cache file
+        :param max_entries: The maximum amount of entries kept in the cache.
+                            Once exceeded, the least recently used entries
+                            are evicted. If None, there is no limit
+        :param max_bytes: The maximum size of all cached entries in their
+                          serialized form. Once exceeded, the least recently
+                          used entries are evicted. If None, there is no limit
+        :param sweep_interval: Defines after how many additions all expired
+                               entries are removed from the cache.
+                               If 0 or negative, entries are only removed
+                               once an expired entry is accessed
+        :param frozen: If set to True, cached objects are frozen and
+                       retrieving them returns the cached object itself
+                       instead of a copy. Frozen objects can't be modified.
+        :param shared: If set to True, the cache file may be shared with
+                       other processes that write to it. Before writing,
+                       the entries written by other processes are merged
+                       into this cache, keeping the newest version
+                       of every entry
+        :param metrics: The metrics registry in which the cache hits,
+                        misses, expirations, evictions and the durations
+                        of writes are recorded. If None, a new registry
+                        is generated
         """
+        self.lock = RLock()
         self.expiration = expiration
         self.write_after = write_after
         self.change_count = 0
+        self.journal = journal
+        self.compact_after = compact_after
+        self.journal_length = 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self.addition_count = 0
+        self.frozen = frozen
+        self.shared = shared
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.metrics = metrics if metrics is not None else Metrics()
 
         if cache_location is None:  # pragma: no cover
             self.cache_location = os.path.join(
@@ -72,21 +156,76 @@ class Cache:
             )
         else:
             self.cache_location = cache_location
-        self.cache_file = os.path.join(self.cache_location, "cache.json")
+        self.cache_file = \
+            os.path.join(self.cache_location, self.cache_file_name)
+        self.journal_file = os.path.join(self.cache_location, "cache.journal")
+        self.__file_lock = \
+            FileLock(os.path.join(self.cache_location, "cache.lock"))
 
         self.__cache = self.__generate_empty_cache()
+        self.__changed = \
+            {}  # type: Dict[Tuple[CacheModelType, IdType, str], None]
+        self.__usage = OrderedDict()  # type: OrderedDict
+        self.__size = 0
+        self.__removed = \
+            {}  # type: Dict[Tuple[CacheModelType, IdType, str], float]
+        self.__stored = \
+            {}  # type: Dict[Tuple[CacheModelType, IdType, str], float]
 
         if not os.path.isdir(self.cache_location):
             os.makedirs(self.cache_location)
 
         if not os.path.isfile(self.cache_file):
-            self.write()
+            self.compact()
 
         self.load()
 
+    @synchronized
     def write(self):
         """
-        Writes the content of the cache to the cache file
+        Writes the content of the cache to the cache file.
+        If the cache is journaled, only the entries that changed since the
+        last write are appended to the journal file, unless the journal
+        has grown large enough to be compacted.
+        :return: None
+        """
+        self.change_count = 0
+
+        with self.__file_lock, self.metrics.time("cache_write_seconds"):
+            if self.journal and self.journal_length + len(self.__changed) \
+                    < self.compact_after:
+                self.__append_to_journal()
+            else:
+                self.compact()
+
+    @synchronized
+    def compact(self):
+        """
+        Writes the entire content of the cache to the cache file and
+        removes the journal file, since its records are now contained in
+        the cache file.
+        If the cache is shared, the entries stored by other processes are
+        merged into the cache beforehand.
+        The cache file is replaced atomically, so it is never left
+        incomplete.
+        :return: None
+        """
+        with self.__file_lock:
+            if self.shared and os.path.isfile(self.cache_file):
+                self.__merge(self.__read_cache_files()[0])
+            self.__write_cache_file()
+
+            if os.path.isfile(self.journal_file):
+                os.remove(self.journal_file)
+            self.journal_length = 0
+            self.__changed = {}
+            self.__removed = {}
+            self.__remember_stored()
+
+    def __write_cache_file(self):
+        """
+        Writes the entire content of the cache to a temporary file, which
+        then replaces the cache file
         :return: None
         """
         serialized = {}
@@ -97,58 +236,43 @@ class Cache:
             for site_type in self.__cache[model_type]:
                 serialized[model_type.name][site_type.name] = {}
 
-                if model_type == CacheModelType.DATA:
-                    serialized[model_type.name][site_type.name] = \
-                        self.__cache[model_type][site_type]
+                for tag, entry in self.__cache[model_type][site_type].items():
+                    serialized[model_type.name][site_type.name][tag] = \
+                        self._serialize_entry(model_type, entry)
 
-                else:
-
-                    for tag in self.__cache[model_type][site_type]:
-                        serialized[model_type.name][site_type.name][tag] = {
-                            "timestamp":
-                                self.__cache[model_type][site_type][tag]
-                                ["timestamp"],
-                            "data":
-                                self.__cache[model_type][site_type][tag]
-                                ["data"].serialize()
-                        }
-
-        with open(self.cache_file, "w") as f:
-            json.dump(
-                serialized,
-                f,
-                sort_keys=True,
-                indent=4,
-                separators=(",", ": ")
-            )
+        temp_file = self.cache_file + ".tmp"
+        self._write_cache_file(temp_file, serialized)
+        os.replace(temp_file, self.cache_file)
 
+    @synchronized
     def load(self):
         """
-        Loads the content of the cache file into memory
+        Loads the content of the cache file into memory.
+        Afterwards, any records in the journal file are applied on top.
+        Cached objects are kept in their serialized form until they are
+        accessed for the first time.
         :return: None
         """
-        with open(self.cache_file, "r") as f:
-            serialized = json.load(f)
-
-        self.__cache = self.__generate_empty_cache()
+        with self.__file_lock:
+            self.__cache, self.journal_length, corrupted = \
+                self.__read_cache_files()
+            self.__changed = {}
+            self.__removed = {}
 
-        for _model_type, cache_data in serialized.items():
-            model_type = CacheModelType[_model_type]
-            data_class = self.model_map[model_type]  # type: Serializable
-
-            for _site_type, site_data in cache_data.items():
-                site_type = IdType[_site_type]
+            self.__usage = OrderedDict()
+            self.__size = 0
+            for model_type, site_types in self.__cache.items():
+                for site_type, entries in site_types.items():
+                    for tag, entry in entries.items():
+                        self.__track_usage(model_type, site_type, tag, entry)
+            self.__enforce_limits()
+            self.__remember_stored()
 
-                if model_type == CacheModelType.DATA:
-                    self.__cache[model_type][site_type] = site_data
-
-                else:
-                    for tag, entry in site_data.items():
-                        self.__cache[model_type][site_type][tag] = {
-                            "timestamp": entry["timestamp"],
-                            "data": data_class.deserialize(entry["data"])
-                        }
+            # Further records can't safely be appended to a corrupted journal
+            if corrupted:
+                self.compact()
 
+    @synchronized
     def add_primitive(self, site_type: IdType, key: str, value: Any):
         """
         Adds a primitive data object to the cache
@@ -157,11 +281,13 @@ class Cache:
         :param value: the value to cache
         :return: None
         """
-        self.__cache[CacheModelType.DATA][site_type][key] = {
+        self._set_entry(CacheModelType.DATA, site_type, key, {
             "timestamp": time.time(),
             "value": value
-        }
+        })
+        self.__count_addition()
 
+    @synchronized
     def add(
             self,
             site_type: IdType,
@@ -170,6 +296,8 @@ class Cache:
     ):
         """
         Adds a copy of an object to the cache.
+        If the cache is frozen, a frozen copy is added. Objects that are
+        already frozen are added without copying them.
         If the amount of changes exceeds the amount defined in write_after,
         write to file afterwards
         :param site_type: The site for which to cache it
@@ -192,16 +320,25 @@ class Cache:
             _id = data.get_id().get(site_type)
             tag = self.generate_id_tag(data.get_media_type(), _id, username)
 
-            self.__cache[data.get_model_type()][site_type][tag] = {
+            if self.frozen:
+                if not data.is_frozen():
+                    data = deepcopy(data).freeze()
+            else:
+                data = deepcopy(data)
+
+            self._set_entry(data.get_model_type(), site_type, tag, {
                 "timestamp": time.time(),
-                "data": deepcopy(data)
-            }
+                "data": data
+            })
+            self.__count_addition()
+
             if not ignore_for_write_count:
                 self.change_count += 1
 
             if self.change_count >= self.write_after:
                 self.write()
 
+    @synchronized
     def get_primitive(self, site_type: IdType, key: str) -> Optional[Any]:
         """
         Retrieves a primitive data object from the cache
@@ -209,18 +346,21 @@ class Cache:
         :param key: The key to retrieve
         :return: The cached primitive data object or None if no entry in cache
         """
-        if key in self.__cache[CacheModelType.DATA][site_type]:
+        entry = self._get_entry(CacheModelType.DATA, site_type, key)
 
-            entry = self.__cache[CacheModelType.DATA][site_type][key]
-
-            if time.time() - entry["timestamp"] > self.expiration >= 0:
-                self.__cache[CacheModelType.DATA][site_type].pop(key)
-                return None
-            else:
-                return entry["value"]
-        else:
+        if entry is None:
+            self._count_statistic("misses", CacheModelType.DATA)
+            return None
+        elif self._is_expired(entry["timestamp"]):
+            self._remove_entry(CacheModelType.DATA, site_type, key)
+            self._count_statistic("misses", CacheModelType.DATA)
+            self._count_statistic("expirations", CacheModelType.DATA)
             return None
+        else:
+            self._count_statistic("hits", CacheModelType.DATA)
+            return entry["value"]
 
+    @synchronized
     def get(
             self,
             model_type: CacheModelType,
@@ -237,7 +377,9 @@ class Cache:
         :param media_type: The media type of the object to get
         :param _id: The ID to search for
         :param username: Optional-The username associated with the data object
-        :return: A copy of the cached object, or None if it wasn't found
+        :return: A copy of the cached object, or None if it wasn't found.
+                 If the cache is frozen, the frozen cached object itself is
+                 returned instead of a copy
         """
         if model_type == CacheModelType.MEDIA_LIST_ENTRY:
             media = self.get(
@@ -255,25 +397,32 @@ class Cache:
             )
             try:
                 media_cls = MediaListEntry.get_class_for_media_type(media_type)
-                return media_cls(media, user)
+                entry = media_cls(media, user)
             except (ValueError, TypeError):
                 return None
+            return entry.freeze() if self.frozen else entry
 
         else:
             _id = self.__resolve_id(site_type, _id)
             tag = self.generate_id_tag(media_type, _id, username)
 
-            if tag in self.__cache[model_type][site_type]:
-                entry = self.__cache[model_type][site_type][tag]
-                timestamp = entry["timestamp"]
+            entry = self._get_entry(model_type, site_type, tag)
 
-                if time.time() - timestamp > self.expiration >= 0:
-                    self.__cache[model_type][site_type].pop(tag)
-                    return None
-                else:
-                    return deepcopy(entry["data"])
-            else:
+            if entry is None:
+                self._count_statistic("misses", model_type)
                 return None
+            elif self._is_expired(entry["timestamp"]):
+                self._remove_entry(model_type, site_type, tag)
+                self._count_statistic("misses", model_type)
+                self._count_statistic("expirations", model_type)
+                return None
+            else:
+                self._count_statistic("hits", model_type)
+                data = entry["data"]
+                if self.frozen or not self.stores_objects:
+                    return data
+                else:
+                    return deepcopy(data)
 
     def get_media_data(
             self,
@@ -341,6 +490,7 @@ class Cache:
             username
         )
 
+    @synchronized
     def invalidate(
             self,
             model_type: CacheModelType,
@@ -376,8 +526,11 @@ class Cache:
             _id = self.__resolve_id(site_type, _id)
             tag = self.generate_id_tag(media_type, _id, username)
 
-            if tag in self.__cache[model_type][site_type]:
-                self.__cache[model_type][site_type].pop(tag)
+            self._remove_entry(model_type, site_type, tag)
+            if self.shared:
+                # Another process may have stored the entry, so the removal
+                # is remembered to prevent merging from restoring it
+                self.__removed[(model_type, site_type, tag)] = time.time()
 
             # Write to make sure that cache entry is no longer accessible
             self.write()
@@ -443,6 +596,475 @@ class Cache:
             username
         )
 
+    @synchronized
+    def sweep(self):
+        """
+        Removes all expired entries from the cache
+        :return: None
+        """
+        for model_type, site_types in self.__cache.items():
+            for site_type, entries in site_types.items():
+                expired = [
+                    tag for tag, entry in entries.items()
+                    if self._is_expired(entry["timestamp"])
+                ]
+                for tag in expired:
+                    self._remove_entry(model_type, site_type, tag)
+                self._count_statistic("expirations", model_type, len(expired))
+
+    @synchronized
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Retrieves statistics about the usage of the cache
+        :return: A dictionary containing the amount of cache hits, misses,
+                 expired entries, evicted entries as well as the current
+                 amount of entries and their size in bytes.
+                 The size is only tracked if max_bytes is set.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "entries": sum([
+                len(entries)
+                for site_types in self.__cache.values()
+                for entries in site_types.values()
+            ]),
+            "bytes": self.__size
+        }
+
+    def _count_statistic(
+            self,
+            statistic: str,
+            model_type: CacheModelType,
+            amount: int = 1
+    ):
+        """
+        Counts a cache hit, miss, expiration or eviction, both in the
+        statistics of the cache and in its metrics registry
+        :param statistic: The counted statistic, one of 'hits', 'misses',
+                          'expirations' or 'evictions'
+        :param model_type: The model type of the affected entries
+        :param amount: The amount of affected entries
+        :return: None
+        """
+        setattr(self, statistic, getattr(self, statistic) + amount)
+        self.metrics.increment(
+            "cache_" + statistic + "_total",
+            {"model_type": model_type.name},
+            amount
+        )
+
+    def _is_expired(self, timestamp: float) -> bool:
+        """
+        Checks if an entry with a given timestamp has expired
+        :param timestamp: The timestamp of the entry
+        :return: True if the entry has expired, False otherwise
+        """
+        return time.time() - timestamp > self.expiration >= 0
+
+    def _get_entry(
+            self,
+            model_type: CacheModelType,
+            site_type: IdType,
+            tag: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves a raw cache entry from the cache storage.
+        Entries that are still serialized are deserialized and stored
+        in their deserialized form for subsequent accesses. Entries that can't
+        be deserialized are removed.
+        May be overridden by subclasses to use a different storage backend
+        :param model_type: The model type of the entry
+        :param site_type: The site type of the entry
+        :param tag: The tag of the entry
+        :return: The entry, consisting of a timestamp and either a 'data' or
+                 a 'value' key, or None if no such entry exists
+        """
+        entry = self.__cache[model_type][site_type].get(tag)
+
+        if entry is not None and "serialized" in entry:
+            try:
+                entry = self._deserialize_entry(model_type, {
+                    "timestamp": entry["timestamp"],
+                    "data": entry["serialized"]
+                })
+                self.__cache[model_type][site_type][tag] = entry
+            except (TypeError, ValueError):
+                self._remove_entry(model_type, site_type, tag)
+                entry = None
+
+        if entry is not None and self.__is_limited():
+            self.__usage.move_to_end((model_type, site_type, tag))
+
+        return entry
+
+    def _set_entry(
+            self,
+            model_type: CacheModelType,
+            site_type: IdType,
+            tag: str,
+            entry: Dict[str, Any]
+    ):
+        """
+        Stores a raw cache entry in the cache storage.
+        May be overridden by subclasses to use a different storage backend
+        :param model_type: The model type of the entry
+        :param site_type: The site type of the entry
+        :param tag: The tag of the entry
+        :param entry: The entry to store
+        :return: None
+        """
+        self.__cache[model_type][site_type][tag] = entry
+        self.__mark_changed(model_type, site_type, tag)
+        self.__track_usage(model_type, site_type, tag, entry)
+        self.__enforce_limits()
+
+    def _remove_entry(
+            self,
+            model_type: CacheModelType,
+            site_type: IdType,
+            tag: str
+    ):
+        """
+        Removes a raw cache entry from the cache storage, if it exists.
+        If the cache is shared, the removal is written even if the entry
+        does not exist in this cache, since another process may have
+        stored it.
+        May be overridden by subclasses to use a different storage backend
+        :param model_type: The model type of the entry
+        :param site_type: The site type of the entry
+        :param tag: The tag of the entry
+        :return: None
+        """
+        if tag in self.__cache[model_type][site_type]:
+            self.__cache[model_type][site_type].pop(tag)
+            self.__mark_changed(model_type, site_type, tag)
+            self.__size -= self.__usage.pop((model_type, site_type, tag), 0)
+        elif self.shared:
+            self.__mark_changed(model_type, site_type, tag)
+
+    def _write_cache_file(self, path: str, serialized: Dict[str, Any]):
+        """
+        Writes the serialized content of the cache to a file.
+        May be overridden by subclasses to use a different file format
+        :param path: The path of the file to write
+        :param serialized: The serialized content of the cache
+        :return: None
+        """
+        with open(path, "w") as f:
+            json.dump(
+                serialized,
+                f,
+                sort_keys=True,
+                indent=4,
+                separators=(",", ": ")
+            )
+
+    def _read_cache_file(self, path: str) -> Dict[str, Any]:
+        """
+        Reads the serialized content of the cache from a file.
+        May be overridden by subclasses to use a different file format
+        :param path: The path of the file to read
+        :return: The serialized content of the cache
+        """
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def __read_cache_files(self) -> Tuple[
+        Dict[CacheModelType, Dict[IdType, Dict[str, Dict[str, Any]]]],
+        int,
+        bool
+    ]:
+        """
+        Reads the cache file and applies the records of the journal file
+        :return: The cache entries, the amount of journal records and
+                 whether or not the journal contained incomplete records
+        """
+        serialized = self._read_cache_file(self.cache_file)
+
+        cache = self.__generate_empty_cache()
+        for _model_type, cache_data in serialized.items():
+            model_type = CacheModelType[_model_type]
+
+            for _site_type, site_data in cache_data.items():
+                site_type = IdType[_site_type]
+
+                for tag, entry in site_data.items():
+                    cache[model_type][site_type][tag] = \
+                        self.__generate_lazy_entry(model_type, entry)
+
+        journal_length = 0
+        corrupted = False
+        if os.path.isfile(self.journal_file):
+            with open(self.journal_file, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:  # Incomplete record, e.g. after crash
+                        corrupted = True
+                        continue
+                    self.__apply_journal_record(cache, record)
+                    journal_length += 1
+
+        return cache, journal_length, corrupted
+
+    def __merge(
+            self,
+            stored: Dict[CacheModelType,
+                         Dict[IdType, Dict[str, Dict[str, Any]]]]
+    ):
+        """
+        Merges cache entries stored by other processes into this cache.
+        Stored entries replace entries with older timestamps and are added
+        unless this cache removed them after they were stored.
+        Entries that were removed by other processes are removed from this
+        cache as well, unless they were changed in this cache since
+        they were last stored
+        :param stored: The stored cache entries
+        :return: None
+        """
+        for key, timestamp in self.__stored.items():
+            model_type, site_type, tag = key
+            existing = self.__cache[model_type][site_type].get(tag)
+            if tag not in stored[model_type][site_type] \
+                    and existing is not None \
+                    and existing["timestamp"] <= timestamp:
+                self._remove_entry(model_type, site_type, tag)
+
+        for model_type, site_types in stored.items():
+            for site_type, entries in site_types.items():
+                current = self.__cache[model_type][site_type]
+
+                for tag, entry in entries.items():
+                    key = (model_type, site_type, tag)
+                    existing = current.get(tag)
+                    if existing is not None:
+                        newer = entry["timestamp"] > existing["timestamp"]
+                    else:
+                        removed = self.__removed.get(key)
+                        newer = removed is None or entry["timestamp"] > removed
+
+                    if newer:
+                        current[tag] = entry
+                        self.__track_usage(model_type, site_type, tag, entry)
+                        if existing is None and self.__is_limited():
+                            # Not used by this process yet, so entries added
+                            # by other processes are evicted first
+                            self.__usage.move_to_end(key, last=False)
+
+        self.__enforce_limits()
+
+    def __remember_stored(self):
+        """
+        Remembers the timestamps of the entries that are currently stored
+        in the cache file, which makes it possible to detect entries that
+        were removed by other processes.
+        Does nothing if the cache is not shared
+        :return: None
+        """
+        if self.shared:
+            self.__stored = {}
+            for model_type, site_types in self.__cache.items():
+                for site_type, entries in site_types.items():
+                    for tag, entry in entries.items():
+                        self.__stored[(model_type, site_type, tag)] = \
+                            entry["timestamp"]
+
+    def __track_usage(
+            self,
+            model_type: CacheModelType,
+            site_type: IdType,
+            tag: str,
+            entry: Dict[str, Any]
+    ):
+        """
+        Marks an entry as the most recently used entry and keeps track of
+        its size if the size of the cache is limited.
+        Does nothing if neither the amount of entries nor their size
+        is limited
+        :param model_type: The model type of the entry
+        :param site_type: The site type of the entry
+        :param tag: The tag of the entry
+        :param entry: The entry
+        :return: None
+        """
+        if not self.__is_limited():
+            return
+
+        key = (model_type, site_type, tag)
+        size = 0
+        if self.max_bytes is not None:
+            size = len(json.dumps(self._serialize_entry(model_type, entry)))
+
+        self.__size += size - self.__usage.pop(key, 0)
+        self.__usage[key] = size
+
+    def __is_limited(self) -> bool:
+        """
+        Checks if the amount of entries or their size is limited, in which
+        case the usage of the entries is tracked
+        :return: True if the cache is limited, False otherwise
+        """
+        return self.max_entries is not None or self.max_bytes is not None
+
+    def __enforce_limits(self):
+        """
+        Evicts the least recently used entries until the cache no longer
+        exceeds the maximum amount of entries or bytes
+        :return: None
+        """
+        while len(self.__usage) > 0 and (
+                (self.max_entries is not None
+                 and len(self.__usage) > self.max_entries)
+                or (self.max_bytes is not None
+                    and self.__size > self.max_bytes)
+        ):
+            model_type, site_type, tag = next(iter(self.__usage))
+            self._remove_entry(model_type, site_type, tag)
+            self._count_statistic("evictions", model_type)
+
+    def __count_addition(self):
+        """
+        Counts an addition to the cache and removes all expired entries
+        once the sweep interval has been reached
+        :return: None
+        """
+        self.addition_count += 1
+        if 0 < self.sweep_interval <= self.addition_count:
+            self.addition_count = 0
+            self.sweep()
+
+    def __mark_changed(
+            self,
+            model_type: CacheModelType,
+            site_type: IdType,
+            tag: str
+    ):
+        """
+        Remembers that a cache entry was changed, so that it can be appended
+        to the journal on the next write.
+        Does nothing if the cache is not journaled
+        :param model_type: The model type of the changed entry
+        :param site_type: The site type of the changed entry
+        :param tag: The tag of the changed entry
+        :return: None
+        """
+        if self.journal:
+            self.__changed[(model_type, site_type, tag)] = None
+
+    def __append_to_journal(self):
+        """
+        Appends a record for every changed cache entry to the journal file.
+        Entries that no longer exist in the cache are recorded as removals
+        :return: None
+        """
+        records = []
+        for model_type, site_type, tag in self.__changed:
+            record = {
+                "model_type": model_type.name,
+                "site_type": site_type.name,
+                "tag": tag
+            }
+            entry = self.__cache[model_type][site_type].get(tag)
+            if entry is not None:
+                record["entry"] = self._serialize_entry(model_type, entry)
+            records.append(json.dumps(record, separators=(",", ":")) + "\n")
+
+        if len(records) > 0:
+            with open(self.journal_file, "a") as f:
+                f.write("".join(records))
+
+        self.journal_length += len(records)
+        self.__changed = {}
+
+    def __apply_journal_record(
+            self,
+            cache: Dict[CacheModelType,
+                        Dict[IdType, Dict[str, Dict[str, Any]]]],
+            record: Dict[str, Any]
+    ):
+        """
+        Applies a single journal record to cache entries
+        :param cache: The cache entries to which to apply the record
+        :param record: The journal record to apply
+        :return: None
+        """
+        model_type = CacheModelType[record["model_type"]]
+        site_type = IdType[record["site_type"]]
+        tag = record["tag"]
+
+        if "entry" in record:
+            cache[model_type][site_type][tag] = \
+                self.__generate_lazy_entry(model_type, record["entry"])
+        else:
+            cache[model_type][site_type].pop(tag, None)
+
+    @staticmethod
+    def _serialize_entry(model_type: CacheModelType, entry: Dict[str, Any]) \
+            -> Dict[str, Any]:
+        """
+        Serializes a single cache entry
+        :param model_type: The model type of the entry
+        :param entry: The entry to serialize
+        :return: The serialized entry
+        """
+        if model_type == CacheModelType.DATA:
+            return entry
+        elif "serialized" in entry:
+            return {
+                "timestamp": entry["timestamp"],
+                "data": entry["serialized"]
+            }
+        else:
+            return {
+                "timestamp": entry["timestamp"],
+                "data": entry["data"].serialize()
+            }
+
+    def _deserialize_entry(
+            self,
+            model_type: CacheModelType,
+            entry: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Deserializes a single cache entry.
+        If the cache is frozen, the deserialized object is frozen as well
+        :param model_type: The model type of the entry
+        :param entry: The serialized entry
+        :return: The deserialized entry
+        """
+        if model_type == CacheModelType.DATA:
+            return entry
+        else:
+            data_class = self.model_map[model_type]  # type: Serializable
+            data = data_class.deserialize(entry["data"], validate=False)
+            return {
+                "timestamp": entry["timestamp"],
+                "data": data.freeze() if self.frozen else data
+            }
+
+    @staticmethod
+    def __generate_lazy_entry(
+            model_type: CacheModelType,
+            entry: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Generates a cache entry that keeps the cached object in its
+        serialized form until it is accessed
+        :param model_type: The model type of the entry
+        :param entry: The serialized entry
+        :return: The lazy cache entry
+        """
+        if model_type == CacheModelType.DATA:
+            return entry
+        else:
+            return {
+                "timestamp": entry["timestamp"],
+                "serialized": entry["data"]
+            }
+
     @staticmethod
     def __generate_empty_cache() \
             -> Dict[
@@ -0,0 +1,281 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import time
+import json
+import sqlite3
+from typing import Dict, List, Any, Optional
+from anime_list_apis.cache.Cache import Cache, synchronized
+from anime_list_apis.models.attributes.Id import IdType
+from anime_list_apis.models.CacheAble import CacheModelType
+from anime_list_apis.util.Metrics import Metrics
+
+
+class SqliteCache(Cache):
+    """
+    Cache that stores its entries in an SQLite database instead of keeping
+    the entire cache in memory.
+    Every lookup, addition or invalidation only touches a single row,
+    so creating the cache does not depend on the amount of cached entries.
+    Every change is committed to the database immediately.
+    Since the entries are not kept in memory, the amount of entries
+    is not limited.
+    """
+
+    cache_file_name = "cache.db"
+    """
+    The name of the SQLite database file in the cache location
+    """
+
+    stores_objects = False
+    """
+    Every retrieval deserializes the object anew, so retrieved objects
+    don't need to be copied
+    """
+
+    def __init__(
+            self,
+            cache_location: str = None,
+            expiration: int = 6000,
+            frozen: bool = False,
+            metrics: Optional[Metrics] = None
+    ):
+        """
+        Initializes the SQLite Cache. If the cache directory and database do
+        not exist, they will be created here.
+        :param cache_location: The location of the cache. Will default to a
+                               hidden directory in the user's home directory
+        :param expiration: Defines how long objects should be valid.
+                           If set to a negative number, will be infinite
+        :param frozen: If set to True, retrieved objects are frozen and
+                       can't be modified. Since every retrieval
+                       deserializes the object anew, they don't need to
+                       be copied.
+        :param metrics: The metrics registry in which the cache hits,
+                        misses and expirations are recorded.
+                        If None, a new registry is generated
+        """
+        self.__connection = None  # type: sqlite3.Connection
+        super().__init__(
+            cache_location, expiration, frozen=frozen, metrics=metrics
+        )
+
+    @synchronized
+    def write(self):
+        """
+        Since every change is committed immediately, there is nothing to
+        write. Makes sure that the database exists, however.
+        :return: None
+        """
+        self.change_count = 0
+        self.__get_connection()
+
+    @synchronized
+    def compact(self):
+        """
+        Since every entry is stored as a single row, there is nothing
+        to compact. Makes sure that the database exists, however.
+        :return: None
+        """
+        self.write()
+
+    @synchronized
+    def load(self):
+        """
+        Entries are loaded from the database once they are accessed,
+        so this only makes sure that the database exists.
+        :return: None
+        """
+        self.__get_connection()
+
+    @synchronized
+    def sweep(self):
+        """
+        Removes all expired entries from the database
+        :return: None
+        """
+        if self.expiration < 0:
+            return
+
+        connection = self.__get_connection()
+        for model_type in self.__model_types():
+            removed = connection.execute(
+                "DELETE FROM " + self.__table(model_type) +
+                " WHERE timestamp < ?",
+                (time.time() - self.expiration,)
+            ).rowcount
+            self._count_statistic("expirations", model_type, removed)
+
+    @synchronized
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Retrieves statistics about the usage of the cache
+        :return: A dictionary containing the amount of cache hits, misses,
+                 expired entries, evicted entries as well as the current
+                 amount of entries. The size is not tracked.
+        """
+        statistics = super().get_statistics()
+        connection = self.__get_connection()
+        statistics["entries"] = sum([
+            connection.execute("SELECT COUNT(*) FROM " + table).fetchone()[0]
+            for table in self.__tables()
+        ])
+        return statistics
+
+    def _get_entry(
+            self,
+            model_type: CacheModelType,
+            site_type: IdType,
+            tag: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves a raw cache entry from the database.
+        Rows that can't be deserialized are removed
+        :param model_type: The model type of the entry
+        :param site_type: The site type of the entry
+        :param tag: The tag of the entry
+        :return: The entry or None if no such entry exists
+        """
+        row = self.__get_connection().execute(
+            "SELECT timestamp, data FROM " + self.__table(model_type) +
+            " WHERE site_type = ? AND tag = ?",
+            (site_type.name, tag)
+        ).fetchone()
+
+        if row is None:
+            return None
+        else:
+            timestamp, data = row
+            try:
+                return self._deserialize_entry(model_type, {
+                    "timestamp": timestamp,
+                    self.__data_key(model_type): json.loads(data)
+                })
+            except (TypeError, ValueError, KeyError):
+                self._remove_entry(model_type, site_type, tag)
+                return None
+
+    def _set_entry(
+            self,
+            model_type: CacheModelType,
+            site_type: IdType,
+            tag: str,
+            entry: Dict[str, Any]
+    ):
+        """
+        Stores a raw cache entry in the database
+        :param model_type: The model type of the entry
+        :param site_type: The site type of the entry
+        :param tag: The tag of the entry
+        :param entry: The entry to store
+        :return: None
+        """
+        serialized = self._serialize_entry(model_type, entry)
+        self.__get_connection().execute(
+            "INSERT OR REPLACE INTO " + self.__table(model_type) +
+            " (site_type, tag, timestamp, data) VALUES (?, ?, ?, ?)",
+            (
+                site_type.name,
+                tag,
+                serialized["timestamp"],
+                json.dumps(serialized[self.__data_key(model_type)])
+            )
+        )
+
+    def _remove_entry(
+            self,
+            model_type: CacheModelType,
+            site_type: IdType,
+            tag: str
+    ):
+        """
+        Removes a raw cache entry from the database, if it exists
+        :param model_type: The model type of the entry
+        :param site_type: The site type of the entry
+        :param tag: The tag of the entry
+        :return: None
+        """
+        self.__get_connection().execute(
+            "DELETE FROM " + self.__table(model_type) +
+            " WHERE site_type = ? AND tag = ?",
+            (site_type.name, tag)
+        )
+
+    def __get_connection(self) -> sqlite3.Connection:
+        """
+        Retrieves the database connection.
+        If no connection exists yet, it will be opened and the tables
+        will be created if necessary
+        :return: The database connection
+        """
+        if self.__connection is None:
+            self.__connection = sqlite3.connect(
+                self.cache_file,
+                isolation_level=None,
+                check_same_thread=False  # Access is synchronized by the lock
+            )
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("PRAGMA synchronous=NORMAL")
+
+            for table in self.__tables():
+                self.__connection.execute(
+                    "CREATE TABLE IF NOT EXISTS " + table +
+                    " (site_type TEXT NOT NULL, tag TEXT NOT NULL, "
+                    "timestamp REAL NOT NULL, data TEXT NOT NULL, "
+                    "PRIMARY KEY (site_type, tag))"
+                )
+
+        return self.__connection
+
+    @staticmethod
+    def __model_types() -> List[CacheModelType]:
+        """
+        Generates the model types that are stored in the database
+        :return: The model types
+        """
+        return [
+            model_type for model_type in CacheModelType
+            if model_type != CacheModelType.MEDIA_LIST_ENTRY
+        ]
+
+    @classmethod
+    def __tables(cls) -> List[str]:
+        """
+        Generates the names of all tables in the database
+        :return: The table names
+        """
+        return [cls.__table(model_type) for model_type in cls.__model_types()]
+
+    @staticmethod
+    def __table(model_type: CacheModelType) -> str:
+        """
+        Generates the name of the table that stores a model type
+        :param model_type: The model type
+        :return: The table name
+        """
+        return model_type.name.lower()
+
+    @staticmethod
+    def __data_key(model_type: CacheModelType) -> str:
+        """
+        Determines which key of a cache entry contains the cached data
+        :param model_type: The model type of the entry
+        :return: The key of the cached data
+        """
+        return "value" if model_type == CacheModelType.DATA else "data"
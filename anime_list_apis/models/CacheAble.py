@@ -40,6 +40,8 @@ class CacheAble(Serializable):
     Class that defines methods needed to be implemented by a cache-able object
     """
 
+    __slots__ = ()
+
     def generate_tag(self, site_type: IdType) -> str:
         """
         Generates a tag/identifier for storing in the cache
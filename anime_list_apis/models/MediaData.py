@@ -35,6 +35,14 @@ class MediaData(MediaSerializable, CacheAble):
     Class that models user-independent media data
     """
 
+    __slots__ = (
+        "media_type", "id", "title", "relations", "releasing_status",
+        "releasing_start", "releasing_end", "cover_url"
+    )
+    """
+    The attributes shared by all media data objects
+    """
+
     def get_id(self) -> Id:
         """
         Retrieves the cache entry's ID
@@ -89,15 +97,16 @@ class MediaData(MediaSerializable, CacheAble):
         :param cover_url: An URL pointing to a cover image for the anime
         :raises TypeError: If any of the parameters has a wrong type
         """
-        self.ensure_type(media_type, MediaType)
-        self.ensure_type(_id, Id)
-        self.ensure_type(title, Title)
-        self.ensure_type(relations, list)
-        list(map(lambda x: self.ensure_type(x, Relation), relations))
-        self.ensure_type(releasing_status, ReleasingStatus)
-        self.ensure_type(releasing_start, Date, True)
-        self.ensure_type(releasing_end, Date, True)
-        self.ensure_type(cover_url, str, True)
+        if not self.is_trusted():
+            self.ensure_type(media_type, MediaType)
+            self.ensure_type(_id, Id)
+            self.ensure_type(title, Title)
+            self.ensure_type(relations, list)
+            list(map(lambda x: self.ensure_type(x, Relation), relations))
+            self.ensure_type(releasing_status, ReleasingStatus)
+            self.ensure_type(releasing_start, Date, True)
+            self.ensure_type(releasing_end, Date, True)
+            self.ensure_type(cover_url, str, True)
 
         self.media_type = media_type
         self.id = _id
@@ -190,6 +199,11 @@ class AnimeData(MediaData):
     Class that models anime data
     """
 
+    __slots__ = ("episode_count", "episode_duration")
+    """
+    The anime-specific attributes
+    """
+
     def __init__(
             self,
             _id: Id,
@@ -272,6 +286,11 @@ class MangaData(MediaData):
     Class that models manga data
     """
 
+    __slots__ = ("chapter_count", "volume_count")
+    """
+    The manga-specific attributes
+    """
+
     def __init__(
             self,
             _id: Id,
@@ -37,6 +37,16 @@ class MediaListEntry(MediaSerializable, CacheAble):
     Class that models a user's media list entry
     """
 
+    __slots__ = (
+        "media_type", "id", "title", "relations", "releasing_status",
+        "releasing_start", "releasing_end", "cover_url", "username", "score",
+        "consuming_status", "consuming_start", "consuming_end",
+        "__media_data_cls", "__user_data_cls"
+    )
+    """
+    The attributes shared by all media list entries
+    """
+
     def get_id(self) -> Id:
         """
         Retrieves the cache entry's ID
@@ -229,6 +239,11 @@ class AnimeListEntry(MediaListEntry):
     Class that models a user's anime list entry
     """
 
+    __slots__ = ("episode_count", "episode_duration", "episode_progress")
+    """
+    The anime-specific attributes
+    """
+
     def __init__(self, anime_data: AnimeData, user_data: AnimeUserData):
         """
         Initializes the anime list entry.
@@ -281,6 +296,13 @@ class MangaListEntry(MediaListEntry):
     Class that models a user's manga list entry
     """
 
+    __slots__ = (
+        "chapter_count", "volume_count", "chapter_progress", "volume_progress"
+    )
+    """
+    The manga-specific attributes
+    """
+
     def __init__(self, manga_data: MangaData, user_data: MangaUserData):
         """
         Initializes the manga list entry.
@@ -34,6 +34,14 @@ class MediaUserData(MediaSerializable, CacheAble):
     Models a user's entry data for an anime series
     """
 
+    __slots__ = (
+        "id", "media_type", "username", "score", "consuming_status",
+        "consuming_start", "consuming_end"
+    )
+    """
+    The attributes shared by all user data objects
+    """
+
     def get_id(self) -> Id:
         """
         Retrieves the cache entry's ID
@@ -83,13 +91,14 @@ class MediaUserData(MediaSerializable, CacheAble):
         :param consuming_end: The date on which the user completed the entry
         :raises TypeError: If any of the parameters has a wrong type
         """
-        self.ensure_type(media_id, Id)
-        self.ensure_type(media_type, MediaType)
-        self.ensure_type(username, str)
-        self.ensure_type(score, Score)
-        self.ensure_type(consuming_status, ConsumingStatus)
-        self.ensure_type(consuming_start, Date, True)
-        self.ensure_type(consuming_end, Date, True)
+        if not self.is_trusted():
+            self.ensure_type(media_id, Id)
+            self.ensure_type(media_type, MediaType)
+            self.ensure_type(username, str)
+            self.ensure_type(score, Score)
+            self.ensure_type(consuming_status, ConsumingStatus)
+            self.ensure_type(consuming_start, Date, True)
+            self.ensure_type(consuming_end, Date, True)
 
         self.id = media_id
         self.media_type = media_type
@@ -202,6 +211,11 @@ class AnimeUserData(MediaUserData):
     Models a user's entry data for an anime series
     """
 
+    __slots__ = ("episode_progress",)
+    """
+    The anime-specific attributes
+    """
+
     def __init__(
             self,
             media_id: Id,
@@ -275,6 +289,11 @@ class MangaUserData(MediaUserData):
     Models a user's entry data for a manga series
     """
 
+    __slots__ = ("chapter_progress", "volume_progress")
+    """
+    The manga-specific attributes
+    """
+
     def __init__(
             self,
             media_id: Id,
@@ -19,17 +19,195 @@ LICENSE"""
 
 import json
 from copy import deepcopy
+from contextvars import ContextVar
 from typing import Dict, List, Tuple, Set, Optional
 
 from anime_list_apis.models.attributes.MediaType import MediaType
 
 
+class FrozenList(list):
+    """
+    A list that can't be modified. Used for the list attributes of
+    frozen objects.
+    Copies of a frozen list are regular, modifiable lists.
+    """
+
+    __slots__ = ()
+
+    def __raise_frozen(self, *_, **__):
+        """
+        Raises a TypeError, since frozen lists can't be modified
+        :return: None
+        :raises TypeError: Always
+        """
+        raise TypeError("Frozen list can't be modified")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = \
+        __setitem__ = __delitem__ = __iadd__ = __imul__ = __raise_frozen
+
+    def __copy__(self) -> list:
+        """
+        Creates a modifiable shallow copy of the list
+        :return: The copy
+        """
+        return list(self)
+
+    def __deepcopy__(self, memo: Dict[int, object]) -> list:
+        """
+        Creates a modifiable deep copy of the list
+        :param memo: The memo dictionary used by deepcopy
+        :return: The copy
+        """
+        return deepcopy(list(self), memo)
+
+    def __reduce__(self):
+        """
+        Makes sure that the list is pickled as a regular list
+        :return: The reduced form of the list
+        """
+        return list, (list(self),)
+
+
 class Serializable:
     """
     Abstract class that defines methods for subclasses to implement to make
     sure that they can be serialized
     """
 
+    __slots__ = ("__frozen", "__weakref__")
+    """
+    Subclasses define their attributes as slots as well, which keeps the
+    memory footprint of the many model objects low.
+    The frozen attribute indicates if the object was frozen and may no
+    longer be modified
+    """
+
+    __attribute_names = {}  # type: Dict[type, Tuple[str, ...]]
+    """
+    Caches the names of the slot attributes of each subclass
+    """
+
+    __trusted = ContextVar("trusted", default=False)  # type: ContextVar
+    """
+    Indicates if the data that is currently being deserialized is trusted,
+    in which case type checks are skipped
+    """
+
+    def __new__(cls, *_, **__):
+        """
+        Creates a new, unfrozen object
+        :return: The new object
+        """
+        obj = super().__new__(cls)
+        object.__setattr__(obj, "_Serializable__frozen", False)
+        return obj
+
+    @classmethod
+    def _get_attribute_names(cls) -> Tuple[str, ...]:
+        """
+        Retrieves the names of the slot attributes of this class, excluding
+        the frozen flag
+        :return: The attribute names
+        """
+        names = Serializable.__attribute_names.get(cls)
+        if names is None:
+            names = []
+            for _cls in reversed(cls.__mro__):
+                slots = vars(_cls).get("__slots__", ())
+                if isinstance(slots, str):
+                    slots = (slots,)
+                for name in slots:
+                    if name in ["__dict__", "__weakref__"]:
+                        continue
+                    elif name.startswith("__") and not name.endswith("__"):
+                        name = "_" + _cls.__name__.lstrip("_") + name
+                    if name != "_Serializable__frozen" and name not in names:
+                        names.append(name)
+            names = tuple(names)
+            Serializable.__attribute_names[cls] = names
+        return names
+
+    def _get_attributes(self) -> Dict[str, object]:
+        """
+        Retrieves the attributes of this object, excluding the frozen flag
+        :return: The attributes mapped to their names
+        """
+        attributes = {}
+        for name in self._get_attribute_names():
+            try:
+                attributes[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                pass  # Slot was never set
+        # Subclasses that don't define slots store attributes in a dictionary
+        attributes.update(getattr(self, "__dict__", {}))
+        return attributes
+
+    def freeze(self):
+        """
+        Freezes this object and all of its child objects, which makes sure
+        that they can no longer be modified. This makes it possible to
+        share the object instead of copying it.
+        Copies of frozen objects are not frozen.
+        :return: The object itself
+        """
+        for key, value in self._get_attributes().items():
+            if isinstance(value, Serializable):
+                value.freeze()
+            elif isinstance(value, list) and not isinstance(value, FrozenList):
+                for item in value:
+                    if isinstance(item, Serializable):
+                        item.freeze()
+                object.__setattr__(self, key, FrozenList(value))
+
+        object.__setattr__(self, "_Serializable__frozen", True)
+        return self
+
+    def is_frozen(self) -> bool:
+        """
+        Checks if this object is frozen
+        :return: True if the object is frozen, False otherwise
+        """
+        return self.__frozen
+
+    def ensure_not_frozen(self):
+        """
+        Raises a TypeError if this object is frozen
+        :return: None
+        :raises TypeError: If the object is frozen
+        """
+        if self.__frozen:
+            raise TypeError("Frozen object can't be modified")
+
+    def __setattr__(self, key: str, value: object):
+        """
+        Sets an attribute, unless the object is frozen
+        :param key: The name of the attribute
+        :param value: The value to set
+        :return: None
+        :raises TypeError: If the object is frozen
+        """
+        # Checked inline, since attributes are set very frequently
+        if self.__frozen:
+            raise TypeError("Frozen object can't be modified")
+        object.__setattr__(self, key, value)
+
+    def __getstate__(self) -> Dict[str, object]:
+        """
+        Generates the state used for copying and pickling.
+        The frozen flag is not included, so copies can be modified.
+        :return: The state of the object
+        """
+        return self._get_attributes()
+
+    def __setstate__(self, state: Dict[str, object]):
+        """
+        Restores the state of a copied or unpickled object
+        :param state: The state of the object
+        :return: None
+        """
+        for key, value in state.items():
+            object.__setattr__(self, key, value)
+
     def serialize(self) -> Dict[str, Optional[str or int or float or bool
                                 or Dict or List or Tuple or Set]]:
         """
@@ -48,19 +226,32 @@ class Serializable:
 
     @classmethod
     def deserialize(cls, data: Dict[str, Optional[str or int or float or bool
-                                    or Dict or List or Tuple or Set]]):
+                                    or Dict or List or Tuple or Set]],
+                    validate: bool = True):
         """
         Deserializes a dictionary into an object of this type
         :param data: The data to deserialize
+        :param validate: If set to False, the data is trusted to be valid,
+                         for example because it was generated by
+                         serialize(). The type checks of this object and
+                         its child objects are skipped, and the data is
+                         not copied
         :return: The deserialized object
         :raises TypeError: If a type error occurred
         :raises ValueError: If the data could not be deserialized
         """
-        cls.ensure_type(data, dict)
+        token = None
+        if not validate and not cls.__trusted.get():
+            token = cls.__trusted.set(True)
+
         try:
+            cls.ensure_type(data, dict)
             return cls._deserialize(data)  # type: cls
         except KeyError as e:
             raise ValueError("Missing key: " + str(e))
+        finally:
+            if token is not None:
+                cls.__trusted.reset(token)
 
     @classmethod
     def _deserialize(cls, data: Dict[str, Optional[str or int or float or bool
@@ -126,17 +317,27 @@ class Serializable:
         else:
             return True
 
+    @classmethod
+    def is_trusted(cls) -> bool:
+        """
+        Checks if trusted data is currently being deserialized
+        :return: True if the data is trusted, False otherwise
+        """
+        return cls.__trusted.get()
+
     @classmethod
     def ensure_type(cls, obj: object, typ: type, none_allowed: bool = False):
         """
-        Raises a TypeError if the object does not match the type
+        Raises a TypeError if the object does not match the type.
+        Does nothing while trusted data is being deserialized
         :param obj: The object to check
         :param typ: The type the object should be
         :param none_allowed: If True, allows None values
         :return: None
         :raises TypeError: If the types do not match
         """
-        if not cls.type_check(obj, typ, none_allowed):
+        if not cls.__trusted.get() and \
+                not cls.type_check(obj, typ, none_allowed):
             raise TypeError(str(obj) + " is not of type " + str(typ))
 
 
@@ -146,6 +347,8 @@ class MediaSerializable(Serializable):
     Class that allows for easier subclassing of Media classes
     """
 
+    __slots__ = ()
+
     @classmethod
     def get_class_for_media_type(cls, media_type: MediaType):
         """
@@ -210,7 +413,9 @@ class MediaSerializable(Serializable):
         :raises TypeError: If a type error occurred
         :raises ValueError: If the data could not be deserialized
         """
-        data = deepcopy(data)  # To make sure not to change the original data
+        if not cls.is_trusted():
+            # To make sure not to change the original data
+            data = deepcopy(data)
 
         # Auto-resolve the subclass to use
         _cls = cls.get_class_for_media_type(
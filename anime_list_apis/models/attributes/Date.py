@@ -27,6 +27,11 @@ class Date(Serializable):
     Class that models a date consisting of a year, a month and a day
     """
 
+    __slots__ = ("year", "month", "day")
+    """
+    The attributes of the date
+    """
+
     def __init__(self, year: int, month: int, day: int):
         """
         Initializes the date object. Each parameter must be filled out.
@@ -36,7 +41,8 @@ class Date(Serializable):
         :raises TypeError: If any of the parameters is not an integer
         :raises ValueError: If any of the parameters takes on an invalid value
         """
-        self.__ensure_date_correct(year, month, day)
+        if not self.is_trusted():
+            self.__ensure_date_correct(year, month, day)
         self.year, self.month, self.day = year, month, day
 
     @classmethod
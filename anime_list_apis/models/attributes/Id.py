@@ -18,6 +18,7 @@ along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
 LICENSE"""
 
 from enum import Enum
+from weakref import WeakValueDictionary
 from typing import Dict, List, Tuple, Set, Optional
 from anime_list_apis.models.Serializable import Serializable
 
@@ -33,7 +34,20 @@ class IdType(Enum):
 
 class Id(Serializable):
     """
-    Class that models an ID. Has the capability to store different ID types
+    Class that models an ID. Has the capability to store different ID types.
+    IDs are hashable and may therefore be used in sets or as dictionary keys.
+    An ID must not be modified while it is used like that, which is why
+    frozen IDs, for example those generated by intern(), are preferable.
+    """
+
+    __slots__ = ("__ids",)
+    """
+    The IDs mapped to their ID types
+    """
+
+    __interned = WeakValueDictionary()  # type: Dict[Tuple, Id]
+    """
+    Maps the keys of interned IDs to the shared Id objects
     """
 
     def __init__(self, ids: Dict[IdType, int]):
@@ -75,10 +89,63 @@ class Id(Serializable):
         :param id_type: The type of ID for which to set the ID
         :return: None
         :raises TypeError: If the provided ID is not an integer
+                           or the Id is frozen
         """
+        self.ensure_not_frozen()
         self.ensure_type(_id, int)
         self.__ids[id_type] = _id
 
+    def to_tuple(self) -> Tuple[Optional[int], ...]:
+        """
+        Generates a tuple containing the IDs of every ID type,
+        ordered like the IdType enum
+        :return: The ID tuple
+        """
+        ids = self.__ids
+        return tuple([ids[id_type] for id_type in IdType])
+
+    @classmethod
+    def intern(cls, ids: Dict[IdType, int] or "Id") -> "Id":
+        """
+        Retrieves a shared, frozen Id object for the provided IDs.
+        As long as an interned Id object is in use, interning equal IDs
+        will result in that same object, which avoids keeping many copies
+        of the same ID in memory.
+        :param ids: The IDs mapped to an IdType or an existing Id object
+        :return: The shared Id object
+        :raises TypeError: If an invalid parameter type was provided
+        :raises ValueError: In case no valid ID was provided
+        """
+        _id = ids if isinstance(ids, Id) else cls(ids)
+        key = _id.to_tuple()
+        interned = cls.__interned.get(key)
+
+        if interned is None:
+            if _id is ids and not _id.is_frozen():
+                _id = cls(dict(_id.__ids))
+            interned = _id.freeze()
+            cls.__interned[key] = interned
+
+        return interned
+
+    def _equals(self, other: object) -> bool:
+        """
+        Checks if this ID is equal to another ID by comparing the IDs of
+        every ID type
+        :param other: The other ID
+        :return: True if the IDs are equal, False otherwise
+        """
+        # noinspection PyUnresolvedReferences
+        return self.to_tuple() == other.to_tuple()
+
+    def __hash__(self) -> int:
+        """
+        Calculates a hash of the ID that is consistent with the
+        equality check
+        :return: The hash
+        """
+        return hash(self.to_tuple())
+
     def _serialize(self) -> Dict[str, Optional[str or int or float or bool
                                  or Dict or List or Tuple or Set]]:
         """
@@ -17,6 +17,7 @@ You should have received a copy of the GNU General Public License
 along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
 LICENSE"""
 
+from copy import deepcopy
 from enum import Enum
 from typing import Dict, List, Tuple, Set, Optional
 from anime_list_apis.models.Serializable import Serializable
@@ -43,7 +44,19 @@ class RelationType(Enum):
 
 class Relation(Serializable):
     """
-    Class that models a relation edge between two anime entries
+    Class that models a relation edge between two anime entries.
+    Deserialized and parsed relations share interned IDs. Those are copied
+    the first time they are accessed on a relation that is not frozen,
+    which keeps the IDs of such relations safe to modify.
+    """
+
+    __slots__ = (
+        "__source", "__dest", "type", "source_type", "dest_type",
+        "media_type"
+    )
+    """
+    The attributes of the relation. The source and destination IDs are
+    accessed using the source, dest and id properties
     """
 
     def __init__(
@@ -65,20 +78,59 @@ class Relation(Serializable):
                            or other types mismatch
         :raises ValueError: If both IDs are the same, i.e. an invalid relation
         """
-        list(map(lambda x: self.ensure_type(x, Id), [source, dest]))
-        list(map(
-            lambda x: self.ensure_type(x, MediaType), [source_type, dest_type]
-        ))
-        self.ensure_type(relation_type, RelationType)
-
-        if source == dest and source_type == dest_type:
-            raise ValueError("Same ID")
-
-        self.source, self.dest, self.type = source, dest, relation_type
+        if not self.is_trusted():
+            list(map(lambda x: self.ensure_type(x, Id), [source, dest]))
+            list(map(
+                lambda x: self.ensure_type(x, MediaType),
+                [source_type, dest_type]
+            ))
+            self.ensure_type(relation_type, RelationType)
+
+            if source == dest and source_type == dest_type:
+                raise ValueError("Same ID")
+
+        self.__source, self.__dest, self.type = source, dest, relation_type
         self.source_type, self.dest_type = source_type, dest_type
 
         # For easier access
-        self.id, self.media_type = self.dest, self.dest_type
+        self.media_type = self.dest_type
+
+    @property
+    def source(self) -> Id:
+        """
+        :return: The source node in the relation edge
+        """
+        if self.__source.is_frozen() and not self.is_frozen():
+            self.__source = deepcopy(self.__source)
+        return self.__source
+
+    @source.setter
+    def source(self, source: Id):
+        """
+        :param source: The new source node in the relation edge
+        :return: None
+        """
+        self.__source = source
+
+    @property
+    def dest(self) -> Id:
+        """
+        :return: The destination node in the relation edge
+        """
+        if self.__dest.is_frozen() and not self.is_frozen():
+            self.__dest = deepcopy(self.__dest)
+        return self.__dest
+
+    @dest.setter
+    def dest(self, dest: Id):
+        """
+        :param dest: The new destination node in the relation edge
+        :return: None
+        """
+        self.__dest = dest
+
+    # For easier access
+    id = dest
 
     def is_important(self) -> bool:
         """
@@ -89,6 +141,31 @@ class Relation(Serializable):
         # noinspection PyTypeChecker
         return 200 > self.type.value and self.source_type == self.dest_type
 
+    def freeze(self):
+        """
+        Freezes the relation. Its IDs are replaced with interned IDs, so
+        that frozen relations share equal IDs instead of storing copies.
+        :return: The relation itself
+        """
+        if not self.is_frozen():
+            self.__source = Id.intern(self.__source)
+            self.__dest = Id.intern(self.__dest)
+        return super().freeze()
+
+    def __deepcopy__(self, memo: Dict[int, object]) -> "Relation":
+        """
+        Creates a copy of the relation that is not frozen. The copy shares
+        interned IDs, which are only copied once they are accessed
+        :param memo: The memo dictionary used by deepcopy
+        :return: The copy
+        """
+        copied = type(self).__new__(type(self))
+        for key, value in self._get_attributes().items():
+            if isinstance(value, Id):
+                value = Id.intern(value)
+            object.__setattr__(copied, key, value)
+        return copied
+
     def _serialize(self) -> Dict[str, Optional[str or int or float or bool
                                  or Dict or List or Tuple or Set]]:
         """
@@ -96,9 +173,9 @@ class Relation(Serializable):
         :return: The serialized form of this object
         """
         return {
-            "source": self.source.serialize(),
+            "source": self.__source.serialize(),
             "source_type": self.source_type.name,
-            "dest": self.dest.serialize(),
+            "dest": self.__dest.serialize(),
             "dest_type": self.dest_type.name,
             "type": self.type.name
         }
@@ -107,7 +184,9 @@ class Relation(Serializable):
     def _deserialize(cls, data: Dict[str, Optional[str or int or float or bool
                                      or Dict or List or Tuple or Set]]):
         """
-        Deserializes a dictionary into an object of this type
+        Deserializes a dictionary into an object of this type.
+        The IDs of trusted data are interned, so that IDs used by many
+        relations are shared
         :param data: The data to deserialize
         :return: The deserialized object
         :raises TypeError: If a type error occurred
@@ -116,6 +195,10 @@ class Relation(Serializable):
         source = Id.deserialize(data["source"])
         source_type = MediaType[data["source_type"]]
         dest = Id.deserialize(data["dest"])
+        if cls.is_trusted():
+            # The IDs are frozen right away, so interning doesn't copy them
+            source = Id.intern(source.freeze())
+            dest = Id.intern(dest.freeze())
         dest_type = MediaType[data["dest_type"]]
         relation_type = RelationType[data["type"]]
         generated = cls(
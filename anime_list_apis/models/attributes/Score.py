@@ -41,6 +41,11 @@ class Score(Serializable):
     Class that models a score. Allows for different score types.
     """
 
+    __slots__ = ("__score", "mode")
+    """
+    The score value and the score type it is stored in
+    """
+
     def __init__(self, score: int, score_type: ScoreType):
         """
         Initializes the Score object.
@@ -36,6 +36,11 @@ class Title(Serializable):
     Models a title of an entry
     """
 
+    __slots__ = ("__titles", "default")
+    """
+    The titles mapped to their title types and the default title type
+    """
+
     def __init__(
             self,
             titles: Dict[TitleType, str],
@@ -94,7 +99,9 @@ class Title(Serializable):
         :param title_type: The type of that title
         :return: None
         :raises TypeError: If the type of the title string is wrong
+                           or the Title is frozen
         """
+        self.ensure_not_frozen()
         self.ensure_type(title, str)
         self.__titles[title_type] = title
 
@@ -133,9 +140,10 @@ class Title(Serializable):
         :raises TypeError: If a type error occurred
         :raises ValueError: If the data could not be deserialized
         """
-        default = TitleType[data.pop("default")]
+        default = TitleType[data["default"]]
         des = {}
         for title_type, title in data.items():
-            des[TitleType[title_type]] = title
+            if title_type != "default":
+                des[TitleType[title_type]] = title
         generated = cls(des, default=default)  # type: Title
         return generated
@@ -0,0 +1,239 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import json
+import time
+from threading import Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+mal_id_offset = 100000
+"""
+The difference between the myanimelist ID and the anilist ID of the
+generated media
+"""
+
+
+def generate_media(
+        _id: int,
+        relations: int = 1,
+        count: Optional[int] = None,
+        title_length: int = 0,
+        lean: bool = False
+) -> Dict[str, Any]:
+    """
+    Generates a media as returned by the Anilist API
+    :param _id: The anilist ID of the media
+    :param relations: The amount of relations of the media. The related
+                      media are the ones with the following IDs
+    :param count: The amount of media in the dataset. If provided, the IDs
+                  of the related media wrap around to stay in the dataset
+    :param title_length: The length of the title. Can be used to adjust the
+                         size of the payloads
+    :param lean: If True, only includes the IDs of the media
+    :return: The media data
+    """
+    media = {"id": _id, "idMal": _id + mal_id_offset}
+    if lean:
+        return media
+
+    related = [_id + j for j in range(1, relations + 1)]
+    if count is not None:
+        related = [(x - 1) % count + 1 for x in related]
+
+    media.update({
+        "title": {
+            "romaji": ("Anime " + str(_id)).ljust(title_length, "x"),
+            "english": None,
+            "native": None
+        },
+        "status": "FINISHED",
+        "episodes": 12,
+        "duration": 24,
+        "coverImage": {"large": "https://example.com/" + str(_id) + ".png"},
+        "startDate": {"year": 2017, "month": 1, "day": 1},
+        "endDate": {"year": 2017, "month": 3, "day": 31},
+        "relations": {"edges": [
+            {
+                "node": {"id": x, "idMal": x + mal_id_offset},
+                "relationType": "SEQUEL"
+            }
+            for x in related
+        ]}
+    })
+    return media
+
+
+def generate_list_entry(
+        _id: int,
+        username: str = "user",
+        relations: int = 1,
+        count: Optional[int] = None,
+        title_length: int = 0,
+        lean: bool = False
+) -> Dict[str, Any]:
+    """
+    Generates a list entry as returned by the Anilist API
+    :param _id: The anilist ID of the entry
+    :param username: The user the list entry belongs to
+    :param relations: The amount of relations of the media
+    :param count: The amount of media in the dataset
+    :param title_length: The length of the title of the media
+    :param lean: If True, only includes the IDs of the media
+    :return: The list entry data
+    """
+    return {
+        "user": {"name": username},
+        "score": 50,
+        "status": "COMPLETED",
+        "progress": 12,
+        "progressVolumes": 0,
+        "startedAt": {"year": 2018, "month": 1, "day": 1},
+        "completedAt": {"year": None, "month": None, "day": None},
+        "media": generate_media(_id, relations, count, title_length, lean)
+    }
+
+
+def generate_list_response(
+        ids: List[List[int]],
+        has_next_chunk: bool = False,
+        username: str = "user",
+        relations: int = 1,
+        count: Optional[int] = None,
+        title_length: int = 0,
+        lean: bool = False
+) -> Dict[str, Any]:
+    """
+    Generates a MediaListCollection response of the Anilist API
+    :param ids: The anilist IDs of the entries of each list
+    :param has_next_chunk: Indicates if there are more chunks of the list
+    :param username: The user the list belongs to
+    :param relations: The amount of relations of every media
+    :param count: The amount of media in the dataset
+    :param title_length: The length of the titles of the media
+    :param lean: If True, only includes the IDs of the media
+    :return: The response data
+    """
+    return {"data": {"MediaListCollection": {
+        "hasNextChunk": has_next_chunk,
+        "lists": [
+            {"name": "List " + str(i), "entries": [
+                generate_list_entry(
+                    _id, username, relations, count, title_length, lean
+                )
+                for _id in list_ids
+            ]}
+            for i, list_ids in enumerate(ids)
+        ]
+    }}}
+
+
+class StubServer:
+    """
+    Local HTTP server that stands in for the Anilist API.
+    Records the client address and time as well as the body of every request
+    and answers queries with the prepared responses. Once no prepared
+    responses are left, queries are answered using the answer function.
+    Prepared responses with bytes as data are only sent partially before the
+    connection is closed
+    """
+
+    def __init__(
+            self,
+            answer: Optional[Callable[
+                [str, Dict[str, Any]], Tuple[int, Dict[str, str], Dict]
+            ]] = None,
+            record: bool = True,
+            port: int = 0
+    ):
+        """
+        Starts the server in a background thread
+        :param answer: Generates the status code, headers and data of the
+                       response to a query and its variables.
+                       Defaults to a 'Not Found.' error
+        :param record: If False, the requests are not recorded, which keeps
+                       long-running servers from accumulating them
+        :param port: The port to listen on. If 0, a free port is used
+        :return: None
+        """
+        self.clients = []  # type: List[Tuple[Tuple[str, int], float]]
+        self.requests = []  # type: List[Dict]
+        self.responses = []  # type: List[Tuple[int, Dict[str, str], Dict]]
+
+        answer = self.answer_not_found if answer is None else answer
+        clients, bodies, responses = \
+            self.clients, self.requests, self.responses
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            # noinspection PyPep8Naming
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                posted = json.loads(self.rfile.read(length).decode())
+                if record:
+                    bodies.append(posted)
+                    clients.append((self.client_address, time.time()))
+                status, headers, data = responses.pop(0) \
+                    if len(responses) > 0 \
+                    else answer(posted["query"], posted.get("variables", {}))
+
+                if isinstance(data, bytes):
+                    body = data
+                    length = len(body) * 2
+                    self.close_connection = True
+                else:
+                    body = json.dumps(data).encode()
+                    length = len(body)
+
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(length))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = "http://127.0.0.1:" + str(self.server.server_port)
+
+    @staticmethod
+    def answer_not_found(query: str, variables: Dict[str, Any]) \
+            -> Tuple[int, Dict[str, str], Dict]:
+        """
+        Answers a query with a 'Not Found.' error
+        :param query: The query string
+        :param variables: The variables of the query
+        :return: The status code, headers and data of the response
+        """
+        return 200, {}, {"errors": [{"message": "Not Found."}]}
+
+    def stop(self):
+        """
+        Stops the server
+        :return: None
+        """
+        self.server.shutdown()
+        self.server.server_close()
@@ -18,15 +18,27 @@ along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
 LICENSE"""
 
 import os
+import json
 import shutil
+import requests
 from copy import deepcopy
 from unittest import TestCase, mock
 from anime_list_apis.api.AnilistApi import AnilistApi
+from anime_list_apis.api.RateLimiter import RateLimiter
 from anime_list_apis.cache.Cache import Cache
+from anime_list_apis.models.MediaData import MangaData
+from anime_list_apis.models.MediaListEntry import MangaListEntry
+from anime_list_apis.models.MediaUserData import MangaUserData
+from anime_list_apis.models.attributes.ConsumingStatus import ConsumingStatus
+from anime_list_apis.models.attributes.Date import Date
 from anime_list_apis.models.attributes.Id import Id, IdType
 from anime_list_apis.models.attributes.MediaType import MediaType
+from anime_list_apis.models.attributes.Relation import Relation, RelationType
+from anime_list_apis.models.attributes.ReleasingStatus import ReleasingStatus
 from anime_list_apis.models.attributes.Score import Score, ScoreType
-from anime_list_apis.models.attributes.Title import TitleType
+from anime_list_apis.models.attributes.Title import Title, TitleType
+from anime_list_apis.test.api.AnilistStub import StubServer, \
+    generate_list_entry, generate_list_response
 
 
 class TestAnilistApi(TestCase):
@@ -107,6 +119,26 @@ class TestAnilistApi(TestCase):
             self.assertEqual(media_data, entry.get_media_data())
             self.assertEqual(user_data, entry.get_user_data())
 
+    def test_retrieving_data_batch(self):
+        """
+        Tests retrieving multiple data objects at once, including invalid
+        and duplicate IDs
+        :return: None
+        """
+        steins_gate = Id({
+            IdType.KITSU: 5646,
+            IdType.MYANIMELIST: 9253,
+            IdType.ANILIST: 9253
+        })
+        ids = [steins_gate, -1, 1, steins_gate]
+        batch = self.api.get_data_batch(MediaType.ANIME, ids)
+
+        self.assertEqual(len(batch), 4)
+        self.assertIsNone(batch[1])
+        self.assertEqual(batch[0], batch[3])
+        self.assertEqual(batch[0], self.api.get_data(MediaType.ANIME, ids[0]))
+        self.assertEqual(batch[2], self.api.get_data(MediaType.ANIME, ids[2]))
+
     def test_retrieving_invalid_entry(self):
         """
         Tests retrieving invalid entries
@@ -255,8 +287,12 @@ class TestAnilistApi(TestCase):
                 raise ValueError()
 
             # Makes sure that cached value is used from now on
-            with mock.patch("requests.post", new=raise_value_error):
-                with mock.patch("requests.get", new=raise_value_error):
+            with mock.patch.object(
+                    self.api.session, "post", new=raise_value_error
+            ):
+                with mock.patch.object(
+                        self.api.session, "get", new=raise_value_error
+                ):
                     new_fetched_data = self.api.get_data(media_type, _id)
                     new_fetched_entry = self.api.get_list_entry(
                         media_type, _id, self.username
@@ -422,7 +458,9 @@ class TestAnilistApiSpecific(TestCase):
             raise ValueError()
 
         # Makes sure that cached value is used from now on
-        with mock.patch("requests.post", new=raise_value_error):
+        with mock.patch.object(
+                self.api.session, "post", new=raise_value_error
+        ):
             self.assertEqual(
                 self.api.get_anilist_id_from_mal_id(MediaType.ANIME, mal),
                 anilist
@@ -447,3 +485,533 @@ class TestAnilistApiSpecific(TestCase):
         self.assertIsNone(
             self.api.get_anilist_id_from_mal_id(MediaType.ANIME, None)
         )
+
+
+class TestAnilistApiConnections(TestCase):
+    """
+    Tests the HTTP connection handling of the Anilist API using a local
+    stub server
+    """
+
+    def setUp(self):
+        """
+        Starts a stub server
+        :return: None
+        """
+        self.tearDown()
+        os.makedirs("testdir")
+        self.cache = Cache("testdir/.cache")
+        self.server = StubServer()
+        self.clients, self.responses = \
+            self.server.clients, self.server.responses
+
+    def tearDown(self):
+        """
+        Stops the stub server and removes all generated files and directories
+        :return: None
+        """
+        if hasattr(self, "server"):
+            self.server.stop()
+        if os.path.isdir("testdir"):
+            shutil.rmtree("testdir")
+
+    def generate_api(self, session=None) -> AnilistApi:
+        """
+        Generates an Anilist API that uses the stub server
+        :param session: The session to use
+        :return: The API
+        """
+        return AnilistApi(
+            self.cache, 0.0, session,
+            rate_limiter=RateLimiter(), url=self.server.url
+        )
+
+    def test_reusing_connections(self):
+        """
+        Tests that consecutive queries reuse the same connection
+        :return: None
+        """
+        api = self.generate_api()
+        for i in range(1, 6):
+            self.assertIsNone(
+                api.get_data(MediaType.ANIME, i, fresh=True)
+            )
+        self.assertEqual(len(self.clients), 5)
+        self.assertEqual(len(set([x[0] for x in self.clients])), 1)
+        api.close()
+
+    def test_sharing_sessions(self):
+        """
+        Tests that multiple APIs can share a session and its connections
+        :return: None
+        """
+        session = AnilistApi.generate_session(pool_size=1)
+        one = self.generate_api(session)
+        two = self.generate_api(session)
+        self.assertIs(one.session, two.session)
+
+        for api in [one, two, one]:
+            api.get_data(MediaType.MANGA, 1, fresh=True)
+        self.assertEqual(len(self.clients), 3)
+        self.assertEqual(len(set([x[0] for x in self.clients])), 1)
+        session.close()
+
+    def test_backing_off_when_rate_limited(self):
+        """
+        Tests that the API waits as long as the server requires it to once
+        the rate limit was exceeded and then retries the query
+        :return: None
+        """
+        self.responses.append((
+            429, {"Retry-After": "0.3", "X-RateLimit-Remaining": "0"},
+            {"errors": [{"message": "Too Many Requests."}]}
+        ))
+        api = self.generate_api()
+        self.assertIsNone(api.get_data(MediaType.ANIME, 1, fresh=True))
+
+        self.assertEqual(len(self.clients), 2)
+        self.assertGreater(self.clients[1][1] - self.clients[0][1], 0.25)
+        api.close()
+
+    def test_streaming_list(self):
+        """
+        Tests that list entries are yielded and cached one by one
+        :return: None
+        """
+        self.responses.append(
+            (200, {}, generate_list_response([[1, 2], [], [3]]))
+        )
+        api = self.generate_api()
+
+        entries = api.iter_list(MediaType.ANIME, "user")
+        first = next(entries)
+        self.assertEqual(first.id.get(IdType.ANILIST), 1)
+        self.assertEqual(first.title.get(TitleType.ENGLISH), "Anime 1")
+        self.assertEqual(first.score.get(ScoreType.PERCENTAGE), 50)
+        self.assertEqual(
+            api.get_list_entry(MediaType.ANIME, 1, "user"), first
+        )
+
+        remaining = list(entries)
+        self.assertEqual(
+            [x.id.get(IdType.ANILIST) for x in remaining], [2, 3]
+        )
+        self.assertEqual(
+            api.get_list_entry(MediaType.ANIME, 3, "user"), remaining[1]
+        )
+        self.assertEqual(len(self.clients), 1)
+        api.close()
+
+    def test_streaming_list_when_rate_limited(self):
+        """
+        Tests that streamed list queries are retried if the rate limit
+        was exceeded and yield nothing if any other error occurs
+        :return: None
+        """
+        self.responses.append((
+            429, {"Retry-After": "0.1"},
+            {"errors": [{"message": "Too Many Requests."}]}
+        ))
+        self.responses.append(
+            (200, {}, generate_list_response([[1, 2, 3]]))
+        )
+        api = self.generate_api()
+
+        entries = api.get_list(MediaType.MANGA, "user")
+        self.assertEqual(
+            [x.id.get(IdType.ANILIST) for x in entries], [1, 2, 3]
+        )
+        self.assertEqual(len(self.clients), 2)
+
+        self.assertEqual(api.get_list(MediaType.MANGA, "other"), [])
+        self.assertEqual(len(self.clients), 3)
+        api.close()
+
+    def test_recording_metrics(self):
+        """
+        Tests that requests, received bytes, rate limit hits and retries
+        are recorded in the metrics registry of the cache
+        :return: None
+        """
+        self.responses.append((
+            429, {"Retry-After": "0.1"},
+            {"errors": [{"message": "Too Many Requests."}]}
+        ))
+        self.responses.append(
+            (200, {}, generate_list_response([[1, 2, 3]]))
+        )
+        self.responses.append((200, {}, {"data": {"Media": {"id": 5}}}))
+        api = self.generate_api()
+        self.assertEqual(api.metrics, self.cache.metrics)
+
+        api.get_list(MediaType.ANIME, "user")
+        api.get_anilist_id_from_mal_id(MediaType.ANIME, 5)
+
+        collection = {"query": "MediaListCollection"}
+        media = {"query": "Media"}
+        metrics = api.metrics
+        self.assertEqual(metrics.get_counter(
+            "api_requests_total", dict(collection, status="429")
+        ), 1)
+        self.assertEqual(metrics.get_counter(
+            "api_requests_total", dict(collection, status="200")
+        ), 1)
+        self.assertEqual(metrics.get_counter(
+            "api_requests_total", dict(media, status="200")
+        ), 1)
+        self.assertEqual(metrics.get_counter("api_rate_limited_total"), 1)
+        self.assertEqual(metrics.get_counter(
+            "api_retries_total", dict(collection, reason="rate_limit")
+        ), 1)
+        self.assertEqual(
+            metrics.get_histogram("api_request_seconds", collection)["count"],
+            2
+        )
+        self.assertEqual(
+            metrics.get_histogram("api_parse_seconds", media)["count"], 1
+        )
+        self.assertEqual(
+            metrics.get_counter("api_received_bytes_total", media),
+            len(json.dumps({"data": {"Media": {"id": 5}}}))
+        )
+        self.assertGreater(
+            metrics.get_counter("api_received_bytes_total", collection),
+            0
+        )
+        api.close()
+
+    def test_fetching_list_in_chunks(self):
+        """
+        Tests fetching a list in multiple chunks
+        :return: None
+        """
+        self.responses.append(
+            (200, {}, generate_list_response([[1], [2]], True))
+        )
+        self.responses.append(
+            (200, {}, generate_list_response([[3, 4]], True))
+        )
+        self.responses.append(
+            (200, {}, generate_list_response([[5]], False))
+        )
+        api = self.generate_api()
+        api.list_chunk_size = 2
+
+        user_datas = api.get_user_data_list(MediaType.ANIME, "user")
+        self.assertEqual(
+            [x.id.get(IdType.ANILIST) for x in user_datas], [1, 2, 3, 4, 5]
+        )
+        self.assertEqual(
+            [
+                (x["variables"]["chunk"], x["variables"]["perChunk"])
+                for x in self.server.requests
+            ],
+            [(1, 2), (2, 2), (3, 2)]
+        )
+        api.close()
+
+    def test_resuming_failed_chunk(self):
+        """
+        Tests that only the failed chunk is fetched again if the connection
+        drops while a list is being fetched, and that no entries are
+        yielded twice
+        :return: None
+        """
+        second_chunk = json.dumps(generate_list_response([[3, 4]], True))
+        truncated = second_chunk[:second_chunk.index("\"id\": 4")].encode()
+
+        self.responses.append(
+            (200, {}, generate_list_response([[1, 2]], True))
+        )
+        self.responses.append((200, {}, truncated))
+        self.responses.append((200, {}, json.loads(second_chunk)))
+        self.responses.append(
+            (200, {}, generate_list_response([[5]], False))
+        )
+        api = self.generate_api()
+        api.list_chunk_size = 2
+
+        entries = api.get_list(MediaType.ANIME, "user")
+        self.assertEqual(
+            [x.id.get(IdType.ANILIST) for x in entries], [1, 2, 3, 4, 5]
+        )
+        self.assertEqual(
+            [x["variables"]["chunk"] for x in self.server.requests],
+            [1, 2, 2, 3]
+        )
+
+        api.list_chunk_retries = 1
+        self.responses.append((200, {}, truncated))
+        self.responses.append((200, {}, truncated))
+        try:
+            api.get_list(MediaType.ANIME, "user")
+            self.fail()
+        except (requests.RequestException, ValueError):
+            pass
+        api.close()
+
+    def test_retrying_chunk_after_server_error(self):
+        """
+        Tests that errors returned for a chunk after the first are retried
+        and raised once all retries failed, instead of truncating the list
+        :return: None
+        """
+        server_error = (
+            500, {}, {"errors": [{"message": "Internal Server Error"}]}
+        )
+        not_found = (200, {}, {"errors": [{"message": "Not Found."}]})
+
+        self.responses.append(
+            (200, {}, generate_list_response([[1, 2, 3]], True))
+        )
+        self.responses.append(server_error)
+        self.responses.append(not_found)
+        self.responses.append(
+            (200, {}, generate_list_response([[4]], False))
+        )
+        api = self.generate_api()
+
+        entries = api.get_list(MediaType.ANIME, "user")
+        self.assertEqual(
+            [x.id.get(IdType.ANILIST) for x in entries], [1, 2, 3, 4]
+        )
+        self.assertEqual(
+            [x["variables"]["chunk"] for x in self.server.requests],
+            [1, 2, 2, 2]
+        )
+
+        api.list_chunk_retries = 1
+        self.responses.append(
+            (200, {}, generate_list_response([[1, 2, 3]], True))
+        )
+        self.responses.append(server_error)
+        self.responses.append(server_error)
+        try:
+            api.get_list(MediaType.ANIME, "user")
+            self.fail()
+        except requests.HTTPError:
+            pass
+        api.close()
+
+    def test_retrying_first_chunk(self):
+        """
+        Tests that errors returned for the first chunk are retried as well,
+        and that only a user that does not exist results in an empty list
+        :return: None
+        """
+        self.responses.append(
+            (500, {}, {"errors": [{"message": "Internal Server Error"}]})
+        )
+        self.responses.append(
+            (200, {}, {"errors": [{"message": "Unexpected Error"}]})
+        )
+        self.responses.append(
+            (200, {}, generate_list_response([[1, 2]], False))
+        )
+        api = self.generate_api()
+
+        entries = api.get_list(MediaType.ANIME, "user")
+        self.assertEqual(
+            [x.id.get(IdType.ANILIST) for x in entries], [1, 2]
+        )
+        self.assertEqual(
+            [x["variables"]["chunk"] for x in self.server.requests],
+            [1, 1, 1]
+        )
+
+        api.list_chunk_retries = 1
+        self.responses.append(
+            (200, {}, {"errors": [{"message": "Unexpected Error"}]})
+        )
+        self.responses.append(
+            (200, {}, {"errors": [{"message": "Unexpected Error"}]})
+        )
+        try:
+            api.get_list(MediaType.ANIME, "user")
+            self.fail()
+        except requests.HTTPError:
+            pass
+
+        self.responses.append(
+            (200, {}, {"errors": [{"message": "Not Found."}]})
+        )
+        self.assertEqual(api.get_list(MediaType.ANIME, "other"), [])
+        self.assertEqual(len(self.server.requests), 6)
+        api.close()
+
+    def test_fetching_lean_user_data_list(self):
+        """
+        Tests that only the IDs of the media are queried when fetching a
+        list of user data
+        :return: None
+        """
+        self.responses.append(
+            (200, {}, generate_list_response([[1, 2]], lean=True))
+        )
+        api = self.generate_api()
+
+        user_datas = api.get_user_data_list(MediaType.ANIME, "user")
+        self.assertEqual(
+            [x.id.get(IdType.ANILIST) for x in user_datas], [1, 2]
+        )
+        self.assertEqual(
+            [x.id.get(IdType.MYANIMELIST) for x in user_datas],
+            [100001, 100002]
+        )
+        self.assertEqual(user_datas[0].score.get(ScoreType.PERCENTAGE), 50)
+
+        query = self.server.requests[0]["query"]
+        self.assertTrue("progress" in query)
+        self.assertFalse("coverImage" in query)
+        self.assertFalse("relations" in query)
+
+        self.assertEqual(
+            api.get_user_data(MediaType.ANIME, 2, "user", fresh=False),
+            user_datas[1]
+        )
+        self.assertEqual(
+            api.get_anilist_id_from_mal_id(MediaType.ANIME, 100001), 1
+        )
+        self.assertEqual(len(self.clients), 1)
+        api.close()
+
+    def test_fetching_list_entry_in_one_query(self):
+        """
+        Tests that a list entry and its media data are fetched using a single
+        query, and that cached media data is reused unless a fresh entry
+        is requested
+        :return: None
+        """
+        entry = generate_list_entry(1)
+        self.responses.append((200, {}, {"data": {"MediaList": entry}}))
+        api = self.generate_api()
+
+        fetched = api.get_list_entry(MediaType.ANIME, 1, "user", fresh=True)
+        self.assertEqual(fetched.id.get(IdType.ANILIST), 1)
+        self.assertEqual(fetched.title.get(TitleType.ROMAJI), "Anime 1")
+        self.assertEqual(len(self.clients), 1)
+        self.assertTrue("coverImage" in self.server.requests[0]["query"])
+
+        entry["score"] = 70
+        self.cache.invalidate_media_user_data(
+            IdType.ANILIST, MediaType.ANIME, 1, "user"
+        )
+        self.responses.append((200, {}, {"data": {"MediaList": entry}}))
+        fetched = api.get_list_entry(MediaType.ANIME, 1, "user")
+        self.assertEqual(fetched.score.get(ScoreType.PERCENTAGE), 70)
+        self.assertEqual(fetched.title.get(TitleType.ROMAJI), "Anime 1")
+        self.assertEqual(len(self.clients), 2)
+        self.assertFalse("coverImage" in self.server.requests[1]["query"])
+
+        entry["media"]["title"]["romaji"] = "Renamed"
+        self.responses.append((200, {}, {"data": {"MediaList": entry}}))
+        fetched = api.get_list_entry(MediaType.ANIME, 1, "user", fresh=True)
+        self.assertEqual(fetched.title.get(TitleType.ROMAJI), "Renamed")
+        self.assertEqual(len(self.clients), 3)
+        self.assertTrue("coverImage" in self.server.requests[2]["query"])
+
+        self.assertIsNone(
+            api.get_list_entry(MediaType.ANIME, 2, "user", fresh=True)
+        )
+        self.assertEqual(len(self.clients), 4)
+
+        self.responses.append((
+            200, {},
+            {"data": {"MediaList": generate_list_entry(3, lean=True)}}
+        ))
+        user_data = api.get_user_data(MediaType.ANIME, 3, "user", fresh=True)
+        self.assertEqual(user_data.id.get(IdType.MYANIMELIST), 100003)
+        self.assertEqual(len(self.clients), 5)
+        self.assertFalse("coverImage" in self.server.requests[4]["query"])
+        api.close()
+
+    def test_fetching_list_entry_after_server_error(self):
+        """
+        Tests that the media data of a list entry is fetched separately if
+        fetching it in the same query causes a server error
+        :return: None
+        """
+        entry = generate_list_entry(1)
+        self.responses.append((
+            500, {},
+            {"errors": [{"message": "Internal Server Error", "status": 500}]}
+        ))
+        self.responses.append((
+            200, {},
+            {"data": {"MediaList": generate_list_entry(1, lean=True)}}
+        ))
+        self.responses.append((200, {}, {"data": {"Media": entry["media"]}}))
+        api = self.generate_api()
+
+        fetched = api.get_list_entry(MediaType.ANIME, 1, "user", fresh=True)
+        self.assertEqual(fetched.title.get(TitleType.ROMAJI), "Anime 1")
+        self.assertEqual(fetched.score.get(ScoreType.PERCENTAGE), 50)
+        self.assertEqual(len(self.clients), 3)
+        api.close()
+
+    def test_parsing_list_entries(self):
+        """
+        Tests that list entries are parsed into the correct models
+        :return: None
+        """
+        entry = generate_list_entry(1)
+        entry["media"]["relations"]["edges"].append({
+            "node": {"id": 10, "idMal": 20}, "relationType": "ADAPTATION"
+        })
+        entry["media"]["status"] = "NOT_YET_RELEASED"
+        entry["media"]["title"]["english"] = "English"
+        self.responses.append((200, {}, {"data": {"MediaListCollection": {
+            "hasNextChunk": False, "lists": [{"entries": [entry]}]
+        }}}))
+        api = self.generate_api()
+        parsed = api.get_list(MediaType.MANGA, "user")[0]
+
+        _id = Id({IdType.ANILIST: 1, IdType.MYANIMELIST: 100001})
+        expected = MangaListEntry(
+            MangaData(
+                _id,
+                Title({
+                    TitleType.ROMAJI: "Anime 1",
+                    TitleType.ENGLISH: "English",
+                    TitleType.JAPANESE: None
+                }),
+                [
+                    Relation(
+                        _id, MediaType.MANGA,
+                        Id({IdType.ANILIST: 2, IdType.MYANIMELIST: 100002}),
+                        MediaType.MANGA, RelationType.SEQUEL
+                    ),
+                    Relation(
+                        _id, MediaType.MANGA,
+                        Id({IdType.ANILIST: 10, IdType.MYANIMELIST: 20}),
+                        MediaType.ANIME, RelationType.ADAPTATION
+                    )
+                ],
+                ReleasingStatus.NOT_RELEASED,
+                Date(2017, 1, 1),
+                Date(2017, 3, 31),
+                "https://example.com/1.png",
+                12,
+                12
+            ),
+            MangaUserData(
+                _id,
+                "user",
+                Score(50, ScoreType.PERCENTAGE),
+                ConsumingStatus.COMPLETED,
+                Date(2018, 1, 1),
+                None,
+                12,
+                0
+            )
+        )
+        self.assertEqual(parsed, expected)
+        self.assertIs(
+            parsed.relations[0]._get_attributes()["_Relation__source"],
+            parsed.relations[1]._get_attributes()["_Relation__source"]
+        )
+        self.assertFalse(parsed.relations[0].dest.is_frozen())
+        self.assertFalse(parsed.relations[0].source.is_frozen())
+        self.assertIsNot(parsed.relations[0].source, parsed.id)
+        self.assertFalse(parsed.id.is_frozen())
+        api.close()
@@ -0,0 +1,271 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import time
+import shutil
+from copy import deepcopy
+from threading import Event, Thread
+from typing import Dict, List, Tuple, Optional
+from unittest import TestCase
+from anime_list_apis.api.ApiInterface import ApiInterface
+from anime_list_apis.cache.Cache import Cache
+from anime_list_apis.models.MediaData import MediaData, AnimeData
+from anime_list_apis.models.attributes.Id import Id, IdType
+from anime_list_apis.models.attributes.MediaType import MediaType
+from anime_list_apis.models.attributes.Relation import Relation, RelationType
+from anime_list_apis.models.attributes.ReleasingStatus import ReleasingStatus
+from anime_list_apis.models.attributes.Title import Title, TitleType
+
+
+class GraphApi(ApiInterface):
+    """
+    API Interface that serves media data from a predefined relation graph
+    """
+
+    def __init__(
+            self,
+            cache: Cache,
+            edges: Dict[int, List[Tuple[int, RelationType]]]
+    ):
+        """
+        Initializes the API and generates the media data for the graph
+        :param cache: The cache to use
+        :param edges: Maps anilist IDs to their related IDs and the
+                      type of the relation
+        """
+        super().__init__(IdType.ANILIST, cache)
+        self.data_calls = []  # type: List[int]
+        self.batch_calls = []  # type: List[List[int]]
+        self.datas = {}  # type: Dict[int, MediaData]
+
+        for source, destinations in edges.items():
+            relations = [
+                Relation(
+                    Id({IdType.ANILIST: source}), MediaType.ANIME,
+                    Id({IdType.ANILIST: dest}), MediaType.ANIME,
+                    relation_type
+                )
+                for dest, relation_type in destinations
+            ]
+            self.datas[source] = AnimeData(
+                Id({IdType.ANILIST: source}),
+                Title({TitleType.ROMAJI: str(source)}),
+                relations,
+                ReleasingStatus.FINISHED,
+                None, None, None, 12, 24
+            )
+
+    def _get_data(self, media_type: MediaType, _id: Id) \
+            -> Optional[MediaData]:
+        """
+        Retrieves a media data object from the graph
+        :param media_type: The media type to retrieve
+        :param _id: The ID to retrieve
+        :return: The media data or None if it is not part of the graph
+        """
+        anilist_id = _id.get(IdType.ANILIST)
+        self.data_calls.append(anilist_id)
+        return deepcopy(self.datas.get(anilist_id))
+
+    def _get_data_batch(self, media_type: MediaType, ids: List[Id]) \
+            -> List[Optional[MediaData]]:
+        """
+        Retrieves multiple media data objects from the graph
+        :param media_type: The media type to retrieve
+        :param ids: The IDs to retrieve
+        :return: The media data objects
+        """
+        self.batch_calls.append([_id.get(IdType.ANILIST) for _id in ids])
+        return super()._get_data_batch(media_type, ids)
+
+
+class TestApiInterface(TestCase):
+    """
+    Tests the API independent functionality of the API Interface
+    """
+
+    def setUp(self):
+        """
+        Creates a cache and an API for a small relation graph
+        :return: None
+        """
+        self.tearDown()
+        os.makedirs("testdir")
+        self.cache = Cache("testdir/.cache")
+        self.api = GraphApi(self.cache, {
+            1: [(2, RelationType.SEQUEL), (3, RelationType.CHARACTER)],
+            2: [(1, RelationType.PREQUEL), (4, RelationType.SIDE_STORY)],
+            3: [(1, RelationType.CHARACTER), (5, RelationType.SEQUEL)],
+            4: [(2, RelationType.PARENT), (6, RelationType.SEQUEL)],
+            5: [(3, RelationType.PREQUEL)],
+            6: [(4, RelationType.PREQUEL), (7, RelationType.SEQUEL)]
+        })
+
+    def tearDown(self):
+        """
+        Removes all generated files and directories
+        :return: None
+        """
+        if os.path.isdir("testdir"):
+            shutil.rmtree("testdir")
+
+    def related_ids(self, start: int, **kwargs) -> List[int]:
+        """
+        Fetches the related data of a media in the graph
+        :param start: The ID of the media
+        :param kwargs: Additional arguments for get_related_data
+        :return: The IDs of the related data
+        """
+        return [
+            data.id.get(IdType.ANILIST) for data in
+            self.api.get_related_data(self.api.datas[start], **kwargs)
+        ]
+
+    def test_retrieving_data_batch(self):
+        """
+        Tests retrieving multiple data objects at once
+        :return: None
+        """
+        ids = [3, 1, Id({IdType.ANILIST: 3}), 100]
+        batch = self.api.get_data_batch(MediaType.ANIME, ids)
+
+        self.assertEqual(self.api.batch_calls, [[3, 1, 100]])
+        self.assertEqual(batch[0], self.api.datas[3])
+        self.assertEqual(batch[1], self.api.datas[1])
+        self.assertEqual(batch[2], self.api.datas[3])
+        self.assertIsNone(batch[3])
+        self.assertIsNot(batch[0], batch[2])
+
+        self.assertEqual(
+            self.api.get_data_batch(MediaType.ANIME, ids + [2]),
+            batch[0:3] + [None, self.api.datas[2]]
+        )
+        self.assertEqual(self.api.batch_calls[1], [100, 2])
+
+        self.api.get_data_batch(MediaType.ANIME, [1], fresh=True)
+        self.assertEqual(self.api.batch_calls[2], [1])
+
+        self.api._get_data_batch = lambda media_type, _ids: []
+        try:
+            self.api.get_data_batch(MediaType.ANIME, [1], fresh=True)
+            self.fail()
+        except ValueError:
+            pass
+
+    def test_coalescing_concurrent_requests(self):
+        """
+        Tests that concurrent requests for the same data share a single
+        call of the API and receive separate copies of its result
+        :return: None
+        """
+        release = Event()
+        fetch = self.api._get_data
+
+        def blocking_fetch(media_type: MediaType, _id: Id) \
+                -> Optional[MediaData]:
+            release.wait()
+            return fetch(media_type, _id)
+
+        self.api._get_data = blocking_fetch
+        results = []  # type: List[Optional[MediaData]]
+        threads = [
+            Thread(target=lambda x=x: results.append(
+                self.api.get_data(MediaType.ANIME, x)
+            ))
+            for x in [1, 1, Id({IdType.ANILIST: 1}), 2]
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(self.api.data_calls), [1, 2])
+        self.assertEqual(
+            sorted([x.id.get(IdType.ANILIST) for x in results]), [1, 1, 1, 2]
+        )
+        self.assertEqual(len(set([id(x) for x in results])), 4)
+        self.assertEqual(self.api.metrics.get_counter(
+            "api_coalesced_total", {"operation": "data"}
+        ), 2)
+
+        self.api.get_data(MediaType.ANIME, 1, fresh=True)
+        self.assertEqual(sorted(self.api.data_calls), [1, 1, 2])
+
+    def test_fetching_related_data(self):
+        """
+        Tests fetching all related data, one distance level at a time
+        :return: None
+        """
+        self.assertEqual(self.related_ids(1), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(
+            self.api.batch_calls,
+            [[2, 3], [4, 5], [6], [7]]
+        )
+        self.assertEqual(self.api.data_calls, [2, 3, 4, 5, 6, 7])
+
+    def test_fetching_related_data_for_multiple_datas(self):
+        """
+        Tests fetching related data for multiple data objects, which
+        should not result in duplicates
+        :return: None
+        """
+        related = self.api.get_related_data([
+            self.api.datas[6], self.api.datas[5], self.api.datas[6]
+        ])
+        self.assertEqual(
+            [data.id.get(IdType.ANILIST) for data in related],
+            [6, 5, 4, 3, 2, 1]
+        )
+
+    def test_limiting_relation_depth(self):
+        """
+        Tests limiting the amount of relations that are followed
+        :return: None
+        """
+        self.assertEqual(self.related_ids(1, max_depth=0), [1])
+        self.assertEqual(self.related_ids(1, max_depth=1), [1, 2, 3])
+        self.assertEqual(self.related_ids(1, max_depth=2), [1, 2, 3, 4, 5])
+
+    def test_following_only_important_relations(self):
+        """
+        Tests only following important relations
+        :return: None
+        """
+        self.assertEqual(
+            self.related_ids(1, important_only=True), [1, 2, 4, 6]
+        )
+        self.assertEqual(
+            self.related_ids(5, important_only=True), [5, 3]
+        )
+
+    def test_fetching_long_relation_chain(self):
+        """
+        Tests that long relation chains don't hit the recursion limit
+        :return: None
+        """
+        length = 3000
+        api = GraphApi(self.cache, {
+            i: [(i - 1, RelationType.PREQUEL), (i + 1, RelationType.SEQUEL)]
+            for i in range(1, length + 1)
+        })
+        related = api.get_related_data(api.datas[1])
+        self.assertEqual(len(related), length)
@@ -0,0 +1,186 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import time
+import shutil
+import asyncio
+from threading import Lock
+from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from anime_list_apis.api.AsyncApiInterface import AsyncApiInterface
+from anime_list_apis.cache.Cache import Cache
+from anime_list_apis.models.MediaData import MediaData
+from anime_list_apis.models.attributes.Id import Id, IdType
+from anime_list_apis.models.attributes.MediaType import MediaType
+from anime_list_apis.models.attributes.Relation import RelationType
+from anime_list_apis.test.api.TestApiInterface import GraphApi
+
+
+class SlowGraphApi(GraphApi):
+    """
+    Graph API that takes a while for every fetched data object and keeps
+    track of how many data objects are fetched at the same time
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initializes the API
+        :param args: The positional arguments for the GraphApi
+        :param kwargs: The keyword arguments for the GraphApi
+        """
+        super().__init__(*args, **kwargs)
+        self.lock = Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def _get_data(self, media_type: MediaType, _id: Id) \
+            -> Optional[MediaData]:
+        """
+        Retrieves a media data object after a short pause
+        :param media_type: The media type to retrieve
+        :param _id: The ID to retrieve
+        :return: The media data or None if it is not part of the graph
+        """
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        return super()._get_data(media_type, _id)
+
+
+class TestAsyncApiInterface(TestCase):
+    """
+    Tests the asynchronous API interface
+    """
+
+    def setUp(self):
+        """
+        Creates a cache and an asynchronous API for a relation graph
+        :return: None
+        """
+        self.tearDown()
+        os.makedirs("testdir")
+        self.cache = Cache("testdir/.cache")
+        self.graph = SlowGraphApi(self.cache, {
+            i: [(i + 1, RelationType.SEQUEL)] for i in range(1, 13)
+        })
+        self.api = AsyncApiInterface(self.graph, max_concurrency=3)
+
+    def tearDown(self):
+        """
+        Removes all generated files and directories
+        :return: None
+        """
+        if hasattr(self, "api"):
+            self.api.close()
+        if os.path.isdir("testdir"):
+            shutil.rmtree("testdir")
+
+    def test_concurrent_fetching(self):
+        """
+        Tests that multiple data objects are fetched concurrently without
+        exceeding the maximum concurrency or blocking the event loop
+        :return: None
+        """
+        ticks = []
+
+        async def tick():
+            while len(ticks) < 5:
+                ticks.append(time.time())
+                await asyncio.sleep(0.01)
+
+        async def fetch():
+            ticker = asyncio.ensure_future(tick())
+            results = await asyncio.gather(*[
+                self.api.get_data(MediaType.ANIME, i) for i in range(1, 13)
+            ])
+            await ticker
+            return results
+
+        start = time.time()
+        results = asyncio.run(fetch())
+
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual(self.graph.max_active, 3)
+        self.assertEqual(len(ticks), 5)
+        self.assertLess(ticks[-1] - start, 0.15)
+        self.assertEqual(
+            [data.id.get(IdType.ANILIST) for data in results],
+            list(range(1, 13))
+        )
+        self.assertEqual(
+            self.cache.get_media_data(IdType.ANILIST, MediaType.ANIME, 5),
+            results[4]
+        )
+
+    def test_using_multiple_event_loops(self):
+        """
+        Tests that the maximum concurrency is respected when the API is
+        used in multiple event loops, even if the executor would allow
+        more concurrent operations
+        :return: None
+        """
+        executor = ThreadPoolExecutor(8)
+        api = AsyncApiInterface(self.graph, 2, executor)
+
+        async def fetch(ids: List[int]) -> List[Optional[MediaData]]:
+            return await asyncio.gather(*[
+                api.get_data(MediaType.ANIME, i, fresh=True) for i in ids
+            ])
+
+        for ids in [[1, 2, 3, 4], [5, 6, 7, 8]]:
+            results = asyncio.run(fetch(ids))
+            self.assertEqual(
+                [data.id.get(IdType.ANILIST) for data in results], ids
+            )
+        self.assertEqual(self.graph.max_active, 2)
+        api.close()
+
+    def test_using_cache(self):
+        """
+        Tests that the cache of the wrapped API is used
+        :return: None
+        """
+        self.assertIs(self.api.cache, self.cache)
+        self.cache.add(IdType.ANILIST, self.graph.datas[1])
+
+        data = asyncio.run(self.api.get_data(MediaType.ANIME, 1))
+        self.assertEqual(data, self.graph.datas[1])
+        self.assertEqual(self.graph.data_calls, [])
+
+    def test_fetching_related_data(self):
+        """
+        Tests fetching related data asynchronously
+        :return: None
+        """
+        related = asyncio.run(self.api.get_related_data(
+            self.graph.datas[10]
+        ))
+        self.assertEqual(
+            [data.id.get(IdType.ANILIST) for data in related],
+            [10, 11, 12]
+        )
+        batch = asyncio.run(self.api.get_data_batch(
+            MediaType.ANIME, [12, 13, 11]
+        ))
+        self.assertEqual(batch, [related[2], None, related[1]])
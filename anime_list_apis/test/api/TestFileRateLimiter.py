@@ -0,0 +1,132 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import time
+import shutil
+from unittest import TestCase
+from multiprocessing import Process
+from anime_list_apis.api.AnilistApi import AnilistApi
+from anime_list_apis.api.FileRateLimiter import FileRateLimiter
+from anime_list_apis.cache.Cache import Cache
+from anime_list_apis.models.attributes.MediaType import MediaType
+from anime_list_apis.test.api.AnilistStub import StubServer
+
+
+def query(url: str, worker: int, state_file: str):
+    """
+    Sends queries to a server using a rate limiter shared between processes
+    :param url: The URL of the server
+    :param worker: The number of the worker, used for a separate cache
+    :param state_file: The state file of the rate limiter
+    :return: None
+    """
+    api = AnilistApi(
+        Cache("testdir/cache-" + str(worker)),
+        rate_limiter=FileRateLimiter(state_file, 600, burst=1),
+        url=url
+    )
+    for i in range(4):
+        api.get_data(MediaType.ANIME, i + 1, fresh=True)
+
+
+class TestFileRateLimiter(TestCase):
+    """
+    Tests the rate limiter that coordinates using a file
+    """
+
+    def setUp(self):
+        """
+        Prepares the location of the state file
+        :return: None
+        """
+        self.tearDown()
+        os.makedirs("testdir")
+        self.state_file = "testdir/ratelimit/state.json"
+
+    def tearDown(self):
+        """
+        Removes all generated files and directories
+        :return: None
+        """
+        if os.path.isdir("testdir"):
+            shutil.rmtree("testdir")
+
+    def test_sharing_state(self):
+        """
+        Tests that rate limiters using the same state file share their
+        request budget
+        :return: None
+        """
+        one = FileRateLimiter(self.state_file, 60, burst=2)
+        two = FileRateLimiter(self.state_file, 60, burst=2)
+
+        one.acquire()
+        two.acquire()
+        self.assertGreater(one.get_delay(), 0.9)
+        self.assertGreater(two.get_delay(), 0.9)
+
+        one.update(429, {"Retry-After": "30"})
+        self.assertAlmostEqual(two.get_delay(), 30, delta=0.1)
+
+    def test_invalid_state_file(self):
+        """
+        Tests that an invalid state file results in a full bucket
+        :return: None
+        """
+        limiter = FileRateLimiter(self.state_file, 60, burst=2)
+        with open(self.state_file, "w") as f:
+            f.write("{\"tokens\":")
+        limiter.acquire()
+        limiter.acquire()
+        self.assertGreater(limiter.get_delay(), 0.9)
+
+    def test_coordinating_processes(self):
+        """
+        Tests that multiple processes with their own API interfaces
+        share one request budget
+        :return: None
+        """
+        server = StubServer()
+        try:
+            processes = [
+                Process(target=query, args=(server.url, i, self.state_file))
+                for i in range(3)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+        finally:
+            server.stop()
+
+        times = sorted([x[1] for x in server.clients])
+        self.assertEqual(len(times), 12)
+
+        # 600 requests per minute allow one request every 0.1 seconds.
+        # Only the overall rate is checked, since the time at which a
+        # request arrives at the server is subject to scheduling jitter
+        tolerance = 0.2
+        self.assertGreaterEqual(
+            times[-1] - times[0], (len(times) - 1) * 0.1 - tolerance
+        )
+        for start in times:
+            window = [x for x in times if start <= x < start + 0.5]
+            # 5 requests in 0.5 seconds, 1 burst request and 1 for jitter
+            self.assertLessEqual(len(window), 7)
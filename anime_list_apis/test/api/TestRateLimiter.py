@@ -0,0 +1,128 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import time
+from threading import Thread
+from unittest import TestCase
+from anime_list_apis.api.RateLimiter import RateLimiter
+
+
+class TestRateLimiter(TestCase):
+    """
+    Tests the token bucket rate limiter
+    """
+
+    def test_bursting_and_refilling(self):
+        """
+        Tests that a burst of requests is allowed immediately and that
+        further requests are limited to the request rate
+        :return: None
+        """
+        limiter = RateLimiter(600, burst=3)
+
+        start = time.time()
+        for _ in range(3):
+            limiter.acquire()
+        self.assertLess(time.time() - start, 0.05)
+
+        limiter.acquire()
+        limiter.acquire()
+        self.assertGreater(time.time() - start, 0.18)
+        self.assertLess(time.time() - start, 0.4)
+
+    def test_unlimited_requests(self):
+        """
+        Tests that a rate limiter without a request rate does not limit
+        requests by default
+        :return: None
+        """
+        limiter = RateLimiter()
+        start = time.time()
+        for _ in range(100):
+            limiter.acquire()
+        self.assertLess(time.time() - start, 0.1)
+        self.assertEqual(limiter.get_delay(), 0.0)
+
+    def test_honoring_retry_after(self):
+        """
+        Tests that the Retry-After header blocks requests
+        :return: None
+        """
+        limiter = RateLimiter()
+        limiter.update(429, {"Retry-After": "0.2"})
+        self.assertAlmostEqual(limiter.get_delay(), 0.2, delta=0.05)
+
+        start = time.time()
+        limiter.acquire()
+        self.assertGreater(time.time() - start, 0.15)
+        self.assertEqual(limiter.get_delay(), 0.0)
+
+    def test_honoring_remaining_requests(self):
+        """
+        Tests that the remaining requests reported by the server reduce
+        the available tokens
+        :return: None
+        """
+        limiter = RateLimiter(60)
+        limiter.update(200, {"X-RateLimit-Remaining": "1"})
+        self.assertEqual(limiter.get_delay(), 0.0)
+        limiter.acquire()
+        self.assertGreater(limiter.get_delay(), 0.9)
+
+    def test_waiting_for_reset(self):
+        """
+        Tests that no requests are sent until the rate limit is reset
+        once no requests remain
+        :return: None
+        """
+        limiter = RateLimiter(90)
+        limiter.update(200, {
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(time.time() + 5)
+        })
+        self.assertAlmostEqual(limiter.get_delay(), 5, delta=0.1)
+
+    def test_penalty_without_headers(self):
+        """
+        Tests that the penalty is applied if the rate limit was exceeded
+        without the server specifying how long to wait
+        :return: None
+        """
+        limiter = RateLimiter(penalty=30)
+        limiter.update(429, {"Retry-After": "invalid"})
+        self.assertAlmostEqual(limiter.get_delay(), 30, delta=0.1)
+
+    def test_sharing_between_threads(self):
+        """
+        Tests that multiple threads share one request budget
+        :return: None
+        """
+        limiter = RateLimiter(1200, burst=1)
+
+        def acquire():
+            for _ in range(3):
+                limiter.acquire()
+
+        start = time.time()
+        threads = [Thread(target=acquire) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreater(time.time() - start, 0.35)
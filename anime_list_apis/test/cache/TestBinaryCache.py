@@ -0,0 +1,100 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import json
+import marshal
+from anime_list_apis.cache.BinaryCache import BinaryCache
+from anime_list_apis.models.attributes.Id import IdType
+from anime_list_apis.test.cache import TestCache
+from anime_list_apis.test.models.TestMediaListEntry import TestMediaListEntry
+
+
+class TestBinaryCache(TestCache.TestCacher):
+    """
+    Runs the Cacher tests against the binary cache file format
+    """
+
+    cache_class = BinaryCache
+    """
+    The cache class to test
+    """
+
+    def test_binary_file_format(self):
+        """
+        Tests that the cache file is a binary file that is smaller than
+        the equivalent JSON file and that journaled or shared binary
+        caches work as well
+        :return: None
+        """
+        entry = TestMediaListEntry.generate_sample_anime_entry()
+        _id, user, media = entry.id, entry.username, entry.media_type
+        site = IdType.MYANIMELIST
+
+        cache = BinaryCache(self.cache.cache_location, journal=True)
+        cache.add(site, entry)
+        cache.write()
+        cache.compact()
+
+        with open(cache.cache_file, "rb") as f:
+            data = f.read()
+        version, serialized = marshal.loads(data)
+        self.assertEqual(version, BinaryCache.format_version)
+        self.assertLess(len(data), len(json.dumps(serialized, indent=4)))
+
+        shared = BinaryCache(self.cache.cache_location, shared=True)
+        self.assertEqual(
+            shared.get_media_list_entry(site, media, _id, user), entry
+        )
+
+    def test_invalid_binary_file(self):
+        """
+        Tests that invalid or outdated binary cache files are replaced with
+        an empty cache instead of preventing the cache from being used
+        :return: None
+        """
+        self.cache.add_primitive(IdType.ANILIST, "one", 1)
+        self.cache.write()
+
+        for data in [
+            b"{}",
+            b"",
+            marshal.dumps((BinaryCache.format_version + 1, {}))
+        ]:
+            with open(self.cache.cache_file, "wb") as f:
+                f.write(data)
+
+            self.cache.load()
+            self.assertIsNone(
+                self.cache.get_primitive(IdType.ANILIST, "one")
+            )
+            with open(self.cache.cache_file, "rb") as f:
+                self.assertEqual(
+                    marshal.loads(f.read()), (BinaryCache.format_version, {})
+                )
+
+            with open(self.cache.cache_file, "wb") as f:
+                f.write(data)
+            cache = BinaryCache(self.cache.cache_location)
+            cache.add_primitive(IdType.ANILIST, "two", 2)
+            cache.write()
+            self.assertEqual(
+                BinaryCache(self.cache.cache_location)
+                .get_primitive(IdType.ANILIST, "two"),
+                2
+            )
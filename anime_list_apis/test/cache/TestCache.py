@@ -20,8 +20,12 @@ LICENSE"""
 import os
 import time
 import shutil
-from unittest import TestCase
+from copy import deepcopy
+from threading import Thread
+from multiprocessing import Process
+from unittest import TestCase, mock
 from anime_list_apis.cache.Cache import Cache
+from anime_list_apis.models.MediaData import MediaData
 from anime_list_apis.models.attributes.MediaType import MediaType
 from anime_list_apis.models.attributes.Id import IdType, Id
 from anime_list_apis.test.models.TestMediaData import TestMediaData
@@ -29,9 +33,31 @@ from anime_list_apis.test.models.TestMediaListEntry import TestMediaListEntry
 from anime_list_apis.test.models.TestMediaUserData import TestMediaUserData
 
 
+def add_primitives(cache_location: str, prefix: str, amount: int):
+    """
+    Adds primitive values to a shared cache
+    :param cache_location: The location of the cache
+    :param prefix: The prefix of the keys
+    :param amount: The amount of values to add
+    :return: None
+    """
+    cache = Cache(cache_location, write_after=5, shared=True)
+    for i in range(amount):
+        cache.add_primitive(IdType.ANILIST, prefix + str(i), i)
+        if i % 5 == 4:
+            cache.write()
+    cache.write()
+
+
 class TestCacher(TestCase):
     """
-    Tests the Cacher
+    Tests the Cacher.
+    May be subclassed to test other cache storage backends as well
+    """
+
+    cache_class = Cache
+    """
+    The cache class to test
     """
 
     def setUp(self):
@@ -41,7 +67,7 @@ class TestCacher(TestCase):
         """
         self.tearDown()
         os.makedirs("testdir")
-        self.cache = Cache("testdir/.cache")
+        self.cache = self.cache_class("testdir/.cache")
 
     def tearDown(self):
         """
@@ -56,9 +82,9 @@ class TestCacher(TestCase):
         Tests creating a new cache in a custom location
         :return: None
         """
-        Cache("testdir/testcache")
+        cache = self.cache_class("testdir/testcache")
         self.assertTrue(os.path.isdir("testdir/testcache"))
-        self.assertTrue(os.path.isfile("testdir/testcache/cache.json"))
+        self.assertTrue(os.path.isfile(cache.cache_file))
 
     def test_loading_and_retrieving_cache(self):
         """
@@ -78,7 +104,7 @@ class TestCacher(TestCase):
         self.cache.add(IdType.MYANIMELIST, entry)
 
         self.cache.write()
-        new_cache = Cache("testdir/.cache")
+        new_cache = self.cache_class("testdir/.cache")
 
         for cache in [self.cache, new_cache]:
             for _id in [one, two]:
@@ -107,7 +133,7 @@ class TestCacher(TestCase):
         Tests reloading the cache
         :return: None
         """
-        cache = Cache(self.cache.cache_location)
+        cache = self.cache_class(self.cache.cache_location)
         entry = TestMediaListEntry.generate_sample_anime_entry()
         _id, user, media = entry.id, entry.username, entry.media_type
         site = IdType.MYANIMELIST
@@ -203,7 +229,7 @@ class TestCacher(TestCase):
         Tests the lifetime of cache entries
         :return: None
         """
-        cache = Cache(self.cache.cache_location, expiration=0)
+        cache = self.cache_class(self.cache.cache_location, expiration=0)
         entry = TestMediaListEntry.generate_sample_anime_entry()
         _id, user, media = entry.id, entry.username, entry.media_type
         site = IdType.MYANIMELIST
@@ -213,7 +239,7 @@ class TestCacher(TestCase):
         self.assertIsNone(cache.get_media_list_entry(site, media, _id, user))
 
         # Deleted after one second
-        cache = Cache(self.cache.cache_location, expiration=1)
+        cache = self.cache_class(self.cache.cache_location, expiration=1)
         cache.add(site, entry)
         self.assertIsNotNone(
             cache.get_media_list_entry(site, media, _id, user)
@@ -244,13 +270,13 @@ class TestCacher(TestCase):
         x amount of added entries
         :return: None
         """
-        cache = Cache(self.cache.cache_location, write_after=0)
+        cache = self.cache_class(self.cache.cache_location, write_after=0)
         entry = TestMediaListEntry.generate_sample_anime_entry()
         _id, user, media = entry.id, entry.username, entry.media_type
         site = IdType.MYANIMELIST
 
         cache.add(site, entry)
-        new_cache = Cache(self.cache.cache_location)
+        new_cache = self.cache_class(self.cache.cache_location)
         self.assertIsNotNone(new_cache.get_media_list_entry(
             site, media, _id, user
         ))
@@ -262,13 +288,15 @@ class TestCacher(TestCase):
         :return: None
         """
         entry_count = 10
-        cache = Cache(self.cache.cache_location, write_after=entry_count)
+        cache = self.cache_class(
+            self.cache.cache_location, write_after=entry_count
+        )
         data = TestMediaData.generate_sample_anime_data()
         _id, media, site = data.id, data.media_type, IdType.MYANIMELIST
 
         def add_and_check(invalid: bool):
             cache.add(site, data)
-            new_cache = Cache(self.cache.cache_location)
+            new_cache = self.cache_class(self.cache.cache_location)
             self.assertEqual(
                 new_cache.get_media_data(site, media, _id) is None,
                 invalid
@@ -376,3 +404,557 @@ class TestCacher(TestCase):
         self.cache.expiration = 0
         self.assertEqual(None, self.cache.get_primitive(IdType.ANILIST, "one"))
         self.cache.expiration = 60000
+
+    def test_statistics(self):
+        """
+        Tests that cache hits, misses and expirations are counted
+        :return: None
+        """
+        data = TestMediaData.generate_sample_anime_data()
+        _id, media, site = data.id, data.media_type, IdType.MYANIMELIST
+
+        self.cache.get_media_data(site, media, _id)
+        self.cache.add(site, data)
+        self.cache.get_media_data(site, media, _id)
+        self.cache.get_media_data(site, media, _id)
+        self.cache.expiration = 0
+        time.sleep(0.01)
+        self.cache.get_media_data(site, media, _id)
+
+        statistics = self.cache.get_statistics()
+        self.assertEqual(statistics["hits"], 2)
+        self.assertEqual(statistics["misses"], 2)
+        self.assertEqual(statistics["expirations"], 1)
+        self.assertEqual(statistics["evictions"], 0)
+        self.assertEqual(statistics["entries"], 0)
+
+    def test_metrics(self):
+        """
+        Tests that cache hits, misses and expirations are recorded in the
+        metrics registry per model type
+        :return: None
+        """
+        data = TestMediaData.generate_sample_anime_data()
+        _id, media, site = data.id, data.media_type, IdType.MYANIMELIST
+        labels = {"model_type": "MEDIA_DATA"}
+
+        self.cache.get_media_data(site, media, _id)
+        self.cache.add(site, data)
+        self.cache.add_primitive(site, "one", 1)
+        self.cache.get_media_data(site, media, _id)
+        self.cache.get_primitive(site, "one")
+        self.cache.expiration = 0
+        time.sleep(0.01)
+        self.cache.get_media_data(site, media, _id)
+        self.cache.write()
+
+        metrics = self.cache.metrics
+        self.assertEqual(metrics.get_counter("cache_hits_total", labels), 1)
+        self.assertEqual(metrics.get_counter("cache_misses_total", labels), 2)
+        self.assertEqual(
+            metrics.get_counter("cache_expirations_total", labels), 1
+        )
+        self.assertEqual(metrics.get_counter(
+            "cache_hits_total", {"model_type": "DATA"}
+        ), 1)
+        self.assertIn(
+            "cache_hits_total{model_type=\"MEDIA_DATA\"} 1\n",
+            metrics.to_prometheus()
+        )
+
+    def test_sweeping_expired_entries(self):
+        """
+        Tests removing all expired entries from the cache at once
+        :return: None
+        """
+        entry = TestMediaListEntry.generate_sample_anime_entry()
+        site = IdType.MYANIMELIST
+        self.cache.add(site, entry)
+        self.cache.add_primitive(site, "one", 1)
+        self.assertEqual(self.cache.get_statistics()["entries"], 3)
+
+        self.cache.sweep()
+        self.assertEqual(self.cache.get_statistics()["entries"], 3)
+
+        self.cache.expiration = 0
+        time.sleep(0.01)
+        self.cache.sweep()
+        statistics = self.cache.get_statistics()
+        self.assertEqual(statistics["entries"], 0)
+        self.assertEqual(statistics["expirations"], 3)
+
+    def test_frozen_cache(self):
+        """
+        Tests that a frozen cache returns frozen objects and that the
+        objects added to it are not frozen themselves
+        :return: None
+        """
+        cache = self.cache_class(self.cache.cache_location, frozen=True)
+        entry = TestMediaListEntry.generate_sample_anime_entry()
+        _id, user, media = entry.id, entry.username, entry.media_type
+        site = IdType.MYANIMELIST
+
+        cache.add(site, entry)
+        self.assertFalse(entry.is_frozen())
+        self.assertFalse(entry.title.is_frozen())
+
+        for cached in [
+            cache.get_media_data(site, media, _id),
+            cache.get_media_user_data(site, media, _id, user),
+            cache.get_media_list_entry(site, media, _id, user)
+        ]:
+            self.assertTrue(cached.is_frozen())
+            self.assertTrue(cached.id.is_frozen())
+
+        self.assertEqual(
+            cache.get_media_list_entry(site, media, _id, user), entry
+        )
+
+    def test_concurrent_access(self):
+        """
+        Tests adding and retrieving entries from multiple threads
+        :return: None
+        """
+        data = TestMediaData.generate_sample_anime_data()
+        errors = []
+
+        def access(offset: int):
+            try:
+                for i in range(offset, offset + 50):
+                    copy = deepcopy(data)
+                    copy.id = Id({IdType.MYANIMELIST: i})
+                    self.cache.add(IdType.MYANIMELIST, copy)
+                    cached = self.cache.get_media_data(
+                        IdType.MYANIMELIST, MediaType.ANIME, i
+                    )
+                    if cached != copy:
+                        errors.append(i)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [Thread(target=access, args=(i * 50,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.cache.get_statistics()["entries"], 200)
+
+
+class TestInMemoryCache(TestCase):
+    """
+    Tests functionality specific to the in-memory storage of the Cacher
+    """
+
+    def setUp(self):
+        """
+        Creates a cache
+        :return: None
+        """
+        self.tearDown()
+        os.makedirs("testdir")
+        self.cache = Cache("testdir/.cache")
+
+    def tearDown(self):
+        """
+        Removes all generated files and directories
+        :return: None
+        """
+        if os.path.isdir("testdir"):
+            shutil.rmtree("testdir")
+
+    def test_journaled_writes(self):
+        """
+        Tests that a journaled cache only appends changes to the journal
+        file and that those changes are loaded by other cache objects
+        :return: None
+        """
+        cache = Cache(self.cache.cache_location, journal=True)
+        entry = TestMediaListEntry.generate_sample_anime_entry()
+        _id, user, media = entry.id, entry.username, entry.media_type
+        site = IdType.MYANIMELIST
+
+        with open(cache.cache_file, "r") as f:
+            snapshot = f.read()
+
+        cache.add(site, entry)
+        cache.add_primitive(site, "one", 1)
+        cache.write()
+
+        with open(cache.cache_file, "r") as f:
+            self.assertEqual(snapshot, f.read())
+        self.assertTrue(os.path.isfile(cache.journal_file))
+        self.assertEqual(cache.journal_length, 3)
+
+        new_cache = Cache(self.cache.cache_location)
+        self.assertEqual(
+            new_cache.get_media_list_entry(site, media, _id, user), entry
+        )
+        self.assertEqual(new_cache.get_primitive(site, "one"), 1)
+
+        cache.invalidate_media_user_data(site, media, _id, user)
+        self.assertEqual(cache.journal_length, 4)
+
+        new_cache = Cache(self.cache.cache_location)
+        self.assertIsNotNone(new_cache.get_media_data(site, media, _id))
+        self.assertIsNone(
+            new_cache.get_media_user_data(site, media, _id, user)
+        )
+
+    def test_journal_compaction(self):
+        """
+        Tests that the journal is compacted into the cache file once it
+        exceeds the configured amount of records
+        :return: None
+        """
+        cache = Cache(self.cache.cache_location, journal=True, compact_after=3)
+        data = TestMediaData.generate_sample_anime_data()
+        site = IdType.MYANIMELIST
+
+        cache.add(site, data)
+        cache.write()
+        self.assertTrue(os.path.isfile(cache.journal_file))
+
+        for i in range(2, 4):
+            data.id = Id({IdType.MYANIMELIST: i})
+            cache.add(site, data)
+        cache.write()
+
+        self.assertFalse(os.path.isfile(cache.journal_file))
+        self.assertEqual(cache.journal_length, 0)
+
+        new_cache = Cache(self.cache.cache_location)
+        for i in range(1, 4):
+            self.assertIsNotNone(
+                new_cache.get_media_data(site, data.media_type, i)
+            )
+
+    def test_incomplete_journal_record(self):
+        """
+        Tests that an incomplete trailing journal record, for example caused
+        by a crash during writing, is ignored while loading
+        :return: None
+        """
+        cache = Cache(self.cache.cache_location, journal=True)
+        data = TestMediaData.generate_sample_anime_data()
+        site = IdType.MYANIMELIST
+
+        cache.add(site, data)
+        cache.write()
+        with open(cache.journal_file, "a") as f:
+            f.write("{\"model_type\": \"MEDIA_DA")
+
+        new_cache = Cache(self.cache.cache_location, journal=True)
+        self.assertFalse(os.path.isfile(cache.journal_file))
+        self.assertEqual(
+            new_cache.get_media_data(site, data.media_type, data.id), data
+        )
+
+    def test_lazy_deserialization(self):
+        """
+        Tests that cached objects are only deserialized once they are
+        accessed and that the deserialized object is reused afterwards
+        :return: None
+        """
+        data = TestMediaData.generate_sample_anime_data()
+        _id, media, site = data.id, data.media_type, IdType.MYANIMELIST
+        self.cache.add(site, data)
+        self.cache.write()
+
+        with mock.patch.object(
+                MediaData, "deserialize", wraps=MediaData.deserialize
+        ) as deserialize:
+            cache = Cache(self.cache.cache_location)
+            self.assertEqual(deserialize.call_count, 0)
+
+            self.assertEqual(cache.get_media_data(site, media, _id), data)
+            self.assertEqual(cache.get_media_data(site, media, _id), data)
+            self.assertEqual(deserialize.call_count, 1)
+
+            cache.write()
+            self.assertEqual(
+                Cache(self.cache.cache_location).get_media_data(
+                    site, media, _id
+                ),
+                data
+            )
+
+    def test_invalid_serialized_entry(self):
+        """
+        Tests that a cached entry that can't be deserialized is discarded
+        once it is accessed
+        :return: None
+        """
+        data = TestMediaData.generate_sample_anime_data()
+        _id, media, site = data.id, data.media_type, IdType.MYANIMELIST
+        self.cache.add(site, data)
+        self.cache.write()
+
+        with open(self.cache.cache_file, "r") as f:
+            content = f.read()
+        with open(self.cache.cache_file, "w") as f:
+            f.write(content.replace("\"FINISHED\"", "\"FINISHING\""))
+
+        cache = Cache(self.cache.cache_location)
+        self.assertIsNone(cache.get_media_data(site, media, _id))
+        cache.write()
+        self.assertEqual(content.count("FINISHED"), 1)
+        with open(self.cache.cache_file, "r") as f:
+            self.assertFalse("FINISH" in f.read())
+
+    def test_evicting_least_recently_used_entries(self):
+        """
+        Tests that the least recently used entries are evicted once the
+        maximum amount of entries is exceeded
+        :return: None
+        """
+        cache = Cache(self.cache.cache_location, max_entries=2)
+        data = TestMediaData.generate_sample_anime_data()
+        media, site = data.media_type, IdType.MYANIMELIST
+
+        for i in range(1, 3):
+            data.id = Id({site: i})
+            cache.add(site, data)
+        cache.get_media_data(site, media, 1)
+
+        data.id = Id({site: 3})
+        cache.add(site, data)
+
+        self.assertIsNotNone(cache.get_media_data(site, media, 1))
+        self.assertIsNone(cache.get_media_data(site, media, 2))
+        self.assertIsNotNone(cache.get_media_data(site, media, 3))
+        self.assertEqual(cache.get_statistics()["evictions"], 1)
+        self.assertEqual(cache.get_statistics()["entries"], 2)
+
+        cache.write()
+        cache = Cache(self.cache.cache_location, max_entries=1)
+        self.assertEqual(cache.get_statistics()["entries"], 1)
+        self.assertEqual(cache.get_statistics()["evictions"], 1)
+
+    def test_evicting_entries_exceeding_size_limit(self):
+        """
+        Tests that entries are evicted once the maximum amount of bytes
+        is exceeded
+        :return: None
+        """
+        data = TestMediaData.generate_sample_anime_data()
+        media, site = data.media_type, IdType.MYANIMELIST
+        self.cache.max_bytes = 1000000
+        self.cache.add(site, data)
+        size = self.cache.get_statistics()["bytes"]
+        max_bytes = int(size * 2.5)
+
+        cache = Cache(self.cache.cache_location, max_bytes=max_bytes)
+        for i in range(1, 4):
+            data.id = Id({site: i})
+            cache.add(site, data)
+            self.assertLessEqual(cache.get_statistics()["bytes"], max_bytes)
+
+        self.assertIsNone(cache.get_media_data(site, media, 1))
+        self.assertIsNotNone(cache.get_media_data(site, media, 2))
+        self.assertIsNotNone(cache.get_media_data(site, media, 3))
+
+    def test_periodic_sweep(self):
+        """
+        Tests that expired entries are removed from the cache after a
+        certain amount of additions
+        :return: None
+        """
+        cache = Cache(self.cache.cache_location, sweep_interval=3)
+        site = IdType.MYANIMELIST
+
+        cache.add_primitive(site, "one", 1)
+        cache.add_primitive(site, "two", 2)
+        cache.expiration = 0
+        time.sleep(0.01)
+        self.assertEqual(cache.get_statistics()["entries"], 2)
+
+        cache.add_primitive(site, "three", 3)
+        self.assertEqual(cache.get_statistics()["entries"], 0)
+        self.assertEqual(cache.get_statistics()["expirations"], 3)
+
+    def test_frozen_cache_sharing_objects(self):
+        """
+        Tests that a frozen cache returns the cached object itself instead
+        of a copy, also after the cache has been loaded from file
+        :return: None
+        """
+        cache = Cache(self.cache.cache_location, frozen=True)
+        data = TestMediaData.generate_sample_anime_data()
+        _id, media, site = data.id, data.media_type, IdType.MYANIMELIST
+
+        cache.add(site, data)
+        cached = cache.get_media_data(site, media, _id)
+        self.assertIs(cached, cache.get_media_data(site, media, _id))
+
+        cache.add(site, cached)
+        self.assertIs(cached, cache.get_media_data(site, media, _id))
+
+        cache.write()
+        cache = Cache(self.cache.cache_location, frozen=True)
+        cached = cache.get_media_data(site, media, _id)
+        self.assertTrue(cached.is_frozen())
+        self.assertIs(cached, cache.get_media_data(site, media, _id))
+
+    def test_atomic_writes(self):
+        """
+        Tests that a failed write leaves the previous cache file intact
+        :return: None
+        """
+        self.cache.add_primitive(IdType.ANILIST, "one", 1)
+        self.cache.write()
+
+        def fail(*_, **__):
+            raise OSError()
+
+        self.cache.add_primitive(IdType.ANILIST, "two", 2)
+        with mock.patch("json.dump", new=fail):
+            try:
+                self.cache.write()
+                self.fail()
+            except OSError:
+                pass
+
+        cache = Cache(self.cache.cache_location)
+        self.assertEqual(cache.get_primitive(IdType.ANILIST, "one"), 1)
+        self.assertIsNone(cache.get_primitive(IdType.ANILIST, "two"))
+
+    def test_merging_shared_cache(self):
+        """
+        Tests that caches sharing a cache file merge each other's entries
+        and keep the newest version of every entry
+        :return: None
+        """
+        site = IdType.ANILIST
+        one = Cache(self.cache.cache_location, shared=True)
+        two = Cache(self.cache.cache_location, shared=True)
+
+        one.add_primitive(site, "one", 1)
+        one.add_primitive(site, "both", "one")
+        two.add_primitive(site, "two", 2)
+        two.add_primitive(site, "both", "two")
+        one.write()
+        two.write()
+        one.write()
+
+        for cache in [one, two, Cache(self.cache.cache_location)]:
+            self.assertEqual(cache.get_primitive(site, "one"), 1)
+            self.assertEqual(cache.get_primitive(site, "two"), 2)
+            self.assertEqual(cache.get_primitive(site, "both"), "two")
+
+        # Not shared: the cache file only contains this cache's entries
+        Cache(self.cache.cache_location).write()
+        two.add_primitive(site, "three", 3)
+        Cache(self.cache.cache_location).write()
+        self.assertIsNone(
+            Cache(self.cache.cache_location).get_primitive(site, "three")
+        )
+
+    def test_removing_from_shared_cache(self):
+        """
+        Tests that entries removed from a shared cache are not restored by
+        merging, unless they were stored again afterwards
+        :return: None
+        """
+        site = IdType.MYANIMELIST
+        data = TestMediaData.generate_sample_anime_data()
+        _id, media = data.id, data.media_type
+
+        one = Cache(self.cache.cache_location, shared=True)
+        one.add(site, data)
+        one.write()
+
+        two = Cache(self.cache.cache_location, shared=True)
+        two.invalidate_media_data(site, media, _id)
+        one.write()
+        self.assertIsNone(
+            Cache(self.cache.cache_location).get_media_data(site, media, _id)
+        )
+
+        one.add(site, data)
+        one.write()
+        two.write()
+        self.assertEqual(
+            Cache(self.cache.cache_location).get_media_data(site, media, _id),
+            data
+        )
+
+    def test_evicting_from_shared_cache(self):
+        """
+        Tests that entries evicted from a shared cache are not treated like
+        removed entries, so they remain available in the cache file
+        :return: None
+        """
+        site = IdType.MYANIMELIST
+        data = TestMediaData.generate_sample_anime_data()
+        media = data.media_type
+
+        cache = Cache(self.cache.cache_location, shared=True, max_entries=2)
+        for i in range(1, 4):
+            data.id = Id({site: i})
+            cache.add(site, data)
+            if i == 1:
+                cache.write()
+        self.assertEqual(cache.get_statistics()["evictions"], 1)
+        self.assertEqual(cache.get_statistics()["entries"], 2)
+
+        cache.invalidate_media_data(site, media, 3)
+        for cache in [cache, Cache(self.cache.cache_location)]:
+            self.assertIsNotNone(cache.get_media_data(site, media, 1))
+            self.assertIsNotNone(cache.get_media_data(site, media, 2))
+            self.assertIsNone(cache.get_media_data(site, media, 3))
+
+    def test_removing_entry_stored_by_other_cache(self):
+        """
+        Tests that invalidating an entry of a shared cache removes it even
+        if only another process stored it
+        :return: None
+        """
+        site = IdType.MYANIMELIST
+        data = TestMediaData.generate_sample_anime_data()
+        _id, media = data.id, data.media_type
+
+        one = Cache(self.cache.cache_location, shared=True)
+        two = Cache(self.cache.cache_location, shared=True)
+        two.add(site, data)
+        two.write()
+
+        one.invalidate_media_data(site, media, _id)
+        self.assertIsNone(one.get_media_data(site, media, _id))
+        self.assertIsNone(
+            Cache(self.cache.cache_location, shared=True)
+            .get_media_data(site, media, _id)
+        )
+
+        two.write()
+        self.assertIsNone(
+            Cache(self.cache.cache_location).get_media_data(site, media, _id)
+        )
+
+    def test_sharing_cache_between_processes(self):
+        """
+        Tests that multiple processes writing to the same cache don't
+        lose each other's entries
+        :return: None
+        """
+        processes = [
+            Process(
+                target=add_primitives,
+                args=(self.cache.cache_location, str(i) + "-", 25)
+            )
+            for i in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        cache = Cache(self.cache.cache_location)
+        self.assertEqual(cache.get_statistics()["entries"], 100)
+        for i in range(4):
+            for j in range(25):
+                self.assertEqual(
+                    cache.get_primitive(IdType.ANILIST, str(i) + "-" + str(j)),
+                    j
+                )
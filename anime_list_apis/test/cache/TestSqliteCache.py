@@ -0,0 +1,132 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import sqlite3
+from anime_list_apis.cache.SqliteCache import SqliteCache
+from anime_list_apis.models.attributes.Id import IdType
+from anime_list_apis.test.cache import TestCache
+from anime_list_apis.test.models.TestMediaData import TestMediaData
+from anime_list_apis.test.models.TestMediaListEntry import TestMediaListEntry
+
+
+class TestSqliteCache(TestCache.TestCacher):
+    """
+    Runs the Cacher tests against the SQLite storage backend
+    """
+
+    cache_class = SqliteCache
+    """
+    The cache class to test
+    """
+
+    def test_reloading(self):
+        """
+        Tests that entries are immediately visible to other caches using
+        the same database
+        :return: None
+        """
+        cache = SqliteCache(self.cache.cache_location)
+        entry = TestMediaListEntry.generate_sample_anime_entry()
+        _id, user, media = entry.id, entry.username, entry.media_type
+        site = IdType.MYANIMELIST
+
+        cache.add(site, entry)
+        self.assertIsNotNone(self.cache.get_media_list_entry(
+            site, media, _id, user
+        ))
+
+        self.cache.invalidate_media_list_entry(site, media, _id, user)
+        cache.load()
+        self.assertIsNone(cache.get_media_list_entry(site, media, _id, user))
+
+    def test_autowrite(self):
+        """
+        Tests that changes don't have to be written, since they are
+        committed immediately
+        :return: None
+        """
+        self.test_delayed_autowrite()
+
+    def test_delayed_autowrite(self):
+        """
+        Tests that changes don't have to be written, since they are
+        committed immediately
+        :return: None
+        """
+        cache = SqliteCache(self.cache.cache_location)
+        data = TestMediaData.generate_sample_anime_data()
+        _id, media, site = data.id, data.media_type, IdType.MYANIMELIST
+
+        cache.add(site, data)
+        self.assertEqual(
+            SqliteCache(self.cache.cache_location).get_media_data(
+                site, media, _id
+            ),
+            data
+        )
+
+    def test_single_row_per_entry(self):
+        """
+        Tests that every cached entry is stored as a single row
+        in the table of its model type
+        :return: None
+        """
+        entry = TestMediaListEntry.generate_sample_manga_entry()
+        site = IdType.MYANIMELIST
+
+        self.cache.add(site, entry)
+        self.cache.add(site, entry)
+        self.cache.add_primitive(site, "one", 1)
+        self.cache.write()
+
+        connection = sqlite3.connect(self.cache.cache_file)
+        for table, tag in [
+            ("media_data", entry.get_media_data().generate_tag(site)),
+            ("media_user_data", entry.get_user_data().generate_tag(site)),
+            ("data", "one")
+        ]:
+            rows = connection.execute(
+                "SELECT site_type, tag FROM " + table
+            ).fetchall()
+            self.assertEqual(rows, [(site.name, tag)])
+        connection.close()
+
+    def test_removing_invalid_rows(self):
+        """
+        Tests that rows that can't be deserialized are removed and treated
+        like missing entries
+        :return: None
+        """
+        data = TestMediaData.generate_sample_anime_data()
+        _id, media, site = data.id, data.media_type, IdType.MYANIMELIST
+
+        for invalid in ["{\"id\": 1}", "[]", "{"]:
+            self.cache.add(site, data)
+            connection = sqlite3.connect(self.cache.cache_file)
+            connection.execute("UPDATE media_data SET data = ?", (invalid,))
+            connection.commit()
+
+            self.assertIsNone(self.cache.get_media_data(site, media, _id))
+            self.assertEqual(
+                connection.execute(
+                    "SELECT COUNT(*) FROM media_data"
+                ).fetchone()[0],
+                0
+            )
+            connection.close()
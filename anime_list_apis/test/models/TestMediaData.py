@@ -288,6 +288,39 @@ class TestMediaData(TestCase):
                 copy.pop(key)
                 attempt_deserialize(media_class, copy)
 
+    def test_trusted_deserialization(self):
+        """
+        Tests deserializing trusted data without validating it
+        :return: None
+        """
+        for media_class, sample, expected in [
+            (AnimeData, self.generate_sample_serialized_anime_data(),
+             self.generate_sample_anime_data()),
+            (MangaData, self.generate_sample_serialized_manga_data(),
+             self.generate_sample_manga_data())
+        ]:
+            original = deepcopy(sample)
+            data = MediaData.deserialize(sample, validate=False)
+            self.assertEqual(data, expected)
+            self.assertTrue(isinstance(data, media_class))
+            self.assertEqual(sample, original)
+            self.assertFalse(MediaData.is_trusted())
+
+            # Type checks are only skipped while deserializing
+            sample["episode_count"] = "Hello"
+            sample["chapter_count"] = "Hello"
+            media_class.deserialize(sample, validate=False)
+            try:
+                media_class.deserialize(sample)
+                self.fail()
+            except TypeError:
+                pass
+            try:
+                MediaData.ensure_type("Hello", int)
+                self.fail()
+            except TypeError:
+                pass
+
     def test_equality(self):
         """
         Tests that the equality of the objects is handled correctly
@@ -321,3 +354,38 @@ class TestMediaData(TestCase):
         representation = str(data)
         serialised = json.loads(representation)
         self.assertEqual(data, MangaData.deserialize(serialised))
+
+    def test_freezing(self):
+        """
+        Tests that frozen media data and its child objects can't be
+        modified, while copies of it can
+        :return: None
+        """
+        data = self.generate_sample_anime_data()
+        original = deepcopy(data)
+        self.assertFalse(data.is_frozen())
+        self.assertEqual(data.freeze(), original)
+        self.assertTrue(data.is_frozen())
+        self.assertTrue(data.title.is_frozen())
+
+        for modification in [
+            lambda: setattr(data, "cover_url", "https://example.com"),
+            lambda: data.title.set("Test", TitleType.ENGLISH),
+            lambda: data.id.set(100, IdType.KITSU),
+            lambda: data.relations.append(data.relations[0]),
+            lambda: data.relations[0].dest.set(100, IdType.KITSU),
+            lambda: setattr(data.releasing_start, "year", 2000)
+        ]:
+            try:
+                modification()
+                self.fail()
+            except TypeError:
+                pass
+        self.assertEqual(data, original)
+
+        copy = deepcopy(data)
+        self.assertFalse(copy.is_frozen())
+        self.assertFalse(copy.relations[0].is_frozen())
+        copy.relations.append(copy.relations[0])
+        copy.title.set("Test", TitleType.ENGLISH)
+        self.assertNotEqual(copy, data)
@@ -18,6 +18,7 @@ along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
 LICENSE"""
 
 import json
+import pickle
 from copy import deepcopy
 from unittest import TestCase
 from typing import Dict, List, Set, Tuple, Optional
@@ -398,3 +399,33 @@ class TestMediaListEntry(TestCase):
             self.fail()
         except ValueError:
             pass
+
+    def test_slots(self):
+        """
+        Tests that media list entries and their child objects don't use
+        attribute dictionaries, but can still be copied and pickled
+        :return: None
+        """
+        for entry in [
+            self.generate_sample_anime_entry(),
+            self.generate_sample_manga_entry()
+        ]:
+            for obj in [
+                entry,
+                entry.get_media_data(),
+                entry.get_user_data(),
+                entry.id,
+                entry.title,
+                entry.score,
+                entry.relations[0],
+                entry.releasing_start
+            ]:
+                self.assertFalse(hasattr(obj, "__dict__"))
+
+            entry.freeze()
+            for copy in [deepcopy(entry), pickle.loads(pickle.dumps(entry))]:
+                self.assertEqual(copy, entry)
+                self.assertEqual(type(copy), type(entry))
+                self.assertFalse(copy.is_frozen())
+                copy.username = "Other"
+                self.assertNotEqual(copy, entry)
@@ -282,6 +282,24 @@ class TestMediaUserData(TestCase):
                 copy.pop(key)
                 attempt_deserialize(media_class, copy)
 
+    def test_trusted_deserialization(self):
+        """
+        Tests deserializing trusted data without validating it
+        :return: None
+        """
+        for media_class, sample, expected in [
+            (AnimeUserData, self.generate_sample_serialized_anime_user_data(),
+             self.generate_sample_anime_user_data()),
+            (MangaUserData, self.generate_sample_serialized_manga_user_data(),
+             self.generate_sample_manga_user_data())
+        ]:
+            original = deepcopy(sample)
+            data = MediaUserData.deserialize(sample, validate=False)
+            self.assertEqual(data, expected)
+            self.assertTrue(isinstance(data, media_class))
+            self.assertEqual(sample, original)
+            self.assertFalse(MediaUserData.is_trusted())
+
     def test_equality(self):
         """
         Tests that the equality of the objects is handled correctly
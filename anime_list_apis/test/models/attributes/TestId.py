@@ -186,3 +186,53 @@ class TestId(TestCase):
         representation = str(_id)
         serialised = json.loads(representation)
         self.assertEqual(_id, Id.deserialize(serialised))
+
+    def test_freezing(self):
+        """
+        Tests that a frozen ID can't be modified
+        :return: None
+        """
+        _id = Id({IdType.MYANIMELIST: 1}).freeze()
+        try:
+            _id.set(2, IdType.MYANIMELIST)
+            self.fail()
+        except TypeError:
+            self.assertEqual(_id.get(IdType.MYANIMELIST), 1)
+
+    def test_hashing(self):
+        """
+        Tests using IDs in sets and as dictionary keys
+        :return: None
+        """
+        one = Id({IdType.MYANIMELIST: 1, IdType.ANILIST: 2})
+        two = Id({IdType.ANILIST: 2, IdType.MYANIMELIST: 1})
+        three = Id({IdType.MYANIMELIST: 1})
+
+        self.assertEqual(hash(one), hash(two))
+        self.assertEqual(len({one, two, three}), 2)
+        self.assertEqual({one: 1}[two], 1)
+        self.assertNotIn(three, {one: 1})
+        self.assertEqual(one.to_tuple(), (1, 2, None))
+
+    def test_interning(self):
+        """
+        Tests that interned IDs are shared and frozen
+        :return: None
+        """
+        original = Id({IdType.MYANIMELIST: 1, IdType.ANILIST: 2})
+        one = Id.intern(original)
+        two = Id.intern({IdType.ANILIST: 2, IdType.MYANIMELIST: 1})
+        three = Id.intern({IdType.ANILIST: 2})
+
+        self.assertIs(one, two)
+        self.assertIsNot(one, three)
+        self.assertIsNot(one, original)
+        self.assertEqual(one, original)
+        self.assertTrue(one.is_frozen())
+        self.assertFalse(original.is_frozen())
+
+        try:
+            Id.intern({})
+            self.fail()
+        except ValueError:
+            pass
@@ -18,6 +18,7 @@ along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
 LICENSE"""
 
 import json
+from copy import deepcopy
 from unittest import TestCase
 
 from anime_list_apis.models.attributes.MediaType import MediaType
@@ -224,3 +225,50 @@ class TestRelation(TestCase):
         representation = str(relation)
         serialised = json.loads(representation)
         self.assertEqual(relation, Relation.deserialize(serialised))
+
+    def test_sharing_ids(self):
+        """
+        Tests that relations deserialized from trusted data or frozen share
+        their IDs, while still allowing the IDs of relations that are not
+        frozen to be modified
+        :return: None
+        """
+        source = Id({IdType.MYANIMELIST: 1})
+        data = [
+            Relation(source, MediaType.ANIME,
+                     Id({IdType.MYANIMELIST: dest}), MediaType.ANIME,
+                     RelationType.SEQUEL).serialize()
+            for dest in [2, 3]
+        ]
+
+        one, two = [Relation.deserialize(x) for x in data]
+        self.assertIsNot(one.source, two.source)
+        self.assertFalse(one.source.is_frozen())
+
+        one, two = [Relation.deserialize(x, validate=False) for x in data]
+        self.assertIs(
+            one._get_attributes()["_Relation__source"],
+            two._get_attributes()["_Relation__source"]
+        )
+        one.source.set(5, IdType.KITSU)
+        self.assertIs(one.id, one.dest)
+        self.assertFalse(one.source.is_frozen())
+        self.assertNotEqual(one.source, two.source)
+        self.assertEqual(two.source, Id({IdType.MYANIMELIST: 1}))
+        self.assertEqual(one.serialize()["source"]["KITSU"], 5)
+
+        one, two = [Relation.deserialize(x).freeze() for x in data]
+        self.assertIs(one.source, two.source)
+        self.assertIsNot(one.dest, two.dest)
+        self.assertIs(one.id, one.dest)
+        self.assertTrue(one.source.is_frozen())
+        self.assertFalse(source.is_frozen())
+
+        copied = deepcopy(one)
+        self.assertIs(
+            copied._get_attributes()["_Relation__source"], one.source
+        )
+        self.assertFalse(copied.source.is_frozen())
+        copied.source.set(5, IdType.KITSU)
+        self.assertEqual(one.source, Id({IdType.MYANIMELIST: 1}))
+        self.assertNotEqual(copied, one)
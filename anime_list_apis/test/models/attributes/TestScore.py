@@ -190,3 +190,15 @@ class TestScore(TestCase):
         representation = str(score)
         serialised = json.loads(representation)
         self.assertEqual(score, Score.deserialize(serialised))
+
+    def test_freezing(self):
+        """
+        Tests that a frozen score can't be converted
+        :return: None
+        """
+        score = Score(59, ScoreType.PERCENTAGE).freeze()
+        try:
+            score.convert(ScoreType.TEN_POINT)
+            self.fail()
+        except TypeError:
+            self.assertEqual(score.get(), 59)
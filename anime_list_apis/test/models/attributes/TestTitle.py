@@ -255,3 +255,21 @@ class TestTitle(TestCase):
         representation = str(title)
         serialised = json.loads(representation)
         self.assertEqual(title, title.deserialize(serialised))
+
+    def test_freezing(self):
+        """
+        Tests that a frozen title can't be modified
+        :return: None
+        """
+        title = Title({TitleType.ROMAJI: "Test", TitleType.ENGLISH: "Eng"})
+        title.freeze()
+        for modification in [
+            lambda: title.set("Other", TitleType.ROMAJI),
+            lambda: title.change_default_title_type(TitleType.ENGLISH)
+        ]:
+            try:
+                modification()
+                self.fail()
+            except TypeError:
+                pass
+        self.assertEqual(title.get(), "Test")
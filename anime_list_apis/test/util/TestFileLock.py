@@ -0,0 +1,132 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import time
+import shutil
+from threading import Thread
+from unittest import TestCase
+from multiprocessing import Process
+from anime_list_apis.util.FileLock import FileLock
+
+
+def increment(counter_file: str, amount: int):
+    """
+    Increments a counter stored in a file while holding a file lock
+    :param counter_file: The file containing the counter
+    :param amount: How often the counter is incremented
+    :return: None
+    """
+    lock = FileLock(counter_file + ".lock")
+    for _ in range(amount):
+        with lock:
+            with open(counter_file, "r") as f:
+                value = int(f.read())
+            time.sleep(0.001)
+            with open(counter_file, "w") as f:
+                f.write(str(value + 1))
+
+
+class TestFileLock(TestCase):
+    """
+    Tests the file lock
+    """
+
+    def setUp(self):
+        """
+        Creates a counter file
+        :return: None
+        """
+        self.tearDown()
+        os.makedirs("testdir")
+        self.counter_file = "testdir/counter"
+        with open(self.counter_file, "w") as f:
+            f.write("0")
+
+    def tearDown(self):
+        """
+        Removes all generated files and directories
+        :return: None
+        """
+        if os.path.isdir("testdir"):
+            shutil.rmtree("testdir")
+
+    def read_counter(self) -> int:
+        """
+        Reads the counter file
+        :return: The value of the counter
+        """
+        with open(self.counter_file, "r") as f:
+            return int(f.read())
+
+    def test_creating_lock_directory(self):
+        """
+        Tests that the directory of the lock file is created
+        :return: None
+        """
+        with FileLock("testdir/a/b/lock"):
+            self.assertTrue(os.path.isfile("testdir/a/b/lock"))
+
+    def test_reentrant_locking(self):
+        """
+        Tests that the lock may be acquired multiple times by the same
+        thread
+        :return: None
+        """
+        lock = FileLock("testdir/lock")
+        with lock:
+            with lock:
+                pass
+            lock.acquire()
+            lock.release()
+
+        thread = Thread(target=lambda: lock.acquire() or lock.release())
+        thread.start()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+    def test_locking_between_threads(self):
+        """
+        Tests that threads sharing a lock exclude each other
+        :return: None
+        """
+        threads = [
+            Thread(target=increment, args=(self.counter_file, 20))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.read_counter(), 80)
+
+    def test_locking_between_processes(self):
+        """
+        Tests that processes using the same lock file exclude each other
+        :return: None
+        """
+        processes = [
+            Process(target=increment, args=(self.counter_file, 20))
+            for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual(self.read_counter(), 80)
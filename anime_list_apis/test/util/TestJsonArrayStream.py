@@ -0,0 +1,139 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import json
+from unittest import TestCase
+from anime_list_apis.util.JsonArrayStream import JsonArrayStream
+
+
+class TestJsonArrayStream(TestCase):
+    """
+    Tests the JsonArrayStream class
+    """
+
+    data = {
+        "data": {
+            "name": "entries",
+            "lists": [
+                {"name": "\"entries\"", "entries": [
+                    {"id": 1, "entries": [100]}, 12345, "text", None
+                ]},
+                {"entries": []},
+                {"entries": [[1, 2], 1.5e3, True]}
+            ]
+        },
+        "errors": [{"message": "Not Found."}]
+    }
+    """
+    Sample JSON data containing arrays with the keys 'entries' and 'errors'
+    """
+
+    def test_parsing_chunks(self):
+        """
+        Tests parsing JSON text split into chunks of different sizes
+        :return: None
+        """
+        expected = [
+            ("entries", {"id": 1, "entries": [100]}),
+            ("entries", 12345),
+            ("entries", "text"),
+            ("entries", None),
+            ("entries", [1, 2]),
+            ("entries", 1500.0),
+            ("entries", True),
+            ("errors", {"message": "Not Found."})
+        ]
+        for indent in [None, 4]:
+            text = json.dumps(self.data, indent=indent)
+            for size in [1, 2, 3, 7, 64, len(text)]:
+                chunks = [
+                    text[i:i + size] for i in range(0, len(text), size)
+                ]
+                self.assertEqual(
+                    list(JsonArrayStream(chunks, ["entries", "errors"])),
+                    expected
+                )
+
+    def test_parsing_lazily(self):
+        """
+        Tests that items are yielded before the following chunks are read
+        :return: None
+        """
+        read = []
+
+        def generate_chunks():
+            for chunk in ["{\"entries\": [1, ", "2, ", "3]}"]:
+                read.append(chunk)
+                yield chunk
+
+        stream = iter(JsonArrayStream(generate_chunks(), ["entries"]))
+        self.assertEqual(next(stream), ("entries", 1))
+        self.assertEqual(len(read), 1)
+        self.assertEqual(next(stream), ("entries", 2))
+        self.assertEqual(len(read), 2)
+        self.assertEqual(list(stream), [("entries", 3)])
+
+    def test_ignoring_other_keys(self):
+        """
+        Tests that arrays with other keys and non-array values are ignored
+        :return: None
+        """
+        text = json.dumps({"entries": None, "other": [1, 2], "x": "entries"})
+        self.assertEqual(list(JsonArrayStream([text], ["entries"])), [])
+        self.assertEqual(list(JsonArrayStream([], ["entries"])), [])
+
+    def test_parsing_values(self):
+        """
+        Tests yielding the values of keys as a whole
+        :return: None
+        """
+        text = json.dumps({
+            "data": {"hasNext": True, "entries": [1, 2], "other": {"a": 1}}
+        })
+        for size in [1, 5, len(text)]:
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            stream = JsonArrayStream(chunks, ["entries"], ["hasNext", "other"])
+            self.assertEqual(
+                list(stream),
+                [
+                    ("hasNext", True),
+                    ("entries", 1),
+                    ("entries", 2),
+                    ("other", {"a": 1})
+                ]
+            )
+
+    def test_invalid_json(self):
+        """
+        Tests that invalid or incomplete JSON text raises a ValueError
+        :return: None
+        """
+        for text in [
+            "{\"entries\": [1, 2",
+            "{\"entries\": [{\"a\": 1}, {\"a\"",
+            "{\"entries\": [1, x]}",
+            "{\"entr",
+            "{\"data\": {\"entries\": [1]",
+            "{\"data\": {\"entries\": "
+        ]:
+            try:
+                list(JsonArrayStream([text], ["entries"]))
+                self.fail()
+            except ValueError:
+                pass
@@ -0,0 +1,124 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import shutil
+from unittest import TestCase
+from anime_list_apis.util.Metrics import Metrics
+
+
+class TestMetrics(TestCase):
+    """
+    Tests the Metrics class
+    """
+
+    def setUp(self):
+        """
+        Creates a directory for dumped metrics
+        :return: None
+        """
+        self.tearDown()
+        os.makedirs("testdir")
+
+    def tearDown(self):
+        """
+        Removes the directory for dumped metrics
+        :return: None
+        """
+        if os.path.isdir("testdir"):
+            shutil.rmtree("testdir")
+
+    def test_counters(self):
+        """
+        Tests incrementing counters with and without labels
+        :return: None
+        """
+        metrics = Metrics()
+        metrics.increment("requests")
+        metrics.increment("requests", amount=2)
+        metrics.increment("requests", {"query": "Media", "status": "200"})
+        metrics.increment("requests", {"status": "200", "query": "Media"})
+
+        self.assertEqual(metrics.get_counter("requests"), 3)
+        self.assertEqual(
+            metrics.get_counter("requests", {"query": "Media", "status": 200}),
+            2
+        )
+        self.assertEqual(metrics.get_counter("requests", {"query": "X"}), 0)
+        self.assertEqual(metrics.get_counter("other"), 0)
+        self.assertEqual(metrics.collect(), {"requests": {
+            (): 3, (("query", "Media"), ("status", "200")): 2
+        }})
+
+    def test_histograms(self):
+        """
+        Tests recording values in histograms
+        :return: None
+        """
+        metrics = Metrics()
+        metrics.observe("duration", 0.001)
+        metrics.observe("duration", 0.3)
+        metrics.observe("duration", 100.0)
+        with metrics.time("duration", {"query": "Media"}):
+            pass
+
+        histogram = metrics.get_histogram("duration")
+        self.assertEqual(histogram["count"], 3)
+        self.assertAlmostEqual(histogram["sum"], 100.301)
+        self.assertEqual(histogram["buckets"][0.001], 1)
+        self.assertEqual(histogram["buckets"][0.25], 1)
+        self.assertEqual(histogram["buckets"][0.5], 2)
+        self.assertEqual(histogram["buckets"][30.0], 2)
+        self.assertEqual(histogram["buckets"][float("inf")], 3)
+        self.assertEqual(
+            metrics.get_histogram("duration", {"query": "Media"})["count"], 1
+        )
+        self.assertEqual(metrics.get_histogram("other")["count"], 0)
+
+    def test_prometheus_format(self):
+        """
+        Tests generating the Prometheus text exposition format and dumping
+        it to a file
+        :return: None
+        """
+        metrics = Metrics()
+        metrics.increment("requests_total", {"query": "Media \"1\""}, 2)
+        metrics.increment("bytes_total", amount=0.5)
+        metrics.observe("duration_seconds", 0.2)
+
+        text = metrics.to_prometheus()
+        lines = text.split("\n")
+        self.assertEqual(lines[:4], [
+            "# TYPE bytes_total counter",
+            "bytes_total 0.5",
+            "# TYPE requests_total counter",
+            "requests_total{query=\"Media \\\"1\\\"\"} 2"
+        ])
+        self.assertIn("# TYPE duration_seconds histogram", lines)
+        self.assertIn("duration_seconds_bucket{le=\"0.1\"} 0", lines)
+        self.assertIn("duration_seconds_bucket{le=\"0.25\"} 1", lines)
+        self.assertIn("duration_seconds_bucket{le=\"+Inf\"} 1", lines)
+        self.assertIn("duration_seconds_sum 0.2", lines)
+        self.assertIn("duration_seconds_count 1", lines)
+        self.assertTrue(text.endswith("\n"))
+
+        metrics.dump("testdir/metrics.prom")
+        with open("testdir/metrics.prom", "r") as f:
+            self.assertEqual(f.read(), text)
+        self.assertEqual(os.listdir("testdir"), ["metrics.prom"])
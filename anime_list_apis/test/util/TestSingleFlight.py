@@ -0,0 +1,101 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import time
+from threading import Event, Thread
+from typing import List, Tuple
+from unittest import TestCase
+from anime_list_apis.util.SingleFlight import SingleFlight
+
+
+class TestSingleFlight(TestCase):
+    """
+    Tests the SingleFlight class
+    """
+
+    def run_concurrently(self, single_flight: SingleFlight, keys: List[str],
+                         function) -> List[Tuple[object, bool]]:
+        """
+        Executes calls for multiple keys in separate threads, keeping the
+        calls in flight until all threads have started
+        :param single_flight: The SingleFlight object to use
+        :param keys: The keys of the calls
+        :param function: The function to execute, called with the key
+        :return: The results of the calls, or the raised exceptions
+        """
+        release = Event()
+        results = []
+
+        def call(key: str):
+            def blocking():
+                release.wait()
+                return function(key)
+            try:
+                results.append(single_flight.do(key, blocking))
+            except ValueError as e:
+                results.append(e)
+
+        threads = [Thread(target=call, args=(key,)) for key in keys]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_coalescing_calls(self):
+        """
+        Tests that concurrent calls with the same key are executed once
+        :return: None
+        """
+        calls = []
+        single_flight = SingleFlight()
+
+        def function(key: str) -> str:
+            calls.append(key)
+            return key.upper()
+
+        results = self.run_concurrently(
+            single_flight, ["a", "a", "a", "b"], function
+        )
+        self.assertEqual(sorted(calls), ["a", "b"])
+        self.assertEqual(
+            sorted(results),
+            [("A", False), ("A", True), ("A", True), ("B", False)]
+        )
+
+        self.assertEqual(single_flight.do("a", lambda: 1), (1, False))
+        self.assertEqual(sorted(calls), ["a", "b"])
+
+    def test_sharing_exceptions(self):
+        """
+        Tests that an exception raised by a call is raised in all waiting
+        threads and that the key can be used again afterwards
+        :return: None
+        """
+        single_flight = SingleFlight()
+
+        def function(_: str):
+            raise ValueError("failed")
+
+        results = self.run_concurrently(single_flight, ["a", "a"], function)
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(isinstance(x, ValueError) for x in results))
+        self.assertEqual(single_flight.do("a", lambda: 2), (2, False))
@@ -0,0 +1,107 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+from threading import RLock
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    Lock that is shared between all processes using the same lock file.
+    The lock is reentrant and may also be shared between threads.
+    May be used as a context manager.
+    """
+
+    def __init__(self, lock_file: str):
+        """
+        Initializes the lock. The lock file and its directory are created
+        if they do not exist
+        :param lock_file: The path to the lock file
+        """
+        self.lock_file = lock_file
+        self.__thread_lock = RLock()
+        self.__depth = 0
+        self.__file = None
+
+        directory = os.path.dirname(lock_file)
+        if directory != "" and not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+
+    def acquire(self):
+        """
+        Acquires the lock. Blocks until no other process or thread
+        holds the lock
+        :return: None
+        """
+        self.__thread_lock.acquire()
+        if self.__depth == 0:
+            self.__file = open(self.lock_file, "a")
+            try:
+                if fcntl is not None:
+                    fcntl.flock(self.__file.fileno(), fcntl.LOCK_EX)
+                else:  # pragma: no cover
+                    while True:
+                        try:
+                            msvcrt.locking(
+                                self.__file.fileno(), msvcrt.LK_LOCK, 1
+                            )
+                            break
+                        except OSError:
+                            continue
+            except BaseException:
+                self.__file.close()
+                self.__thread_lock.release()
+                raise
+        self.__depth += 1
+
+    def release(self):
+        """
+        Releases the lock
+        :return: None
+        """
+        self.__depth -= 1
+        if self.__depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self.__file.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover
+                msvcrt.locking(self.__file.fileno(), msvcrt.LK_UNLCK, 1)
+            self.__file.close()
+            self.__file = None
+        self.__thread_lock.release()
+
+    def __enter__(self):
+        """
+        Acquires the lock
+        :return: The lock
+        """
+        self.acquire()
+        return self
+
+    def __exit__(self, *_):
+        """
+        Releases the lock
+        :return: None
+        """
+        self.release()
@@ -0,0 +1,182 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import re
+from json import JSONDecoder, JSONDecodeError
+from json.decoder import scanstring
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+
+class JsonArrayStream:
+    """
+    Incrementally parses JSON text and yields the items of all arrays that
+    are stored under one of the specified keys as soon as they were read.
+    The values of other keys may be yielded as a whole.
+    Everything else is skipped without being decoded, which means that only
+    a single item has to be held in memory at once.
+    Items are decoded as a whole, so arrays nested inside of other items
+    are not searched.
+    """
+
+    whitespace = re.compile(r"[ \t\n\r]*")
+    """
+    Matches JSON whitespace
+    """
+
+    structure = re.compile(r"[\"{}\[\]]")
+    """
+    Matches the characters that start strings, objects or arrays
+    or end objects or arrays
+    """
+
+    delimiters = " \t\n\r,:]}"  # type: str
+    """
+    The characters that may follow a complete JSON value
+    """
+
+    def __init__(
+            self,
+            chunks: Iterable[str],
+            keys: List[str],
+            value_keys: Optional[List[str]] = None
+    ):
+        """
+        Initializes the stream
+        :param chunks: The chunks of JSON text to parse
+        :param keys: The keys of the arrays whose items should be yielded
+        :param value_keys: The keys whose values should be yielded as a whole
+        """
+        self.keys = keys
+        self.value_keys = value_keys if value_keys is not None else []
+        self.__chunks = iter(chunks)
+        self.__decoder = JSONDecoder()
+        self.__buffer = ""
+        self.__position = 0
+        self.__exhausted = False
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Parses the JSON text
+        :return: A generator that yields tuples consisting of the key of an
+                 array and one of its items, or of a value key and its value
+        :raises ValueError: If the JSON text is invalid
+        """
+        array_key = None
+        depth = 0
+
+        while self.__skip_whitespace():
+            char = self.__buffer[self.__position]
+
+            if array_key is not None:
+                if char == "]":
+                    array_key = None
+                    self.__position += 1
+                elif char == ",":
+                    self.__position += 1
+                else:
+                    yield array_key, self.__decode(self.__decoder.raw_decode)
+
+            elif char == "\"":
+                self.__position += 1
+                key = self.__decode(scanstring)
+                if (key in self.keys or key in self.value_keys) \
+                        and self.__skip_whitespace() \
+                        and self.__buffer[self.__position] == ":":
+                    self.__position += 1
+                    if not self.__skip_whitespace():
+                        break
+                    elif key in self.value_keys:
+                        yield key, self.__decode(self.__decoder.raw_decode)
+                    elif self.__buffer[self.__position] == "[":
+                        self.__position += 1
+                        array_key = key
+
+            elif char in "{[":
+                depth += 1
+                self.__position += 1
+
+            elif char in "}]":
+                depth -= 1
+                self.__position += 1
+
+            else:
+                # Only strings can contain the keys, so skip to the next
+                # string or structural character
+                match = self.structure.search(self.__buffer, self.__position)
+                self.__position = \
+                    len(self.__buffer) if match is None else match.start()
+
+        if array_key is not None or depth != 0:
+            raise ValueError("Unexpected end of JSON text")
+
+    def __read(self) -> bool:
+        """
+        Reads the next chunk into the buffer and discards the parts of the
+        buffer that were already parsed
+        :return: True if a chunk was read, False if there are no more chunks
+        """
+        if self.__exhausted:
+            return False
+        try:
+            chunk = next(self.__chunks)
+        except StopIteration:
+            self.__exhausted = True
+            return False
+
+        self.__buffer = self.__buffer[self.__position:] + chunk
+        self.__position = 0
+        return True
+
+    def __skip_whitespace(self) -> bool:
+        """
+        Skips whitespace, reading more chunks if necessary
+        :return: True if there is more text to parse, False otherwise
+        """
+        while True:
+            self.__position = self.whitespace.match(
+                self.__buffer, self.__position
+            ).end()
+            if self.__position < len(self.__buffer):
+                return True
+            elif not self.__read():
+                return False
+
+    def __decode(self, decode: Callable[[str, int], Tuple[Any, int]]) -> Any:
+        """
+        Decodes a value at the current position, reading more chunks until
+        the value is complete
+        :param decode: The decoding function. Receives the buffer and the
+                       current position and returns the decoded value and
+                       the position after the value
+        :return: The decoded value
+        :raises ValueError: If the value is invalid
+        """
+        while True:
+            try:
+                value, end = decode(self.__buffer, self.__position)
+                # Numbers may continue in the next chunk, so a value is only
+                # complete once it is followed by a delimiter
+                if (end < len(self.__buffer)
+                        and self.__buffer[end] in self.delimiters) \
+                        or not self.__read():
+                    self.__position = end
+                    return value
+            except JSONDecodeError:
+                if not self.__read():
+                    raise
@@ -0,0 +1,266 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import time
+from bisect import bisect_left
+from threading import Lock
+from contextlib import contextmanager
+from typing import Dict, List, Tuple, Optional, Iterator, Any
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters and histograms.
+    Metrics are identified by their name and a set of labels.
+    The current values may be retrieved directly or exported in the
+    Prometheus text exposition format.
+    """
+
+    buckets = (
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+        0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+    )
+    """
+    The upper bounds of the histogram buckets, in seconds
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty registry
+        """
+        self.__lock = Lock()
+        self.__counters = {}  # type: Dict[str, Dict[Labels, float]]
+        self.__histograms = \
+            {}  # type: Dict[str, Dict[Labels, Tuple[List[int], float]]]
+
+    def increment(
+            self,
+            name: str,
+            labels: Optional[Dict[str, str]] = None,
+            amount: float = 1
+    ):
+        """
+        Increments a counter
+        :param name: The name of the counter
+        :param labels: The labels of the counter
+        :param amount: The amount by which to increment the counter
+        :return: None
+        """
+        key = self.__generate_key(labels)
+        with self.__lock:
+            counters = self.__counters.setdefault(name, {})
+            counters[key] = counters.get(key, 0) + amount
+
+    def observe(
+            self,
+            name: str,
+            value: float,
+            labels: Optional[Dict[str, str]] = None
+    ):
+        """
+        Records a value in a histogram
+        :param name: The name of the histogram
+        :param value: The value to record
+        :param labels: The labels of the histogram
+        :return: None
+        """
+        key = self.__generate_key(labels)
+        with self.__lock:
+            histograms = self.__histograms.setdefault(name, {})
+            counts, total = histograms.get(
+                key, ([0] * (len(self.buckets) + 1), 0.0)
+            )
+            counts[bisect_left(self.buckets, value)] += 1
+            histograms[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, name: str, labels: Optional[Dict[str, str]] = None) \
+            -> Iterator[None]:
+        """
+        Context manager that records the duration of its body in a
+        histogram, even if an exception is raised
+        :param name: The name of the histogram
+        :param labels: The labels of the histogram
+        :return: The context manager
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+    def get_counter(self, name: str, labels: Optional[Dict[str, str]] = None) \
+            -> float:
+        """
+        Retrieves the current value of a counter
+        :param name: The name of the counter
+        :param labels: The labels of the counter
+        :return: The value of the counter, 0 if it was never incremented
+        """
+        with self.__lock:
+            return self.__counters.get(name, {}).get(
+                self.__generate_key(labels), 0
+            )
+
+    def get_histogram(
+            self,
+            name: str,
+            labels: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Retrieves the current state of a histogram
+        :param name: The name of the histogram
+        :param labels: The labels of the histogram
+        :return: A dictionary containing the amount of recorded values,
+                 their sum and the cumulative counts of the buckets,
+                 keyed by their upper bounds
+        """
+        with self.__lock:
+            counts, total = self.__histograms.get(name, {}).get(
+                self.__generate_key(labels),
+                ([0] * (len(self.buckets) + 1), 0.0)
+            )
+            return self.__summarize(counts, total)
+
+    def collect(self) -> Dict[str, Dict[Labels, Any]]:
+        """
+        Retrieves the current values of all metrics
+        :return: A dictionary mapping the names of the metrics to
+                 dictionaries that map the labels to the values.
+                 Labels are tuples of key-value pairs. Histograms are
+                 represented like in get_histogram()
+        """
+        with self.__lock:
+            collected = {
+                name: dict(values) for name, values in self.__counters.items()
+            }  # type: Dict[str, Dict[Labels, Any]]
+            for name, values in self.__histograms.items():
+                collected[name] = {
+                    key: self.__summarize(counts, total)
+                    for key, (counts, total) in values.items()
+                }
+            return collected
+
+    def to_prometheus(self) -> str:
+        """
+        Generates the Prometheus text exposition format of all metrics
+        :return: The metrics in the text exposition format
+        """
+        lines = []
+        with self.__lock:
+            for name in sorted(self.__counters):
+                lines.append("# TYPE " + name + " counter")
+                for key, value in sorted(self.__counters[name].items()):
+                    lines.append(self.__format_sample(name, key, value))
+
+            for name in sorted(self.__histograms):
+                lines.append("# TYPE " + name + " histogram")
+                for key, (counts, total) in \
+                        sorted(self.__histograms[name].items()):
+                    histogram = self.__summarize(counts, total)
+                    for bound, count in histogram["buckets"].items():
+                        lines.append(self.__format_sample(
+                            name + "_bucket",
+                            key + (("le", self.__format_value(bound)),),
+                            count
+                        ))
+                    lines.append(self.__format_sample(
+                        name + "_sum", key, histogram["sum"]
+                    ))
+                    lines.append(self.__format_sample(
+                        name + "_count", key, histogram["count"]
+                    ))
+
+        return "".join([line + "\n" for line in lines])
+
+    def dump(self, path: str):
+        """
+        Writes all metrics in the Prometheus text exposition format to a
+        file, for example to be picked up by the textfile collector of the
+        node exporter. The file is replaced atomically, so it is never
+        read while incomplete
+        :param path: The path of the file to write
+        :return: None
+        """
+        temp_file = path + ".tmp"
+        with open(temp_file, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_file, path)
+
+    @staticmethod
+    def __generate_key(labels: Optional[Dict[str, str]]) -> Labels:
+        """
+        Generates the key under which a metric with labels is stored
+        :param labels: The labels
+        :return: The labels as a sorted tuple of key-value pairs
+        """
+        if labels is None:
+            return ()
+        return tuple(sorted(
+            (key, str(value)) for key, value in labels.items()
+        ))
+
+    def __summarize(self, counts: List[int], total: float) -> Dict[str, Any]:
+        """
+        Converts the internal representation of a histogram into the one
+        returned by get_histogram()
+        :param counts: The non-cumulative counts of the buckets
+        :param total: The sum of all recorded values
+        :return: The summary of the histogram
+        """
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"count": cumulative, "sum": total, "buckets": buckets}
+
+    @staticmethod
+    def __format_sample(name: str, key: Labels, value: float) -> str:
+        """
+        Formats a single sample in the text exposition format
+        :param name: The name of the sample
+        :param key: The labels of the sample
+        :param value: The value of the sample
+        :return: The formatted sample
+        """
+        if len(key) > 0:
+            name += "{" + ",".join([
+                label + "=\"" + text.replace("\\", "\\\\")
+                .replace("\"", "\\\"").replace("\n", "\\n") + "\""
+                for label, text in key
+            ]) + "}"
+        return name + " " + Metrics.__format_value(value)
+
+    @staticmethod
+    def __format_value(value: float) -> str:
+        """
+        Formats a value in the text exposition format
+        :param value: The value to format
+        :return: The formatted value
+        """
+        if value == float("inf"):
+            return "+Inf"
+        elif float(value).is_integer():
+            return str(int(value))
+        else:
+            return repr(float(value))
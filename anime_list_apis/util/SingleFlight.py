@@ -0,0 +1,74 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share the same key.
+    While a call for a key is in flight, further calls for that key wait
+    for it to finish and receive its result instead of executing the
+    function again.
+    """
+
+    def __init__(self):
+        """
+        Initializes the object without any calls in flight
+        """
+        self.__lock = Lock()
+        self.__calls = {}  # type: Dict[Hashable, Dict[str, Any]]
+
+    def do(self, key: Hashable, function: Callable[[], Any]) \
+            -> Tuple[Any, bool]:
+        """
+        Executes a function, unless a call with the same key is already in
+        flight. In that case, waits for that call to finish instead.
+        If the function raises an exception, the exception is raised
+        in all waiting threads as well
+        :param key: The key of the call
+        :param function: The function to execute
+        :return: The result of the function and whether the result is
+                 shared with another call
+        """
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+            if leader:
+                call = {"done": Event(), "result": None, "error": None}
+                self.__calls[key] = call
+
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"], True
+
+        try:
+            call["result"] = function()
+        except BaseException as e:
+            call["error"] = e
+            raise
+        finally:
+            with self.__lock:
+                self.__calls.pop(key)
+            call["done"].set()
+
+        return call["result"], False
@@ -0,0 +1,69 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import time
+import shutil
+import tempfile
+from anime_list_apis.cache.Cache import Cache
+from anime_list_apis.cache.BinaryCache import BinaryCache
+from anime_list_apis.models.attributes.Id import IdType
+from benchmarks.fixtures import generate_anime_data, generate_anime_user_data
+
+
+def main(count: int = 5000, relations: int = 10):
+    """
+    Compares the write time, load time and file size of the JSON and the
+    binary cache file formats
+    :param count: The amount of cached anime data and user data entries
+    :param relations: The amount of relations per anime data entry
+    :return: None
+    """
+    datas = generate_anime_data(count, relations)
+    user_datas = generate_anime_user_data(count)
+
+    for cache_class in [Cache, BinaryCache]:
+        location = tempfile.mkdtemp()
+        try:
+            cache = cache_class(location)
+            for data in datas + user_datas:
+                cache.add(IdType.ANILIST, data, True)
+
+            start = time.perf_counter()
+            cache.compact()
+            write_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            cache.load()
+            load_time = time.perf_counter() - start
+
+            size = os.path.getsize(cache.cache_file)
+            print("{:<12} write: {:>8.1f} ms  load: {:>8.1f} ms  "
+                  "size: {:>10.1f} KiB".format(
+                      cache_class.__name__,
+                      write_time * 1000,
+                      load_time * 1000,
+                      size / 1024
+                  ))
+        finally:
+            shutil.rmtree(location)
+
+
+if __name__ == "__main__":
+    main()
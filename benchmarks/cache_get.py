@@ -0,0 +1,58 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import shutil
+import tempfile
+from anime_list_apis.cache.Cache import Cache
+from anime_list_apis.models.attributes.Id import IdType
+from anime_list_apis.models.attributes.MediaType import MediaType
+from benchmarks.fixtures import generate_anime_data
+from benchmarks.timing import measure
+
+
+def main(count: int = 1000, relations: int = 30):
+    """
+    Compares the speed of cache hits for regular and frozen caches
+    :param count: The amount of cached entries
+    :param relations: The amount of relations per cached entry
+    :return: None
+    """
+    datas = generate_anime_data(count, relations)
+    location = tempfile.mkdtemp()
+
+    try:
+        for frozen in [False, True]:
+            cache = Cache(location, frozen=frozen)
+            for data in datas:
+                cache.add(IdType.ANILIST, data, True)
+
+            ids = iter(range(1, count + 1))
+
+            def get():
+                cache.get_media_data(
+                    IdType.ANILIST, MediaType.ANIME, next(ids)
+                )
+
+            measure("Cache.get (frozen={})".format(frozen), get, count)
+    finally:
+        shutil.rmtree(location)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+from anime_list_apis.models.MediaData import MediaData
+from anime_list_apis.models.MediaUserData import MediaUserData
+from benchmarks.fixtures import generate_anime_data, generate_anime_user_data
+from benchmarks.timing import measure
+
+
+def main(count: int = 2000, relations: int = 10):
+    """
+    Compares the speed of validated and trusted deserialization
+    :param count: The amount of deserialized entries
+    :param relations: The amount of relations per anime data entry
+    :return: None
+    """
+    datas = [x.serialize() for x in generate_anime_data(count, relations)]
+    user_datas = [x.serialize() for x in generate_anime_user_data(count)]
+
+    for validate in [True, False]:
+        for cls, serialized in [
+            (MediaData, datas),
+            (MediaUserData, user_datas)
+        ]:
+            entries = iter(serialized)
+            deserialized = []  # Keeps interned IDs alive, like a cache would
+
+            def deserialize():
+                deserialized.append(
+                    cls.deserialize(next(entries), validate=validate)
+                )
+
+            measure(
+                "{}.deserialize (validate={})".format(cls.__name__, validate),
+                deserialize,
+                count
+            )
+
+
+if __name__ == "__main__":
+    main()
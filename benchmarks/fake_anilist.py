@@ -0,0 +1,264 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import argparse
+import math
+import sys
+import time
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+from anime_list_apis.test.api.AnilistStub import StubServer, \
+    generate_list_entry, generate_list_response, generate_media, \
+    mal_id_offset
+
+
+class FakeAnilistServer:
+    """
+    Local HTTP server that imitates the Anilist GraphQL API.
+    Answers the Media, MediaList and MediaListCollection queries sent by the
+    AnilistApi class using a generated dataset, which makes it possible to
+    load test the entire client without sending any requests to anilist.co.
+    Media with the IDs 1 to count exist, their myanimelist IDs are offset
+    by 100000. Every user has every media on their list.
+    """
+
+    def __init__(
+            self,
+            count: int = 1000,
+            relations: int = 5,
+            title_length: int = 10,
+            latency: float = 0.0,
+            rate_limit: Optional[int] = None,
+            port: int = 0
+    ):
+        """
+        Starts the server in a background thread
+        :param count: The amount of media in the dataset
+        :param relations: The amount of relations per media
+        :param title_length: The length of the titles of the media.
+                             Can be used to adjust the size of the payloads
+        :param latency: A delay in seconds before every response is sent
+        :param rate_limit: The amount of requests that are answered per
+                           minute. Once exceeded, requests are answered with
+                           a 'Too Many Requests.' error until the minute is
+                           over. If None, no requests are rate limited
+        :param port: The port to listen on. If 0, a free port is used
+        """
+        self.count = count
+        self.relations = relations
+        self.title_length = title_length
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.requests = 0
+        self.rate_limited = 0
+        self.__lock = Lock()
+        self.__window = (0.0, 0)  # type: Tuple[float, int]
+
+        self.server = StubServer(self.answer, record=False, port=port)
+        self.url = self.server.url
+
+    def stop(self):
+        """
+        Stops the server
+        :return: None
+        """
+        self.server.stop()
+
+    def answer(self, query: str, variables: Dict[str, Any]) \
+            -> Tuple[int, Dict[str, str], Dict[str, Any]]:
+        """
+        Generates the response to a GraphQL query
+        :param query: The query string
+        :param variables: The variables of the query
+        :return: A tuple consisting of the HTTP status code, the headers and
+                 the JSON data of the response
+        """
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        headers = self.__check_rate_limit()
+        if headers is not None:
+            return 429, headers, {"errors": [{
+                "message": "Too Many Requests.", "status": 429
+            }]}
+
+        lean = "coverImage" not in query
+        if "MediaListCollection" in query:
+            data = {"MediaListCollection": self.__generate_collection(
+                variables["username"],
+                variables.get("chunk", 1),
+                variables.get("perChunk", 500),
+                lean
+            )}
+        elif "MediaList(" in query:
+            data = {"MediaList": self.__generate_entry(
+                variables["id"], variables["username"], lean
+            )}
+        elif "Page(" in query:
+            offset = mal_id_offset if "idMal_in" in query else 0
+            data = {"Page": {"media": [
+                self.__generate_media(_id - offset, lean)
+                for _id in variables["ids"]
+                if self.__exists(_id - offset)
+            ]}}
+        elif "Media(" in query:
+            if "mal_id" in variables or "idMal:" in query:
+                _id = variables.get("mal_id", variables.get("id")) \
+                    - mal_id_offset
+            else:
+                _id = variables["id"]
+            data = {"Media": self.__generate_media(_id, lean)}
+        else:
+            return 400, {}, {"errors": [{
+                "message": "Unsupported query", "status": 400
+            }]}
+
+        if None in data.values():
+            return 404, {}, {"errors": [{"message": "Not Found.",
+                                         "status": 404}]}
+        else:
+            return 200, {}, {"data": data}
+
+    def __check_rate_limit(self) -> Optional[Dict[str, str]]:
+        """
+        Counts a request in the current one-minute window
+        :return: The headers of a rate limited response if the rate limit
+                 was exceeded, otherwise None
+        """
+        with self.__lock:
+            self.requests += 1
+            if self.rate_limit is None:
+                return None
+
+            now = time.time()
+            start, used = self.__window
+            if now - start >= 60:
+                start, used = now, 0
+
+            if used < self.rate_limit:
+                self.__window = (start, used + 1)
+                return None
+            else:
+                self.rate_limited += 1
+                reset = start + 60
+                return {
+                    "Retry-After": str(math.ceil(reset - now)),
+                    "X-RateLimit-Limit": str(self.rate_limit),
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": str(math.ceil(reset))
+                }
+
+    def __exists(self, _id: int) -> bool:
+        """
+        Checks if a media exists in the dataset
+        :param _id: The anilist ID of the media
+        :return: True if the media exists, False otherwise
+        """
+        return 1 <= _id <= self.count
+
+    def __generate_media(self, _id: int, lean: bool) \
+            -> Optional[Dict[str, Any]]:
+        """
+        Generates the JSON data of a media
+        :param _id: The anilist ID of the media
+        :param lean: If True, only the IDs of the media are included
+        :return: The JSON data or None if the media does not exist
+        """
+        if not self.__exists(_id):
+            return None
+        return generate_media(
+            _id, self.relations, self.count, self.title_length, lean
+        )
+
+    def __generate_entry(self, _id: int, username: str, lean: bool) \
+            -> Optional[Dict[str, Any]]:
+        """
+        Generates the JSON data of a media list entry
+        :param _id: The anilist ID of the media
+        :param username: The user the list entry belongs to
+        :param lean: If True, only the IDs of the media are included
+        :return: The JSON data or None if the media does not exist
+        """
+        if not self.__exists(_id):
+            return None
+        return generate_list_entry(
+            _id, username, self.relations, self.count, self.title_length,
+            lean
+        )
+
+    def __generate_collection(
+            self,
+            username: str,
+            chunk: int,
+            per_chunk: int,
+            lean: bool
+    ) -> Dict[str, Any]:
+        """
+        Generates a chunk of a user's media list collection
+        :param username: The user the list belongs to
+        :param chunk: The number of the chunk, starting at 1
+        :param per_chunk: The amount of entries per chunk
+        :param lean: If True, only the IDs of the media are included
+        :return: The JSON data of the chunk
+        """
+        start = (chunk - 1) * per_chunk + 1
+        end = min(start + per_chunk, self.count + 1)
+        return generate_list_response(
+            [list(range(start, end))], end <= self.count, username,
+            self.relations, self.count, self.title_length, lean
+        )["data"]["MediaListCollection"]
+
+
+def main(args: Optional[List[str]] = None):
+    """
+    Runs the fake Anilist server until interrupted
+    :param args: The command line arguments. Defaults to sys.argv
+    :return: None
+    """
+    parser = argparse.ArgumentParser(
+        description="Runs a local server that imitates the Anilist API"
+    )
+    parser.add_argument("--port", type=int, default=8080,
+                        help="The port to listen on")
+    parser.add_argument("--count", type=int, default=1000,
+                        help="The amount of media in the dataset")
+    parser.add_argument("--relations", type=int, default=5,
+                        help="The amount of relations per media")
+    parser.add_argument("--title-length", type=int, default=10,
+                        help="The length of the media titles")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="The delay in seconds before each response")
+    parser.add_argument("--rate-limit", type=int, default=None,
+                        help="The amount of requests allowed per minute")
+    parsed = parser.parse_args(sys.argv[1:] if args is None else args)
+
+    server = FakeAnilistServer(
+        parsed.count, parsed.relations, parsed.title_length,
+        parsed.latency, parsed.rate_limit, parsed.port
+    )
+    print("Listening on " + server.url)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+from typing import Any, Callable, Dict, Iterator, List
+from anime_list_apis.models.MediaData import AnimeData
+from anime_list_apis.models.MediaUserData import AnimeUserData
+from anime_list_apis.models.attributes.ConsumingStatus import ConsumingStatus
+from anime_list_apis.models.attributes.Date import Date
+from anime_list_apis.models.attributes.Id import Id, IdType
+from anime_list_apis.models.attributes.MediaType import MediaType
+from anime_list_apis.models.attributes.Relation import Relation, RelationType
+from anime_list_apis.models.attributes.ReleasingStatus import ReleasingStatus
+from anime_list_apis.models.attributes.Score import Score, ScoreType
+from anime_list_apis.models.attributes.Title import Title, TitleType
+from anime_list_apis.test.api.AnilistStub import generate_list_response
+
+
+def generate_anime_data(count: int, relations: int = 10) -> List[AnimeData]:
+    """
+    Generates synthetic anime data objects
+    :param count: The amount of objects to generate
+    :param relations: The amount of relations per object
+    :return: The generated anime data
+    """
+    generated = []
+    for i in range(1, count + 1):
+        _id = Id({IdType.ANILIST: i, IdType.MYANIMELIST: i + 100000})
+        generated.append(AnimeData(
+            _id,
+            Title({
+                TitleType.ROMAJI: "Anime " + str(i),
+                TitleType.ENGLISH: "Anime " + str(i),
+                TitleType.JAPANESE: "アニメ " + str(i)
+            }),
+            [
+                Relation(
+                    _id,
+                    MediaType.ANIME,
+                    Id({IdType.ANILIST: count + j, IdType.MYANIMELIST: j}),
+                    MediaType.ANIME,
+                    RelationType.SEQUEL
+                )
+                for j in range(1, relations + 1)
+            ],
+            ReleasingStatus.FINISHED,
+            Date(2018, 1, 1),
+            Date(2018, 3, 31),
+            "https://example.com/" + str(i) + ".png",
+            12,
+            24
+        ))
+    return generated
+
+
+def generate_anime_user_data(count: int, username: str = "user") \
+        -> List[AnimeUserData]:
+    """
+    Generates synthetic anime user data objects
+    :param count: The amount of objects to generate
+    :param username: The username of the user data
+    :return: The generated anime user data
+    """
+    return [
+        AnimeUserData(
+            Id({IdType.ANILIST: i, IdType.MYANIMELIST: i + 100000}),
+            username,
+            Score(i % 100, ScoreType.PERCENTAGE),
+            ConsumingStatus.COMPLETED,
+            Date(2018, 4, 1),
+            Date(2018, 4, 2),
+            12
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def generate_anilist_list_response(
+        count: int,
+        relations: int = 10,
+        lean: bool = False
+) -> Dict[str, Any]:
+    """
+    Generates a synthetic anilist MediaListCollection response
+    :param count: The amount of list entries
+    :param relations: The amount of relations per entry
+    :param lean: If True, only includes the IDs of the media
+    :return: The response data
+    """
+    return generate_list_response(
+        [list(range(1, count + 1))], relations=relations, lean=lean
+    )
+
+
+class FakeResponse:
+    """
+    Response of a FakeSession
+    """
+
+    def __init__(self, body: bytes):
+        """
+        Initializes the response
+        :param body: The response body
+        """
+        self.status_code = 200
+        self.headers = {}
+        self.body = body
+
+    @property
+    def content(self) -> bytes:
+        """
+        Provides the raw response body
+        :return: The response body
+        """
+        return self.body
+
+    @property
+    def text(self) -> str:
+        """
+        Decodes the response body
+        :return: The response body as text
+        """
+        return self.body.decode()
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        """
+        Iterates over the response body in chunks
+        :param chunk_size: The size of the chunks
+        :return: An iterator over the chunks
+        """
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+    def close(self):
+        """
+        Does nothing, since there is no connection to close
+        :return: None
+        """
+        pass
+
+
+class FakeSession:
+    """
+    Stands in for a requests session, answering every POST request without
+    any network traffic. Makes it possible to benchmark the parsing of
+    API responses
+    """
+
+    def __init__(self, respond: Callable[[Dict[str, Any]], bytes]):
+        """
+        Initializes the session
+        :param respond: Generates the response body for the posted JSON data
+        """
+        self.respond = respond
+        self.received = 0
+
+    def post(self, _: str, json: Dict[str, Any], **__) -> FakeResponse:
+        """
+        Answers a POST request
+        :param _: The URL
+        :param json: The posted JSON data
+        :return: The response
+        """
+        body = self.respond(json)
+        self.received += len(body)
+        return FakeResponse(body)
+
+    def close(self):
+        """
+        Does nothing, since there are no connections to close
+        :return: None
+        """
+        pass
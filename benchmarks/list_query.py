@@ -0,0 +1,74 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import json
+import shutil
+import tempfile
+from typing import Any, Dict
+from anime_list_apis.api.AnilistApi import AnilistApi
+from anime_list_apis.api.RateLimiter import RateLimiter
+from anime_list_apis.cache.Cache import Cache
+from anime_list_apis.models.attributes.MediaType import MediaType
+from benchmarks.fixtures import FakeSession, generate_anilist_list_response
+from benchmarks.timing import measure
+
+
+def main(count: int = 2000, relations: int = 10, repetitions: int = 5):
+    """
+    Compares fetching a user's list of user data using the full list entry
+    query with fetching it using the lean user data query
+    :param count: The amount of list entries
+    :param relations: The amount of relations per list entry
+    :param repetitions: How often the list is fetched
+    :return: None
+    """
+    full = json.dumps(generate_anilist_list_response(count, relations))
+    lean = json.dumps(generate_anilist_list_response(count, lean=True))
+
+    def respond(posted: Dict[str, Any]) -> bytes:
+        if "coverImage" in posted["query"]:
+            return full.encode()
+        else:
+            return lean.encode()
+
+    location = tempfile.mkdtemp()
+    try:
+        for name, fetch in [
+            ("get_list + get_user_data", lambda x: [
+                entry.get_user_data()
+                for entry in x.get_list(MediaType.ANIME, "user")
+            ]),
+            ("get_user_data_list", lambda x: x.get_user_data_list(
+                MediaType.ANIME, "user"
+            ))
+        ]:
+            session = FakeSession(respond)
+            api = AnilistApi(
+                Cache(location), session=session, rate_limiter=RateLimiter()
+            )
+            measure(name, lambda: fetch(api), repetitions)
+            print("{:<40} {:>12.1f} bytes/entry".format(
+                name, session.received / (count * repetitions)
+            ))
+    finally:
+        shutil.rmtree(location)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from threading import Thread
+from typing import List, Optional
+from anime_list_apis.api.AnilistApi import AnilistApi
+from anime_list_apis.api.RateLimiter import RateLimiter
+from anime_list_apis.cache.Cache import Cache
+from anime_list_apis.models.attributes.MediaType import MediaType
+from anime_list_apis.util.Metrics import Metrics
+from benchmarks.fake_anilist import FakeAnilistServer
+
+
+def run(
+        server: FakeAnilistServer,
+        workers: int,
+        operations: int,
+        rate_limiter: RateLimiter,
+        metrics: Metrics
+):
+    """
+    Load tests the Anilist API using a fake Anilist server.
+    Every worker thread uses its own API interface and cache and
+    alternates between fetching media data, list entries and user data.
+    Afterwards, every worker fetches the user's entire list
+    :param server: The server to send the requests to
+    :param workers: The amount of worker threads
+    :param operations: The amount of operations per worker
+    :param rate_limiter: The rate limiter shared by all workers
+    :param metrics: The metrics registry shared by all workers
+    :return: None
+    """
+    location = tempfile.mkdtemp()
+    latencies = []  # type: List[float]
+    list_latencies = []  # type: List[float]
+
+    def work(worker: int):
+        api = AnilistApi(
+            Cache(location + "/" + str(worker), metrics=metrics),
+            rate_limiter=rate_limiter,
+            url=server.url,
+            metrics=metrics
+        )
+        operations_list = [
+            lambda x: api.get_data(MediaType.ANIME, x, fresh=True),
+            lambda x: api.get_list_entry(
+                MediaType.ANIME, x, "user", fresh=True
+            ),
+            lambda x: api.get_user_data(MediaType.ANIME, x, "user")
+        ]
+        generator = random.Random(worker)
+        try:
+            for i in range(operations):
+                _id = generator.randint(1, server.count)
+                start = time.perf_counter()
+                operations_list[i % len(operations_list)](_id)
+                latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            api.get_list(MediaType.ANIME, "user")
+            list_latencies.append(time.perf_counter() - start)
+        finally:
+            api.close()
+
+    threads = [Thread(target=work, args=(i,)) for i in range(workers)]
+    start = time.perf_counter()
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        shutil.rmtree(location)
+    duration = time.perf_counter() - start
+
+    latencies.sort()
+    print("{:<40} {:>12.1f} requests/s".format(
+        "Throughput", server.requests / duration
+    ))
+    for name, percentile in [("p50", 0.5), ("p95", 0.95), ("p99", 0.99)]:
+        print("{:<40} {:>12.1f} ms".format(
+            "Latency " + name,
+            1000 * latencies[int(percentile * (len(latencies) - 1))]
+        ))
+    print("{:<40} {:>12.1f} ms".format(
+        "Latency get_list (mean)",
+        1000 * sum(list_latencies) / len(list_latencies)
+    ))
+    print("{:<40} {:>12}".format("Rate limited requests", server.rate_limited))
+
+
+def main(args: Optional[List[str]] = None):
+    """
+    Starts a fake Anilist server and load tests the Anilist API against it
+    :param args: The command line arguments. Defaults to sys.argv
+    :return: None
+    """
+    parser = argparse.ArgumentParser(
+        description="Load tests the Anilist API using a local fake server"
+    )
+    parser.add_argument("--workers", type=int, default=8,
+                        help="The amount of concurrent worker threads")
+    parser.add_argument("--operations", type=int, default=100,
+                        help="The amount of operations per worker")
+    parser.add_argument("--count", type=int, default=1000,
+                        help="The amount of media in the dataset")
+    parser.add_argument("--relations", type=int, default=5,
+                        help="The amount of relations per media")
+    parser.add_argument("--title-length", type=int, default=10,
+                        help="The length of the media titles")
+    parser.add_argument("--latency", type=float, default=0.01,
+                        help="The delay in seconds before each response")
+    parser.add_argument("--rate-limit", type=int, default=None,
+                        help="The amount of requests the server allows "
+                             "per minute")
+    parser.add_argument("--client-rate-limit", type=float, default=None,
+                        help="The amount of requests the client sends "
+                             "per minute at most")
+    parser.add_argument("--metrics", default=None,
+                        help="A file to which the metrics of the client "
+                             "are written in the Prometheus text format")
+    parsed = parser.parse_args(sys.argv[1:] if args is None else args)
+
+    server = FakeAnilistServer(
+        parsed.count, parsed.relations, parsed.title_length,
+        parsed.latency, parsed.rate_limit
+    )
+    metrics = Metrics()
+    try:
+        run(
+            server, parsed.workers, parsed.operations,
+            RateLimiter(parsed.client_rate_limit, burst=parsed.workers),
+            metrics
+        )
+    finally:
+        server.stop()
+
+    if parsed.metrics is not None:
+        metrics.dump(parsed.metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import gc
+import tracemalloc
+from typing import Callable, List
+from anime_list_apis.models.MediaData import MediaData
+from anime_list_apis.models.MediaListEntry import AnimeListEntry
+from anime_list_apis.models.MediaUserData import MediaUserData
+from benchmarks.fixtures import generate_anime_data, generate_anime_user_data
+
+
+def measure_memory(name: str, function: Callable[[], List[object]]) -> float:
+    """
+    Measures how many bytes are allocated per object generated by a function
+    and prints the result
+    :param name: The name of the measured objects
+    :param function: The function that generates the objects
+    :return: The amount of bytes per object
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        objects = function()
+        allocated = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    per_object = allocated / len(objects)
+    print("{:<40} {:>12.1f} bytes/entry".format(name, per_object))
+    return per_object
+
+
+def main(count: int = 2000, relations: int = 10):
+    """
+    Measures the memory used by deserialized cache entries
+    :param count: The amount of cached entries
+    :param relations: The amount of relations per anime data entry
+    :return: None
+    """
+    datas = [x.serialize() for x in generate_anime_data(count, relations)]
+    user_datas = [x.serialize() for x in generate_anime_user_data(count)]
+
+    measure_memory("MediaData", lambda: [
+        MediaData.deserialize(x, validate=False) for x in datas
+    ])
+    measure_memory("MediaUserData", lambda: [
+        MediaUserData.deserialize(x, validate=False) for x in user_datas
+    ])
+    measure_memory("MediaListEntry", lambda: [
+        AnimeListEntry(
+            MediaData.deserialize(data, validate=False),
+            MediaUserData.deserialize(user_data, validate=False)
+        )
+        for data, user_data in zip(datas, user_datas)
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import json
+import shutil
+import tempfile
+from anime_list_apis.api.AnilistApi import AnilistApi
+from anime_list_apis.api.RateLimiter import RateLimiter
+from anime_list_apis.cache.Cache import Cache
+from anime_list_apis.models.attributes.MediaType import MediaType
+from benchmarks.fixtures import FakeSession, generate_anilist_list_response
+from benchmarks.timing import measure
+
+
+def main(count: int = 2000, relations: int = 10, repetitions: int = 5):
+    """
+    Measures how fast MediaListCollection responses are parsed into
+    list entries and user data
+    :param count: The amount of list entries in the response
+    :param relations: The amount of relations per list entry
+    :param repetitions: How often the response is parsed
+    :return: None
+    """
+    full = json.dumps(
+        generate_anilist_list_response(count, relations)
+    ).encode()
+    lean = json.dumps(
+        generate_anilist_list_response(count, lean=True)
+    ).encode()
+
+    location = tempfile.mkdtemp()
+    try:
+        for name, body, parse in [
+            ("AnilistApi._get_list", full, lambda x: x._get_list(
+                MediaType.ANIME, "user"
+            )),
+            ("AnilistApi._get_user_data_list", lean,
+             lambda x: x._get_user_data_list(MediaType.ANIME, "user"))
+        ]:
+            api = AnilistApi(
+                Cache(location),
+                session=FakeSession(lambda _, response=body: response),
+                rate_limiter=RateLimiter()
+            )
+            ops = measure(name, lambda: parse(api), repetitions)
+            print("{:<40} {:>12.1f} entries/s".format(name, ops * count))
+    finally:
+        shutil.rmtree(location)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import gc
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+from anime_list_apis.api.AnilistApi import AnilistApi
+from anime_list_apis.api.ApiInterface import ApiInterface
+from anime_list_apis.api.RateLimiter import RateLimiter
+from anime_list_apis.cache.Cache import Cache
+from anime_list_apis.models.MediaData import AnimeData, MediaData
+from anime_list_apis.models.MediaListEntry import AnimeListEntry
+from anime_list_apis.models.attributes.Id import Id, IdType
+from anime_list_apis.models.attributes.MediaType import MediaType
+from benchmarks.fixtures import FakeSession, generate_anime_data, \
+    generate_anime_user_data, generate_anilist_list_response
+
+
+class GraphApi(ApiInterface):
+    """
+    API Interface that serves media data from memory, which makes it possible
+    to benchmark the traversal of relation graphs without network traffic
+    """
+
+    def __init__(self, cache: Cache, datas: List[AnimeData]):
+        """
+        Initializes the API
+        :param cache: The cache to use
+        :param datas: The media data served by the API
+        """
+        super().__init__(IdType.ANILIST, cache)
+        self.datas = {
+            data.id.get(IdType.ANILIST): data for data in datas
+        }  # type: Dict[int, MediaData]
+
+    def _get_data(self, media_type: MediaType, _id: Id) \
+            -> Optional[MediaData]:
+        """
+        Retrieves a media data object
+        :param media_type: The media type to retrieve
+        :param _id: The ID to retrieve
+        :return: The media data or None if it does not exist
+        """
+        return self.datas.get(_id.get(IdType.ANILIST))
+
+
+def benchmark(
+        name: str,
+        count: int,
+        prepare: Callable[[], Callable[[], object]]
+) -> Tuple[float, int]:
+    """
+    Measures the throughput and the peak memory usage of an operation and
+    prints the results.
+    The operation is run twice, since tracing memory allocations slows it
+    down considerably
+    :param name: The name of the operation
+    :param count: The amount of entries the operation processes
+    :param prepare: Prepares the operation and returns a function that runs
+                    it. Called before each run
+    :return: The amount of processed entries per second and the peak amount
+             of memory allocated while running the operation in bytes
+    """
+    run = prepare()
+    gc.collect()
+    start = time.perf_counter()
+    run()
+    duration = time.perf_counter() - start
+
+    run = prepare()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    ops = count / duration
+    print("{:<40} {:>8} {:>14.1f} ops/s {:>10.1f} MiB peak".format(
+        name, count, ops, peak / 1024 / 1024
+    ))
+    return ops, peak
+
+
+def generate_graph(count: int, relations: int) -> List[AnimeData]:
+    """
+    Generates anime data that forms a connected relation graph, in which
+    every entry is related to the entries with the following IDs
+    :param count: The amount of entries in the graph
+    :param relations: The amount of relations per entry
+    :return: The anime data of the graph
+    """
+    datas = generate_anime_data(count, relations)
+    for i, data in enumerate(datas):
+        for j, relation in enumerate(data.relations):
+            relation.dest = Id({IdType.ANILIST: (i + j + 1) % count + 1})
+            relation.id = relation.dest
+    return datas
+
+
+def run(count: int, relations: int):
+    """
+    Runs all benchmarks for a specific amount of entries
+    :param count: The amount of entries
+    :param relations: The amount of relations per anime data entry
+    :return: None
+    """
+    datas = generate_anime_data(count, relations)
+    user_datas = generate_anime_user_data(count)
+    serialized = [x.serialize() for x in datas]
+    graph = generate_graph(count, relations)
+    list_response = json.dumps(
+        generate_anilist_list_response(count, relations)
+    ).encode()
+    user_data_list_response = json.dumps(
+        generate_anilist_list_response(count, lean=True)
+    ).encode()
+
+    locations = []
+
+    def generate_cache(filled: bool) -> Cache:
+        locations.append(tempfile.mkdtemp())
+        cache = Cache(locations[-1])
+        if filled:
+            for entry in datas + user_datas:
+                cache.add(IdType.ANILIST, entry, True)
+            cache.write()
+        return cache
+
+    def prepare_cache_add():
+        cache = generate_cache(False)
+        return lambda: [
+            cache.add(IdType.ANILIST, x, True) for x in datas + user_datas
+        ]
+
+    def prepare_cache_get():
+        cache = generate_cache(True)
+        cache.load()
+        return lambda: [
+            cache.get_media_data(IdType.ANILIST, MediaType.ANIME, i)
+            for i in range(1, count + 1)
+        ]
+
+    def prepare_cache_load_and_get():
+        cache = generate_cache(True)
+
+        def load_and_get():
+            cache.load()
+            for i in range(1, count + 1):
+                cache.get_media_data(IdType.ANILIST, MediaType.ANIME, i)
+                cache.get_media_user_data(
+                    IdType.ANILIST, MediaType.ANIME, i, "user"
+                )
+        return load_and_get
+
+    def prepare_related_data():
+        api = GraphApi(generate_cache(False), graph)
+        return lambda: api.get_related_data(graph[0])
+
+    def generate_api(response: bytes) -> AnilistApi:
+        return AnilistApi(
+            generate_cache(False),
+            session=FakeSession(lambda _: response),
+            rate_limiter=RateLimiter()
+        )
+
+    def prepare_list_parsing():
+        api = generate_api(list_response)
+        return lambda: api._get_list(MediaType.ANIME, "user")
+
+    def prepare_user_data_list_parsing():
+        api = generate_api(user_data_list_response)
+        return lambda: api._get_user_data_list(MediaType.ANIME, "user")
+
+    try:
+        benchmark("Cache.add", 2 * count, prepare_cache_add)
+        benchmark("Cache.write", 2 * count, lambda: generate_cache(True).write)
+        benchmark(
+            "Cache.load (lazy)", 2 * count,
+            lambda: generate_cache(True).load
+        )
+        benchmark(
+            "Cache.load + get (all entries)", 2 * count,
+            prepare_cache_load_and_get
+        )
+        benchmark("Cache.get", count, prepare_cache_get)
+        benchmark("MediaData.deserialize", count, lambda: lambda: [
+            MediaData.deserialize(x) for x in serialized
+        ])
+        benchmark("MediaData.deserialize (trusted)", count, lambda: lambda: [
+            MediaData.deserialize(x, validate=False) for x in serialized
+        ])
+        benchmark("MediaListEntry construction", count, lambda: lambda: [
+            AnimeListEntry(data, user_data)
+            for data, user_data in zip(datas, user_datas)
+        ])
+        benchmark(
+            "ApiInterface.get_related_data", count, prepare_related_data
+        )
+        benchmark("AnilistApi._get_list", count, prepare_list_parsing)
+        benchmark(
+            "AnilistApi._get_user_data_list", count,
+            prepare_user_data_list_parsing
+        )
+    finally:
+        for location in locations:
+            shutil.rmtree(location)
+
+
+def main(args: Optional[List[str]] = None):
+    """
+    Runs the benchmark suite. Everything runs offline on synthetic data
+    :param args: The command line arguments. Defaults to sys.argv
+    :return: None
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the cache, the models and the parsers"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1000, 10000, 100000],
+                        help="The amounts of entries to benchmark with. "
+                             "Large amounts take several minutes")
+    parser.add_argument("--relations", type=int, default=5,
+                        help="The amount of relations per anime entry")
+    parsed = parser.parse_args(sys.argv[1:] if args is None else args)
+
+    for count in parsed.sizes:
+        print("{:<40} {:>8} {:>20} {:>19}".format(
+            "N = " + str(count), "entries", "throughput", "memory"
+        ))
+        run(count, parsed.relations)
+        print()
+
+
+if __name__ == "__main__":
+    main()
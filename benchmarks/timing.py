@@ -0,0 +1,40 @@
+"""LICENSE
+Copyright 2018 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of anime-list-apis.
+
+anime-list-apis is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+anime-list-apis is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with anime-list-apis.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import time
+from typing import Callable
+
+
+def measure(name: str, function: Callable[[], object], repetitions: int):
+    """
+    Measures how many times per second a function can be executed and
+    prints the result
+    :param name: The name of the measured operation
+    :param function: The function to measure
+    :param repetitions: How often the function should be executed
+    :return: The amount of operations per second
+    """
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        function()
+    duration = time.perf_counter() - start
+
+    ops = repetitions / duration
+    print("{:<40} {:>12.1f} ops/s".format(name, ops))
+    return ops
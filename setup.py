@@ -34,7 +34,7 @@ if __name__ == "__main__":
         ],
         url="https://gitlab.namibsun.net/namibsun/python/anime-list-apis",
         license="GNU GPL3",
-        packages=find_packages(),
+        packages=find_packages(exclude=["benchmarks"]),
         install_requires=[
             "typing",
             "requests"